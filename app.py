@@ -10,8 +10,8 @@ import contextlib # Used for @contextlib.contextmanager
 
 # Import Backend and Utilities
 from backend.resume_parser import parse_resume
-from backend.career_analyzer import analyze_career_fit, get_learning_plan, generate_career_roadmap, get_job_application_links
-from utils import create_gauge_chart, glass_container, parse_roadmap_step, generate_report 
+from backend.career_analyzer import analyze_career_fit, get_learning_plan, get_job_application_links
+from utils import create_gauge_chart, glass_container, generate_report, load_stylesheet, warm_up
 # Note: The functions defined in app.py before will be moved to utils.py
 
 # Import Page Modules
@@ -34,9 +34,11 @@ st.set_page_config(
 # -----------------------------------------------------------------------------
 # 2. GLOBAL STYLING (Moved from the original app.py)
 # -----------------------------------------------------------------------------
-# All CSS is kept here as it's a global configuration.
-with open("career_compass_theme.css", "r") as f:  # Assuming you save the CSS in a separate file for cleanliness
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+# Shared resources are cached per process; after the first run this is a no-op.
+warm_up()
+
+# All CSS is kept here as it's a global configuration (read from disk once per process).
+st.markdown(f"<style>{load_stylesheet()}</style>", unsafe_allow_html=True)
 
 
 # -----------------------------------------------------------------------------
@@ -52,6 +54,10 @@ if 'selected_role' not in st.session_state:
     st.session_state.selected_role = None
 if 'roadmap_steps' not in st.session_state:
     st.session_state.roadmap_steps = None
+if 'analysis_job_id' not in st.session_state:
+    st.session_state.analysis_job_id = None
+if 'analysis_error' not in st.session_state:
+    st.session_state.analysis_error = None
 
 def reset_session():
     st.session_state.resume_data = None
@@ -59,6 +65,8 @@ def reset_session():
     st.session_state.selected_role = None
     st.session_state.page = 'landing'
     st.session_state.roadmap_steps = None
+    st.session_state.analysis_job_id = None
+    st.session_state.analysis_error = None
 st.session_state['reset_session'] = reset_session # Make reset available to pages
 
 
@@ -0,0 +1,542 @@
+"""
+Persistent store of finished analyses with indexed skill and role-score lookups
+"""
+
+import itertools
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from backend.career_analyzer import ROLE_INDEX, normalize_skills, score_touched_roles
+from backend.skill_evidence import SkillEvidence
+
+
+logger = logging.getLogger(__name__)
+
+# Path of the SQLite file; the store is off unless this is set
+ANALYSIS_DB_ENV = 'CAREER_COMPASS_ANALYSIS_DB'
+
+# Analyses written per transaction, and the longest a queued one waits for company
+BATCH_SIZE = 500
+FLUSH_INTERVAL = 0.5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS skills (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS roles (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS resumes (
+    id INTEGER PRIMARY KEY,
+    resume_hash TEXT NOT NULL UNIQUE,
+    file_name TEXT,
+    skill_count INTEGER NOT NULL,
+    parse_error TEXT,
+    analyzed_at REAL NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS resume_skills (
+    resume_id INTEGER NOT NULL,
+    skill_id INTEGER NOT NULL,
+    mentions INTEGER NOT NULL,
+    years REAL,
+    PRIMARY KEY (resume_id, skill_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS resume_skills_by_skill ON resume_skills (skill_id, resume_id);
+CREATE TABLE IF NOT EXISTS role_scores (
+    role_id INTEGER NOT NULL,
+    match_score REAL NOT NULL,
+    resume_id INTEGER NOT NULL,
+    combined_score REAL NOT NULL,
+    PRIMARY KEY (role_id, match_score, resume_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS role_scores_by_resume ON role_scores (resume_id);
+CREATE TABLE IF NOT EXISTS store_version (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO store_version (id, value) VALUES (0, 0);
+"""
+
+# Created after the version column is added to stores from before it existed
+_VERSION_INDEX = "CREATE INDEX IF NOT EXISTS resumes_by_version ON resumes (version)"
+
+# Candidates for a role above a score, best first: a range scan of the role_scores
+# primary key, with each skill condition a primary-key probe of resume_skills
+_CANDIDATES_SQL = """
+SELECT r.resume_hash, r.file_name, s.match_score, s.combined_score, r.analyzed_at
+FROM role_scores s JOIN resumes r ON r.id = s.resume_id
+WHERE s.role_id = ? AND s.match_score >= ?{conditions}
+ORDER BY s.match_score DESC, s.resume_id DESC
+LIMIT ?
+"""
+_HAS_SKILL = "EXISTS (SELECT 1 FROM resume_skills k WHERE k.resume_id = s.resume_id AND k.skill_id = ?)"
+
+
+class _Analysis:
+    """One queued write"""
+
+    __slots__ = ('resume_hash', 'skills', 'mentions', 'years', 'file_name', 'parse_error', 'analyzed_at')
+
+    def __init__(self, resume_hash, skills, mentions, years, file_name, parse_error):
+        self.resume_hash = resume_hash
+        self.skills = skills
+        self.mentions = mentions
+        self.years = years
+        self.file_name = file_name
+        self.parse_error = parse_error
+        self.analyzed_at = time.time()
+
+
+class AnalysisStore:
+    """
+    SQLite file of analyses keyed by the SHA-256 of the uploaded resume.
+
+    Skills and role scores live in normalized tables with indexes, so
+    questions such as "at least 70% fit for DevOps Engineer and missing
+    Docker" are index range scans rather than a pass over every analysis.
+    Every role that shares a skill with the resume is scored, not only the
+    top matches shown to the user.
+
+    save() only queues the analysis: a writer thread commits queued
+    analyses in batches on its own connection, in WAL mode so readers are
+    never blocked. If a batch fails, its analyses are retried one per
+    transaction, so a bad analysis only loses itself. Queries use one
+    connection per calling thread.
+
+    Each write transaction bumps a store-wide version and stamps it on
+    the resumes it inserts or replaces. Writers to one file are
+    serialized, so versions follow commit order even when several
+    processes share the store, unlike analyzed_at, which is the saving
+    process's clock at save() time.
+    """
+
+    def __init__(self, path: str, batch_size: int = BATCH_SIZE, flush_interval: float = FLUSH_INTERVAL):
+        """
+        Args:
+            path: SQLite file, created if missing
+            batch_size: Most analyses written per transaction
+            flush_interval: Seconds a queued analysis waits for a fuller batch
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._local = threading.local()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._counters = {'saved': 0, 'batches': 0, 'errors': 0}
+
+        db = self._connect()
+        db.execute("PRAGMA journal_mode=WAL")
+        db.executescript(_SCHEMA)
+        if 'version' not in {row[1] for row in db.execute("PRAGMA table_info(resumes)")}:
+            db.execute("ALTER TABLE resumes ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+        db.execute(_VERSION_INDEX)
+        db.executemany("INSERT OR IGNORE INTO roles (name) VALUES (?)", ((name,) for name in ROLE_INDEX.role_names))
+        db.commit()
+        self._local.db = db
+
+        self._writer = threading.Thread(target=self._write_loop, name='analysis-store', daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, timeout=30.0)
+        # WAL only needs a sync at checkpoints to stay consistent after a crash
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    def _reader(self) -> sqlite3.Connection:
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = self._local.db = self._connect()
+        return db
+
+    def save(
+        self,
+        resume_hash: str,
+        skills: Iterable[str],
+        mentions: Optional[Dict[str, int]] = None,
+        years: Optional[Dict[str, float]] = None,
+        file_name: Optional[str] = None,
+        parse_error: Optional[str] = None,
+    ) -> None:
+        """
+        Queue an analysis for writing, replacing any earlier one of the same resume
+
+        Args:
+            resume_hash: SHA-256 hex digest of the uploaded bytes
+            skills: Skills found in the resume
+            mentions: Times each skill is mentioned, if known
+            years: Stated years of experience per skill, if known
+            file_name: Original file name, kept for display
+            parse_error: Why only part of the file was read, or None
+        """
+        self._queue.put(_Analysis(resume_hash, set(skills), mentions or {}, years or {}, file_name, parse_error))
+
+    def save_analysis(self, resume_data: Dict, file_name: Optional[str] = None) -> None:
+        """Queue the result of parse_resume for writing"""
+        evidence: Optional[SkillEvidence] = resume_data.get('evidence')
+        self.save(
+            resume_data['resume_hash'],
+            resume_data['skills'],
+            evidence.counts() if evidence is not None else None,
+            evidence.years() if evidence is not None else None,
+            file_name,
+            resume_data.get('parse_error'),
+        )
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until everything queued so far is committed
+
+        Returns:
+            False if the timeout passed first or the writer has stopped
+        """
+        if not self._writer.is_alive():
+            return False
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        """Commit what is queued and stop the writer"""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
+    def stats(self) -> Dict[str, int]:
+        """Analyses saved, transactions committed, analyses that failed to save and the current queue length"""
+        with self._lock:
+            return dict(self._counters, queued=self._queue.qsize())
+
+    def _write_loop(self) -> None:
+        db = self._connect()
+        skill_ids: Dict[str, int] = {}
+        role_ids = dict(db.execute("SELECT name, id FROM roles"))
+        stopping = False
+        while not stopping:
+            batch: List[_Analysis] = []
+            waiters: List[threading.Event] = []
+            item = self._queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is None:
+                    stopping = True
+                    break
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            try:
+                if batch:
+                    self._write_batch(db, batch, skill_ids, role_ids)
+            finally:
+                for waiter in waiters:
+                    waiter.set()
+        db.close()
+
+    def _write_batch(self, db: sqlite3.Connection, batch: List[_Analysis], skill_ids: Dict[str, int], role_ids: Dict[str, int]) -> None:
+        if len(batch) > 1 and self._commit(db, batch, skill_ids, role_ids) is None:
+            return
+        # One transaction per analysis, so only the ones that fail again are lost
+        for analysis in batch:
+            error = self._commit(db, [analysis], skill_ids, role_ids)
+            if error is not None:
+                logger.error("Could not save the analysis of %s", analysis.resume_hash, exc_info=error)
+                with self._lock:
+                    self._counters['errors'] += 1
+
+    def _commit(
+        self, db: sqlite3.Connection, batch: List[_Analysis], skill_ids: Dict[str, int], role_ids: Dict[str, int]
+    ) -> Optional[Exception]:
+        """Write analyses in one transaction; the error if it rolled back"""
+        try:
+            with db:
+                db.execute("UPDATE store_version SET value = value + 1")
+                version = db.execute("SELECT value FROM store_version").fetchone()[0]
+                for analysis in batch:
+                    self._write_one(db, analysis, version, skill_ids, role_ids)
+        except Exception as exc:
+            # Ids cached during the rolled-back transaction may not exist
+            skill_ids.clear()
+            role_ids.clear()
+            try:
+                role_ids.update(db.execute("SELECT name, id FROM roles"))
+            except sqlite3.Error:
+                pass
+            return exc
+        with self._lock:
+            self._counters['saved'] += len(batch)
+            self._counters['batches'] += 1
+        return None
+
+    def _write_one(
+        self, db: sqlite3.Connection, analysis: _Analysis, version: int, skill_ids: Dict[str, int], role_ids: Dict[str, int]
+    ) -> None:
+        db.execute(
+            "INSERT INTO resumes (resume_hash, file_name, skill_count, parse_error, analyzed_at, version) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (resume_hash) DO UPDATE SET file_name = COALESCE(excluded.file_name, file_name), "
+            "skill_count = excluded.skill_count, parse_error = excluded.parse_error, analyzed_at = excluded.analyzed_at, "
+            "version = excluded.version",
+            (analysis.resume_hash, analysis.file_name, len(analysis.skills), analysis.parse_error, analysis.analyzed_at, version),
+        )
+        resume_id = db.execute("SELECT id FROM resumes WHERE resume_hash = ?", (analysis.resume_hash,)).fetchone()[0]
+        db.execute("DELETE FROM resume_skills WHERE resume_id = ?", (resume_id,))
+        db.execute("DELETE FROM role_scores WHERE resume_id = ?", (resume_id,))
+
+        rows = {}
+        for skill in analysis.skills:
+            skill_id = self._skill_id(db, skill, skill_ids)
+            # Aliases share a key; add up their mentions and keep the longest stated experience
+            mentions, stated = rows.get(skill_id, (0, None))
+            skill_years = analysis.years.get(skill)
+            if skill_years is not None and (stated is None or skill_years > stated):
+                stated = skill_years
+            rows[skill_id] = (mentions + analysis.mentions.get(skill, 0), stated)
+        db.executemany(
+            "INSERT INTO resume_skills (resume_id, skill_id, mentions, years) VALUES (?, ?, ?, ?)",
+            [(resume_id, skill_id, mentions, stated) for skill_id, (mentions, stated) in rows.items()],
+        )
+
+        scores = []
+        for role_name, match_score, combined_score in score_touched_roles(analysis.skills):
+            role_id = role_ids.get(role_name)
+            if role_id is None:
+                db.execute("INSERT OR IGNORE INTO roles (name) VALUES (?)", (role_name,))
+                role_id = role_ids[role_name] = db.execute("SELECT id FROM roles WHERE name = ?", (role_name,)).fetchone()[0]
+            scores.append((role_id, match_score, resume_id, combined_score))
+        db.executemany(
+            "INSERT INTO role_scores (role_id, match_score, resume_id, combined_score) VALUES (?, ?, ?, ?)", scores
+        )
+
+    @staticmethod
+    def _skill_id(db: sqlite3.Connection, skill: str, skill_ids: Dict[str, int]) -> int:
+        key = next(iter(normalize_skills((skill,))))
+        skill_id = skill_ids.get(key)
+        if skill_id is None:
+            db.execute("INSERT OR IGNORE INTO skills (key, name) VALUES (?, ?)", (key, skill))
+            skill_id = skill_ids[key] = db.execute("SELECT id FROM skills WHERE key = ?", (key,)).fetchone()[0]
+        return skill_id
+
+    def _skill_ids(self, skills: Iterable[str]) -> Dict[str, Optional[int]]:
+        """Stored id of each skill's normalized key, None for skills no resume has had"""
+        db = self._reader()
+        ids = {}
+        for key in normalize_skills(skills):
+            row = db.execute("SELECT id FROM skills WHERE key = ?", (key,)).fetchone()
+            ids[key] = row[0] if row else None
+        return ids
+
+    def find_candidates(
+        self,
+        role_name: str,
+        min_match: float = 0.0,
+        missing_skills: Sequence[str] = (),
+        required_skills: Sequence[str] = (),
+        limit: int = 100,
+    ) -> List[Dict]:
+        """
+        Resumes that fit a role at least min_match, best fit first
+
+        Args:
+            role_name: Catalog role name
+            min_match: Lowest match score (0-100) to include; must be above 0
+                to use the index, since roles sharing no skill aren't stored
+            missing_skills: Skills the resume must not list (aliases count)
+            required_skills: Skills the resume must list
+            limit: Most resumes returned
+
+        Returns:
+            List of dictionaries with resume_hash, file_name, match_score,
+            combined_score and analyzed_at
+        """
+        db = self._reader()
+        role = db.execute("SELECT id FROM roles WHERE name = ?", (role_name,)).fetchone()
+        if role is None:
+            return []
+        params: List = [role[0], min_match]
+        conditions = []
+        for skill_id in self._skill_ids(missing_skills).values():
+            # A skill no resume has listed is missing from all of them
+            if skill_id is not None:
+                conditions.append(f"NOT {_HAS_SKILL}")
+                params.append(skill_id)
+        for skill_id in self._skill_ids(required_skills).values():
+            if skill_id is None:
+                return []
+            conditions.append(_HAS_SKILL)
+            params.append(skill_id)
+        params.append(limit)
+        sql = _CANDIDATES_SQL.format(conditions=''.join(f" AND {condition}" for condition in conditions))
+        columns = ('resume_hash', 'file_name', 'match_score', 'combined_score', 'analyzed_at')
+        return [dict(zip(columns, row)) for row in db.execute(sql, params)]
+
+    def get(self, resume_hash: str) -> Optional[Dict]:
+        """
+        Stored analysis of one resume
+
+        Returns:
+            Dictionary with file_name, skill_count, parse_error, analyzed_at,
+            skills (name -> {'mentions', 'years'}) and role_scores
+            (role name -> match score), or None if it was never saved
+        """
+        db = self._reader()
+        row = db.execute(
+            "SELECT id, file_name, skill_count, parse_error, analyzed_at FROM resumes WHERE resume_hash = ?", (resume_hash,)
+        ).fetchone()
+        if row is None:
+            return None
+        resume_id, file_name, skill_count, parse_error, analyzed_at = row
+        skills = {
+            name: {'mentions': mentions, 'years': years}
+            for name, mentions, years in db.execute(
+                "SELECT k.name, s.mentions, s.years FROM resume_skills s JOIN skills k ON k.id = s.skill_id WHERE s.resume_id = ?",
+                (resume_id,),
+            )
+        }
+        role_scores = dict(db.execute(
+            "SELECT r.name, s.match_score FROM role_scores s JOIN roles r ON r.id = s.role_id WHERE s.resume_id = ? "
+            "ORDER BY s.match_score DESC",
+            (resume_id,),
+        ))
+        return {
+            'resume_hash': resume_hash, 'file_name': file_name, 'skill_count': skill_count, 'parse_error': parse_error,
+            'analyzed_at': analyzed_at, 'skills': skills, 'role_scores': role_scores,
+        }
+
+    def skill_sets(self, limit: Optional[int] = None) -> Iterator[Tuple[str, List[str]]]:
+        """
+        Stream every stored resume's skills, oldest first
+
+        Args:
+            limit: Only the first this many resumes
+
+        Returns:
+            Iterator of (resume_hash, skill names)
+        """
+        db = self._reader()
+        rows = db.execute(
+            "SELECT r.resume_hash, k.name FROM (SELECT id, resume_hash FROM resumes ORDER BY id LIMIT ?) r "
+            "JOIN resume_skills s ON s.resume_id = r.id JOIN skills k ON k.id = s.skill_id ORDER BY r.id",
+            (-1 if limit is None else limit,),
+        )
+        for resume_hash, group in itertools.groupby(rows, key=lambda row: row[0]):
+            yield resume_hash, [name for _, name in group]
+
+    def iter_analyses(self, page_size: int = 1000) -> Iterator[Dict]:
+        """
+        Stream every stored analysis in save order, one page of resumes at a time
+
+        Args:
+            page_size: Resumes read per query; bounds memory however large the store is
+
+        Returns:
+            Iterator of dictionaries with resume_hash, file_name, skill_count,
+            parse_error, analyzed_at, skills (names) and role_scores
+            (role name -> (match_score, combined_score), best first)
+        """
+        db = self._reader()
+        roles = dict(db.execute("SELECT id, name FROM roles"))
+        last_id = 0
+        while True:
+            page = db.execute(
+                "SELECT id, resume_hash, file_name, skill_count, parse_error, analyzed_at FROM resumes "
+                "WHERE id > ? ORDER BY id LIMIT ?", (last_id, page_size),
+            ).fetchall()
+            if not page:
+                return
+            window = (last_id, page[-1][0])
+            skills: Dict[int, List[str]] = {}
+            for resume_id, name in db.execute(
+                "SELECT s.resume_id, k.name FROM resume_skills s JOIN skills k ON k.id = s.skill_id "
+                "WHERE s.resume_id > ? AND s.resume_id <= ?", window,
+            ):
+                skills.setdefault(resume_id, []).append(name)
+            scores: Dict[int, List[Tuple]] = {}
+            for resume_id, role_id, match_score, combined_score in db.execute(
+                "SELECT resume_id, role_id, match_score, combined_score FROM role_scores "
+                "WHERE resume_id > ? AND resume_id <= ? ORDER BY resume_id, match_score DESC", window,
+            ):
+                scores.setdefault(resume_id, []).append((roles[role_id], match_score, combined_score))
+            for resume_id, resume_hash, file_name, skill_count, parse_error, analyzed_at in page:
+                yield {
+                    'resume_hash': resume_hash, 'file_name': file_name, 'skill_count': skill_count,
+                    'parse_error': parse_error, 'analyzed_at': analyzed_at,
+                    'skills': sorted(skills.get(resume_id, ())),
+                    'role_scores': {role: (match, combined) for role, match, combined in scores.get(resume_id, ())},
+                }
+            last_id = page[-1][0]
+
+    def rows_since(self, after_id: int = 0, after_version: int = 0) -> Dict:
+        """
+        Raw rows of the resumes stored after a given row id, read from one snapshot
+
+        Args:
+            after_id: Largest resume row id already loaded (0 for everything)
+            after_version: Store version of the snapshot they were loaded from
+
+        Returns:
+            Dictionary with last_id and version (largest resume row id and
+            the store version of this snapshot), rewritten (how many resumes
+            up to after_id were saved again after after_version), the number
+            of new resumes, role_scores as (resume_id, role_id, match_score)
+            rows, resume_skills as (resume_id, skill_id) rows, and the roles
+            (id -> name) and skills (id -> key) they refer to
+        """
+        db = self._reader()
+        db.execute("BEGIN")
+        try:
+            last_id = db.execute("SELECT MAX(id) FROM resumes").fetchone()[0] or 0
+            version = db.execute("SELECT value FROM store_version").fetchone()[0]
+            window = (after_id, last_id)
+            return {
+                'last_id': last_id,
+                'version': version,
+                'rewritten': self._rewritten(db, after_version, after_id) if after_id else 0,
+                'resumes': db.execute("SELECT COUNT(*) FROM resumes WHERE id > ? AND id <= ?", window).fetchone()[0],
+                'role_scores': db.execute(
+                    "SELECT resume_id, role_id, match_score FROM role_scores "
+                    "WHERE resume_id > ? AND resume_id <= ? ORDER BY resume_id", window,
+                ).fetchall(),
+                'resume_skills': db.execute(
+                    "SELECT resume_id, skill_id FROM resume_skills WHERE resume_id > ? AND resume_id <= ?", window,
+                ).fetchall(),
+                'roles': dict(db.execute("SELECT id, name FROM roles")),
+                'skills': dict(db.execute("SELECT id, key FROM skills")),
+            }
+        finally:
+            db.execute("COMMIT")
+
+    def rewritten_since(self, version: int, up_to_id: int) -> int:
+        """Resumes up to a row id that were saved again after a given store version"""
+        return self._rewritten(self._reader(), version, up_to_id)
+
+    @staticmethod
+    def _rewritten(db: sqlite3.Connection, version: int, up_to_id: int) -> int:
+        return db.execute(
+            "SELECT COUNT(*) FROM resumes WHERE version > ? AND id <= ?", (version, up_to_id)
+        ).fetchone()[0]
+
+    def count(self) -> int:
+        """Number of resumes stored"""
+        return self._reader().execute("SELECT COUNT(*) FROM resumes").fetchone()[0]
+
+
+def open_store_from_env() -> Optional[AnalysisStore]:
+    """The store at CAREER_COMPASS_ANALYSIS_DB, or None if it isn't set"""
+    path = os.environ.get(ANALYSIS_DB_ENV)
+    return AnalysisStore(path) if path else None
@@ -0,0 +1,255 @@
+"""
+Batch resume analysis from the command line
+
+Usage:
+    python -m backend.batch resumes/ --output results.jsonl --checkpoint done.txt
+    python -m backend.batch "exports/**/*.pdf" --workers 8 --top-k 5
+    python -m backend.batch resumes/ --output results.jsonl --store analyses.db
+    python -m backend.batch untrusted/ --output results.jsonl --pdf-mode isolated
+
+Each resume produces one JSON line with its skills, top matches, timings
+and any error. Files listed in the checkpoint are skipped, so an
+interrupted run picks up where it stopped when started with the same
+arguments.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, Optional, Set, TextIO, Tuple
+
+from backend.analysis_store import AnalysisStore
+from backend.career_analyzer import analyze_career_fit
+from backend.pdf_sandbox import budget_stats
+from backend.resume_parser import PDF_MODE, parse_resume
+
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.txt', '.text')
+
+# Tasks kept in flight per worker; bounds memory no matter how many files are queued
+IN_FLIGHT_PER_WORKER = 4
+
+# Pages are already spread across worker processes, so PDFs are read serially
+# unless isolation was configured; 'isolated' starts one sandbox per file
+DEFAULT_PDF_MODE = 'isolated' if PDF_MODE == 'isolated' else 'serial'
+
+
+def iter_resume_paths(inputs: Iterable[str]) -> Iterator[str]:
+    """
+    Lazily expand directories and glob patterns into resume file paths
+
+    Args:
+        inputs: Directories, files or glob patterns
+
+    Returns:
+        Iterator of file paths with a supported extension
+    """
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, dirs, files in os.walk(item):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                        yield os.path.join(root, name)
+        elif os.path.isfile(item):
+            yield item
+        else:
+            for path in glob.iglob(item, recursive=True):
+                if os.path.isfile(path) and path.lower().endswith(SUPPORTED_EXTENSIONS):
+                    yield path
+
+
+def analyze_file(path: str, top_k: int, pdf_mode: str = DEFAULT_PDF_MODE) -> Dict:
+    """
+    Parse and analyze one resume file; runs inside a worker process
+
+    Args:
+        path: Path of a PDF or TXT resume
+        top_k: Number of role matches to keep
+        pdf_mode: PDF extraction mode passed to parse_resume
+
+    Returns:
+        JSON-serializable record for the output stream
+    """
+    record = {
+        'path': path, 'resume_hash': None, 'skills': [], 'skill_count': 0, 'skill_evidence': {}, 'matches': [], 'timings': {},
+        'error': None, 'parse_error': None,
+    }
+    try:
+        started = time.perf_counter()
+        # The path is memory-mapped, and text is matched in chunks since
+        # records don't keep it
+        resume_data = parse_resume(path, pdf_mode=pdf_mode, keep_text=False)
+        parsed = time.perf_counter()
+        matches = analyze_career_fit(resume_data['skills'], top_k=top_k)
+        analyzed = time.perf_counter()
+
+        record['resume_hash'] = resume_data['resume_hash']
+        record['skills'] = sorted(resume_data['skills'])
+        record['skill_count'] = resume_data['skill_count']
+        record['skill_evidence'] = resume_data['evidence'].summary()
+        record['parse_error'] = resume_data['parse_error']
+        record['matches'] = [
+            {
+                'role_name': match['role_name'],
+                'match_score': match['match_score'],
+                'demand_score': match['demand_score'],
+                'combined_score': match['combined_score'],
+                'known_skills': match['known_skills'],
+                'missing_skills': match['missing_skills'],
+            }
+            for match in matches
+        ]
+        record['timings'] = {'parse_ms': (parsed - started) * 1000, 'analyze_ms': (analyzed - parsed) * 1000}
+    except Exception as exc:
+        record['error'] = f"{type(exc).__name__}: {exc}"
+    return record
+
+
+def _analyze_counted(path: str, top_k: int, pdf_mode: str) -> Tuple[Dict, Dict[str, int]]:
+    """analyze_file plus the PDF budget counters it moved, which live in the worker process"""
+    before = budget_stats()
+    record = analyze_file(path, top_k, pdf_mode)
+    after = budget_stats()
+    return record, {name: after[name] - before[name] for name in after}
+
+
+def load_checkpoint(path: Optional[str]) -> Set[str]:
+    """Paths already written by a previous run"""
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path, 'r', encoding='utf-8') as checkpoint:
+        return {line.rstrip('\n') for line in checkpoint if line.strip()}
+
+
+def run_batch(
+    inputs: Iterable[str],
+    output: TextIO,
+    workers: int,
+    top_k: int = 3,
+    checkpoint_path: Optional[str] = None,
+    store: Optional[AnalysisStore] = None,
+    pdf_mode: str = DEFAULT_PDF_MODE,
+) -> Dict:
+    """
+    Analyze every resume under the inputs and stream JSON lines to output
+
+    Args:
+        inputs: Directories, files or glob patterns
+        output: Text stream receiving one JSON object per line
+        workers: Number of worker processes
+        top_k: Number of role matches kept per resume
+        checkpoint_path: File recording finished paths, used to resume
+        store: Analysis store that also receives every successful record
+        pdf_mode: PDF extraction mode passed to parse_resume
+
+    Returns:
+        Dictionary of throughput statistics, with the workers' PDF budget
+        counters (see backend.pdf_sandbox.budget_stats) under 'pdf_budget'
+    """
+    done = load_checkpoint(checkpoint_path)
+    checkpoint = open(checkpoint_path, 'a', encoding='utf-8') if checkpoint_path else None
+    stats = {'processed': 0, 'errors': 0, 'skipped': 0, 'parse_ms': 0.0, 'analyze_ms': 0.0}
+    budget = dict.fromkeys(budget_stats(), 0)
+    started = time.perf_counter()
+
+    def emit(result: Tuple[Dict, Dict[str, int]]) -> None:
+        record, counted = result
+        for name, count in counted.items():
+            budget[name] += count
+        output.write(json.dumps(record) + '\n')
+        output.flush()
+        if store is not None and not record['error']:
+            evidence = record['skill_evidence']
+            store.save(
+                record['resume_hash'], record['skills'],
+                {skill: facts['mentions'] for skill, facts in evidence.items()},
+                {skill: facts['years'] for skill, facts in evidence.items() if facts['years'] is not None},
+                record['path'], record['parse_error'],
+            )
+        # Only checkpoint once the record is safely written
+        if checkpoint is not None:
+            checkpoint.write(record['path'] + '\n')
+            checkpoint.flush()
+        stats['processed'] += 1
+        if record['error']:
+            stats['errors'] += 1
+        stats['parse_ms'] += record['timings'].get('parse_ms', 0.0)
+        stats['analyze_ms'] += record['timings'].get('analyze_ms', 0.0)
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            for path in iter_resume_paths(inputs):
+                if path in done:
+                    stats['skipped'] += 1
+                    continue
+                if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        emit(future.result())
+                pending.add(pool.submit(_analyze_counted, path, top_k, pdf_mode))
+            for future in wait(pending).done:
+                emit(future.result())
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+
+    elapsed = time.perf_counter() - started
+    stats['elapsed_s'] = elapsed
+    stats['files_per_s'] = stats['processed'] / elapsed if elapsed else 0.0
+    stats['pdf_budget'] = budget
+    return stats
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m backend.batch', description="Batch resume analysis to JSONL")
+    parser.add_argument('inputs', nargs='+', help="Directories, files or glob patterns of PDF/TXT resumes")
+    parser.add_argument('-o', '--output', help="JSONL output file (default: stdout)")
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument('-k', '--top-k', type=int, default=3, help="Role matches kept per resume")
+    parser.add_argument('-c', '--checkpoint', help="Checkpoint file used to resume an interrupted run")
+    parser.add_argument('-s', '--store', help="SQLite analysis store that also receives every result")
+    parser.add_argument(
+        '-p', '--pdf-mode', choices=['serial', 'parallel', 'auto', 'isolated'], default=DEFAULT_PDF_MODE,
+        help="PDF extraction mode; 'isolated' parses each PDF in a killable process under the CAREER_COMPASS_PDF_* limits",
+    )
+    args = parser.parse_args(argv)
+
+    # Appending keeps earlier results when resuming from a checkpoint
+    output = open(args.output, 'a', encoding='utf-8') if args.output else sys.stdout
+    store = AnalysisStore(args.store) if args.store else None
+    try:
+        stats = run_batch(args.inputs, output, args.workers, args.top_k, args.checkpoint, store, args.pdf_mode)
+    except KeyboardInterrupt:
+        print("Interrupted; rerun with the same --checkpoint to resume.", file=sys.stderr)
+        return 130
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        if store is not None:
+            store.close()
+
+    processed = stats['processed'] or 1
+    print(
+        f"Processed {stats['processed']} resumes ({stats['errors']} errors, {stats['skipped']} skipped) "
+        f"in {stats['elapsed_s']:.1f}s: {stats['files_per_s']:.1f} files/s, "
+        f"mean parse {stats['parse_ms'] / processed:.1f} ms, mean analyze {stats['analyze_ms'] / processed:.2f} ms",
+        file=sys.stderr,
+    )
+    limited = {name: count for name, count in stats['pdf_budget'].items() if count and name != 'parses'}
+    if limited:
+        print(
+            f"PDF limits over {stats['pdf_budget']['parses']} parses: "
+            + ', '.join(f"{count} {name.replace('_', ' ')}" for name, count in limited.items()),
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+"""
+Reverse matching: rank stored resumes against a role or a job description
+
+Usage:
+    python -m backend.candidate_index --store analyses.db --role "DevOps Engineer" --top-n 20
+    python -m backend.candidate_index --store analyses.db --description job_posting.txt
+"""
+
+import argparse
+import json
+import sys
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from backend.career_analyzer import ROLE_INDEX, match_percentage, normalize_skills
+
+
+class CandidateIndex:
+    """
+    Skill -> resume postings for ranking a corpus against one set of requirements.
+
+    Resumes get dense ids in the order they are added. Each skill keeps a
+    posting list of resume ids, and a bitmap of the same ids as a Python
+    int (bit i set when resume i lists the skill) that is rebuilt lazily
+    after additions. Ranking adds the required skills' bitmaps with a
+    bit-sliced counter, so every resume's match count is computed by a few
+    word-parallel big-int operations instead of a visit per resume, and
+    only the top-N resumes are ever looked at individually.
+
+    Scores use the same rule as calculate_match_score: a requirement is
+    met when its lowercased name is among the resume's skills after alias
+    normalization, and a requirement listed twice counts twice.
+    """
+
+    def __init__(self):
+        self._keys: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._skills: List[frozenset] = []
+        self._postings: Dict[str, array] = {}
+        # skill -> (bitmap, postings covered by it)
+        self._bitmaps: Dict[str, tuple] = {}
+        self._removed = 0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, resume_key: str, skills: Iterable[str]) -> None:
+        """
+        Index one resume, replacing an earlier entry with the same key
+
+        Args:
+            resume_key: Stable identifier, e.g. the resume_hash from parse_resume
+            skills: Skills found in the resume (any casing, aliases allowed)
+        """
+        self.remove(resume_key)
+        resume_id = len(self._keys)
+        normalized = frozenset(normalize_skills(skills))
+        self._keys.append(resume_key)
+        self._ids[resume_key] = resume_id
+        self._skills.append(normalized)
+        for skill in normalized:
+            postings = self._postings.get(skill)
+            if postings is None:
+                postings = self._postings[skill] = array('I')
+            postings.append(resume_id)
+
+    def remove(self, resume_key: str) -> bool:
+        """
+        Drop a resume from future rankings
+
+        Returns:
+            False if the key wasn't indexed
+        """
+        resume_id = self._ids.pop(resume_key, None)
+        if resume_id is None:
+            return False
+        # A tombstone: postings keep the id, rankings mask it out
+        self._removed |= 1 << resume_id
+        self._skills[resume_id] = frozenset()
+        return True
+
+    def _bitmap(self, skill: str) -> int:
+        """Bitmap of resumes listing a skill, extended with ids added since it was built"""
+        postings = self._postings.get(skill)
+        if postings is None:
+            return 0
+        bitmap, covered = self._bitmaps.get(skill, (0, 0))
+        if covered < len(postings):
+            # New ids are all larger than covered ones, so only the tail is encoded
+            base = postings[covered]
+            tail = bytearray((postings[-1] - base) // 8 + 1)
+            for resume_id in postings[covered:]:
+                offset = resume_id - base
+                tail[offset >> 3] |= 1 << (offset & 7)
+            bitmap |= int.from_bytes(tail, 'little') << base
+            self._bitmaps[skill] = (bitmap, len(postings))
+        return bitmap
+
+    def top_candidates(self, required_skills: Sequence[str], top_n: int = 10) -> List[Dict]:
+        """
+        Best-matching resumes for a list of required skills
+
+        Args:
+            required_skills: Requirements in the JOB_ROLES_DB shape
+            top_n: Most resumes returned
+
+        Returns:
+            List of dictionaries with resume_key, match_score, known_skills
+            and missing_skills, highest match first; ties in the order the
+            resumes were added. Resumes matching nothing are left out.
+        """
+        if top_n <= 0 or not required_skills:
+            return []
+
+        # Bit-sliced counter: planes[j] holds bit j of every resume's match count
+        planes: List[int] = []
+        for skill in required_skills:
+            carry = self._bitmap(skill.lower())
+            for level in range(len(planes)):
+                if not carry:
+                    break
+                planes[level], carry = planes[level] ^ carry, planes[level] & carry
+            if carry:
+                planes.append(carry)
+
+        live = ((1 << len(self._keys)) - 1) & ~self._removed
+        selected: List[tuple] = []
+        # No resume reaches a count needing more bits than there are planes
+        for count in range(min(len(required_skills), (1 << len(planes)) - 1), 0, -1):
+            exact = live
+            for level, plane in enumerate(planes):
+                exact &= plane if count >> level & 1 else ~plane
+                if not exact:
+                    break
+            if exact:
+                selected.extend((count, resume_id) for resume_id in _first_bits(exact, top_n - len(selected)))
+                if len(selected) == top_n:
+                    break
+
+        required_lower = [skill.lower() for skill in required_skills]
+        candidates = []
+        for count, resume_id in selected:
+            skills = self._skills[resume_id]
+            candidates.append({
+                'resume_key': self._keys[resume_id],
+                'match_score': match_percentage(count, len(required_skills)),
+                'known_skills': [skill for skill, key in zip(required_skills, required_lower) if key in skills],
+                'missing_skills': [skill for skill, key in zip(required_skills, required_lower) if key not in skills],
+            })
+        return candidates
+
+    def top_candidates_for_role(self, role_name: str, top_n: int = 10) -> List[Dict]:
+        """
+        Best-matching resumes for a catalog role
+
+        Raises:
+            ValueError: If the role isn't in the catalog
+        """
+        role_id = ROLE_INDEX.catalog.role_ids.get(role_name)
+        if role_id is None:
+            raise ValueError(f"Unknown role: {role_name}")
+        return self.top_candidates(ROLE_INDEX.role_data(role_id)['required_skills'], top_n)
+
+    def top_candidates_for_description(self, job_description: str, top_n: int = 10) -> List[Dict]:
+        """Best-matching resumes for the skills a pasted job description asks for"""
+        from backend.resume_parser import extract_skills_from_text
+
+        return self.top_candidates(sorted(extract_skills_from_text(job_description)), top_n)
+
+    @classmethod
+    def from_store(cls, store, limit: Optional[int] = None) -> "CandidateIndex":
+        """
+        Index the resumes saved in an AnalysisStore
+
+        Args:
+            store: backend.analysis_store.AnalysisStore
+            limit: Only index the first this many resumes
+        """
+        index = cls()
+        for resume_hash, skills in store.skill_sets(limit):
+            index.add(resume_hash, skills)
+        return index
+
+
+def _first_bits(bitmap: int, limit: int) -> List[int]:
+    """Positions of the lowest set bits, ascending, at most limit of them"""
+    # bin() runs in C; reversed, the character index is the bit position
+    digits = bin(bitmap)[:1:-1]
+    positions = []
+    position = digits.find('1')
+    while position != -1 and len(positions) < limit:
+        positions.append(position)
+        position = digits.find('1', position + 1)
+    return positions
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m backend.candidate_index', description="Rank stored resumes against a role")
+    parser.add_argument('-s', '--store', required=True, help="SQLite analysis store (see CAREER_COMPASS_ANALYSIS_DB)")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('-r', '--role', help="Catalog role name")
+    target.add_argument('-d', '--description', help="Job description file, or - for stdin")
+    parser.add_argument('-n', '--top-n', type=int, default=10, help="Candidates returned")
+    args = parser.parse_args(argv)
+
+    from backend.analysis_store import AnalysisStore
+
+    store = AnalysisStore(args.store)
+    try:
+        index = CandidateIndex.from_store(store)
+    finally:
+        store.close()
+    try:
+        if args.role:
+            candidates = index.top_candidates_for_role(args.role, args.top_n)
+        elif args.description == '-':
+            candidates = index.top_candidates_for_description(sys.stdin.read(), args.top_n)
+        else:
+            with open(args.description, 'r', encoding='utf-8') as description:
+                candidates = index.top_candidates_for_description(description.read(), args.top_n)
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+    for candidate in candidates:
+        print(json.dumps(candidate))
+    print(f"{len(candidates)} of {len(index)} stored resumes", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,10 +2,46 @@
 Career analysis and job role matching logic
 """
 
-from typing import List, Dict, Set
+from typing import List, Dict, Iterable, NamedTuple, Optional, Sequence, Set, Tuple
+import heapq
+import re
 import urllib.parse
-# Assuming job_roles_data.py contains the JOB_ROLES_DB dictionary
-from backend.data.job_roles_data import JOB_ROLES_DB
+try:
+    import numpy as np
+except ImportError:
+    np = None
+from backend.catalog import load_catalog
+from backend.data.skill_aliases import SKILL_ALIASES
+from backend.progress import EventCallback, StageTimer
+from backend.role_index import RoleIndex
+from backend.skill_matcher import build_alias_index
+
+
+# Compiled (or loaded from a snapshot) once at import; analysis walks only
+# the postings of the user's skills
+CATALOG = load_catalog()
+ROLE_INDEX = RoleIndex(CATALOG)
+
+# Lowercased alias -> lowercased canonical skill, for skills that didn't come
+# from the parser (which already reports canonical names)
+_ALIAS_INDEX = {alias: canonical.lower() for alias, canonical in build_alias_index(SKILL_ALIASES).items()}
+
+
+def normalize_skills(user_skills: Iterable[str]) -> Set[str]:
+    """
+    Lowercase skill names and map aliases to their canonical skill
+
+    Args:
+        user_skills: Skill names as parsed or typed, e.g. "k8s" or "Python"
+
+    Returns:
+        Set of lowercased canonical names, e.g. {"kubernetes", "python"}
+    """
+    normalized = set()
+    for skill in user_skills:
+        key = skill.lower()
+        normalized.add(_ALIAS_INDEX.get(key, key))
+    return normalized
 
 
 def calculate_match_score(user_skills: Set[str], required_skills: List[str]) -> float:
@@ -23,72 +59,273 @@ def calculate_match_score(user_skills: Set[str], required_skills: List[str]) ->
         return 0.0
     
     # Convert to lowercase for case-insensitive matching
-    user_skills_lower = {skill.lower() for skill in user_skills}
+    user_skills_lower = normalize_skills(user_skills)
     required_skills_lower = [skill.lower() for skill in required_skills]
     
     # Count matching skills
     matching_skills = sum(1 for skill in required_skills_lower if skill in user_skills_lower)
     
-    # Calculate percentage
-    match_percentage = (matching_skills / len(required_skills)) * 100
-    
-    return round(match_percentage, 1)
+    return match_percentage(matching_skills, len(required_skills))
+
 
+def match_percentage(matching_skills: int, required_count: int) -> float:
+    """
+    Percentage of required skills matched, rounded like the UI expects
+
+    Args:
+        matching_skills: Required skills the user has
+        required_count: Skills the role requires
 
-def analyze_career_fit(user_skills: Set[str]) -> List[Dict]:
+    Returns:
+        Match score as percentage (0-100), 0.0 for a role with no requirements
+    """
+    if not required_count:
+        return 0.0
+    return round((matching_skills / required_count) * 100, 1)
+
+
+def _combined_score(match_score: float, demand_score: float) -> float:
+    """Combined score: 70% match + 30% demand"""
+    return round((match_score * 0.7) + (demand_score * 0.3), 1)
+
+
+# Roles the user shares no skill with are ranked purely by demand, so their
+# relative order never changes and can be computed once
+_ZERO_MATCH_SCORES = [_combined_score(0.0, demand) for demand in ROLE_INDEX.demand_scores]
+_ZERO_MATCH_ORDER = sorted(range(len(ROLE_INDEX)), key=lambda role_id: -_ZERO_MATCH_SCORES[role_id])
+
+# Best combined score each role could reach (100% match); demand is fixed per role
+_UPPER_BOUNDS = [_combined_score(100.0, demand) for demand in ROLE_INDEX.demand_scores]
+
+
+def _build_match(role_id: int, match_score: float, combined_score: float, positions: Sequence[int]) -> Dict:
+    """Materialize the result dict for one role from its matched positions"""
+    role_data = ROLE_INDEX.role_data(role_id)
+    required_skills = role_data['required_skills']
+    matched = set(positions)
+
+    return {
+        'role_name': ROLE_INDEX.role_names[role_id],
+        'match_score': match_score,
+        'demand_score': role_data['demand_score'],
+        'combined_score': combined_score,
+        'description': role_data['description'],
+        'required_skills': required_skills,
+        'known_skills': [required_skills[pos] for pos in positions], # Key for new feature
+        'missing_skills': [
+            skill for pos, skill in enumerate(required_skills)
+            if pos not in matched
+        ],
+        'learning_resources': role_data['learning_resources'],
+        'career_path': role_data['career_path']
+    }
+
+
+def analyze_career_fit(
+    user_skills: Set[str],
+    top_k: Optional[int] = None,
+    on_event: Optional[EventCallback] = None,
+) -> List[Dict]:
     """
     Analyze user skills against all job roles and return ranked matches
     
     Args:
         user_skills: Set of skills from user's resume
+        top_k: Only return the best k roles; None returns the full ranking
+        on_event: Optional callback receiving a 'roles_scored' StageEvent
         
     Returns:
         List of job role matches sorted by score (highest first)
         Each match contains: role_name, match_score, demand_score, 
         combined_score, description, required_skills, missing_skills
     """
-    matches = []
-    
-    for role_name, role_data in JOB_ROLES_DB.items():
-        required_skills = role_data['required_skills']
-        match_score = calculate_match_score(user_skills, required_skills)
-        demand_score = role_data['demand_score']
-        
-        # Combined score: 70% match + 30% demand
-        combined_score = (match_score * 0.7) + (demand_score * 0.3)
-        
-        # Identify missing skills
-        user_skills_lower = {skill.lower() for skill in user_skills}
-        missing_skills = [
-            skill for skill in required_skills 
-            if skill.lower() not in user_skills_lower
-        ]
-        
-        # Identify known skills
-        known_skills = [
-            skill for skill in required_skills 
-            if skill.lower() in user_skills_lower
-        ]
-        
-        matches.append({
-            'role_name': role_name,
-            'match_score': match_score,
-            'demand_score': demand_score,
-            'combined_score': round(combined_score, 1),
-            'description': role_data['description'],
-            'required_skills': required_skills,
-            'known_skills': known_skills, # Key for new feature
-            'missing_skills': missing_skills,
-            'learning_resources': role_data['learning_resources'],
-            'career_path': role_data['career_path']
-        })
-    
-    # Sort by combined score (highest first)
-    matches.sort(key=lambda x: x['combined_score'], reverse=True)
-    
+    timer = StageTimer(on_event)
+    hits = ROLE_INDEX.match_positions(normalize_skills(user_skills))
+
+    if top_k is not None:
+        matches = _top_k_matches(hits, top_k)
+        timer.emit('roles_scored', roles=len(ROLE_INDEX), touched=len(hits), returned=len(matches))
+        return matches
+
+    # Score only the roles reached through the postings
+    scored = []
+    for role_id, positions in hits.items():
+        match_score = match_percentage(len(positions), ROLE_INDEX.required_counts[role_id])
+        combined_score = _combined_score(match_score, ROLE_INDEX.demand_scores[role_id])
+        scored.append((-combined_score, role_id, match_score, positions))
+    scored.sort()
+
+    untouched = (
+        (-_ZERO_MATCH_SCORES[role_id], role_id, 0.0, ())
+        for role_id in _ZERO_MATCH_ORDER
+        if role_id not in hits
+    )
+
+    # Sort by combined score (highest first), ties in catalog order
+    matches = [
+        _build_match(role_id, match_score, -neg_combined, positions)
+        for neg_combined, role_id, match_score, positions in heapq.merge(scored, untouched)
+    ]
+    timer.emit('roles_scored', roles=len(ROLE_INDEX), touched=len(hits), returned=len(matches))
     return matches
 
 
+def score_touched_roles(user_skills: Set[str]) -> List[Tuple[str, float, float]]:
+    """
+    Score every role that shares at least one required skill with the user
+
+    Roles left out have a match score of 0. Unlike analyze_career_fit this
+    builds no result dicts, so it is cheap enough to run for storage.
+
+    Args:
+        user_skills: Set of skills from user's resume
+
+    Returns:
+        List of (role_name, match_score, combined_score) in catalog order
+    """
+    hits = ROLE_INDEX.match_positions(normalize_skills(user_skills))
+    scores = []
+    for role_id in sorted(hits):
+        match_score = match_percentage(len(hits[role_id]), ROLE_INDEX.required_counts[role_id])
+        scores.append((ROLE_INDEX.role_names[role_id], match_score, _combined_score(match_score, ROLE_INDEX.demand_scores[role_id])))
+    return scores
+
+
+def _top_k_matches(hits: Dict[int, List[int]], top_k: int) -> List[Dict]:
+    """
+    Keep the best k roles in a bounded heap, pruning by score upper bound
+
+    Heap entries are (combined_score, -role_id, ...) so the root is the entry
+    that would be ranked last: lowest score, and latest in catalog order on ties.
+    """
+    if top_k <= 0:
+        return []
+
+    heap = []
+
+    # The best untouched roles are simply the first k not reached by postings
+    for role_id in _ZERO_MATCH_ORDER:
+        if len(heap) == top_k:
+            break
+        if role_id not in hits:
+            heapq.heappush(heap, (_ZERO_MATCH_SCORES[role_id], -role_id, 0.0, ()))
+
+    # Visit touched roles from the highest upper bound down; once a bound
+    # cannot reach the current k-th score, no later role can either
+    for role_id in sorted(hits, key=lambda role_id: (-_UPPER_BOUNDS[role_id], role_id)):
+        if len(heap) == top_k and _UPPER_BOUNDS[role_id] < heap[0][0]:
+            break
+        positions = hits[role_id]
+        match_score = match_percentage(len(positions), ROLE_INDEX.required_counts[role_id])
+        entry = (_combined_score(match_score, ROLE_INDEX.demand_scores[role_id]), -role_id, match_score, positions)
+        if len(heap) < top_k:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+
+    # Only the survivors pay for known/missing lists and resource payloads
+    heap.sort(key=lambda entry: (-entry[0], -entry[1]))
+    return [
+        _build_match(-neg_role_id, match_score, combined_score, positions)
+        for combined_score, neg_role_id, match_score, positions in heap
+    ]
+
+
+# Resumes scored per matrix product; bounds the N x M score block in memory
+BATCH_CHUNK_SIZE = 256
+
+
+def _exact_round(values, score_fn) -> "np.ndarray":
+    """
+    Apply a Python-side rounding function element-wise through the unique values.
+
+    np.round rounds half-way cases differently from the builtin round(), so
+    every distinct raw value is rounded in Python and broadcast back.
+    """
+    unique_values, inverse = np.unique(values, return_inverse=True)
+    rounded = np.array([score_fn(value) for value in unique_values.tolist()], dtype=np.float64)
+    return rounded[inverse].reshape(values.shape)
+
+
+def score_career_fit_batch(list_of_skill_sets: Sequence[Set[str]]) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """
+    Score many resumes against every role with one matrix product per chunk
+
+    Args:
+        list_of_skill_sets: One set of skills per resume
+
+    Returns:
+        Tuple of (match_scores, demand_scores, combined_scores). Match and
+        combined scores are N x M arrays in catalog role order; demand
+        scores are a length-M array. Values equal the scalar path exactly.
+    """
+    if np is None:
+        raise ImportError("NumPy is required for batch scoring. Install it with: pip install numpy")
+
+    user_skill_sets = [normalize_skills(skills) for skills in list_of_skill_sets]
+    role_count = len(ROLE_INDEX)
+    required = np.array(ROLE_INDEX.required_counts, dtype=np.int64)
+    demand = np.array(ROLE_INDEX.demand_scores, dtype=np.float64)
+
+    # Only the skill columns some resume in the batch actually has matter
+    columns = sorted(set().union(*user_skill_sets) & CATALOG.skill_ids.keys())
+    column_ids = {skill: col for col, skill in enumerate(columns)}
+    role_skill = np.zeros((role_count, len(columns)), dtype=np.float32)
+    for col, skill in enumerate(columns):
+        posting_roles, _ = CATALOG.postings(CATALOG.skill_ids[skill])
+        posting_roles = np.frombuffer(posting_roles, dtype=np.uintc)
+        np.add.at(role_skill[:, col], posting_roles, 1)
+
+    counts = np.empty((len(user_skill_sets), role_count), dtype=np.int64)
+    for start in range(0, len(user_skill_sets), BATCH_CHUNK_SIZE):
+        chunk = user_skill_sets[start:start + BATCH_CHUNK_SIZE]
+        resume_skill = np.zeros((len(chunk), len(columns)), dtype=np.float32)
+        for row, skills in enumerate(chunk):
+            resume_skill[row, [column_ids[skill] for skill in skills if skill in column_ids]] = 1
+        counts[start:start + len(chunk)] = np.rint(resume_skill @ role_skill.T)
+
+    # Encode each (matched, required) pair as one integer so it rounds once
+    base = int(required.max(initial=0)) + 1
+    match_scores = _exact_round(
+        counts * base + required,
+        lambda key: match_percentage(*divmod(int(key), base)),
+    )
+    raw_combined = (match_scores * 0.7) + (demand * 0.3)
+    combined_scores = _exact_round(raw_combined, lambda value: round(value, 1))
+
+    return match_scores, demand, combined_scores
+
+
+def analyze_career_fit_batch(list_of_skill_sets: Sequence[Set[str]], top_k: Optional[int] = None) -> List[List[Dict]]:
+    """
+    Vectorized equivalent of calling analyze_career_fit once per resume
+
+    Args:
+        list_of_skill_sets: One set of skills per resume
+        top_k: Only build the best k roles per resume; None keeps the full ranking
+
+    Returns:
+        One ranked list of role matches per resume, identical to analyze_career_fit
+    """
+    if top_k is not None and top_k <= 0:
+        return [[] for _ in list_of_skill_sets]
+    match_scores, _, combined_scores = score_career_fit_batch(list_of_skill_sets)
+    role_ids = np.arange(len(ROLE_INDEX))
+
+    results = []
+    for row, user_skills in enumerate(list_of_skill_sets):
+        hits = ROLE_INDEX.match_positions(normalize_skills(user_skills))
+        # Highest combined score first, ties in catalog order
+        order = np.lexsort((role_ids, -combined_scores[row]))[:top_k]
+        row_match = match_scores[row].tolist()
+        row_combined = combined_scores[row].tolist()
+        results.append([
+            _build_match(role_id, row_match[role_id], row_combined[role_id], hits.get(role_id, ()))
+            for role_id in order.tolist()
+        ])
+    return results
+
+
 def get_learning_plan(role_match: Dict) -> List[Dict]:
     """
     Generate a learning plan for missing skills
@@ -102,14 +339,19 @@ def get_learning_plan(role_match: Dict) -> List[Dict]:
     learning_plan = []
     missing_skills = role_match['missing_skills']
     learning_resources = role_match['learning_resources']
-    
-    # Create a case-insensitive version of learning_resources
-    learning_resources_lower = {k.lower(): v for k, v in learning_resources.items()}
+
+    role_id = CATALOG.role_ids.get(role_match.get('role_name'))
+    if role_id is not None and learning_resources is CATALOG.role_data(role_id)['learning_resources']:
+        # Unmodified catalog role: use the precompiled case-insensitive table
+        lookup = lambda skill: CATALOG.resource_for(role_id, skill)
+    else:
+        # Create a case-insensitive version of learning_resources
+        learning_resources_lower = {k.lower(): v for k, v in learning_resources.items()}
+        lookup = lambda skill: learning_resources_lower.get(skill.lower())
     
     for skill in missing_skills:
-        skill_lower = skill.lower()
-        if skill_lower in learning_resources_lower:
-            resource = learning_resources_lower[skill_lower]
+        resource = lookup(skill)
+        if resource is not None:
             learning_plan.append({
                 'skill': skill,
                 'youtube_link': resource['youtube'],
@@ -126,48 +368,139 @@ def get_learning_plan(role_match: Dict) -> List[Dict]:
     return learning_plan
 
 
+def required_skill_hours(role_id: int) -> List[Tuple[str, int]]:
+    """
+    Learning-plan hours for every required skill of a catalog role
+
+    Args:
+        role_id: Index of the role in ROLE_INDEX
+
+    Returns:
+        List of (skill, estimated_hours) in requirement order, as
+        get_learning_plan reports them when every skill is missing
+    """
+    role_data = ROLE_INDEX.role_data(role_id)
+    plan = get_learning_plan({
+        'role_name': ROLE_INDEX.role_names[role_id],
+        'missing_skills': role_data['required_skills'],
+        'learning_resources': role_data['learning_resources'],
+    })
+    return [(item['skill'], item['estimated_hours']) for item in plan]
+
+
+class RoadmapStep(NamedTuple):
+    """One stage of a career roadmap; to_string() is only for plain-text output"""
+    step: int
+    title: str
+    duration: str
+    description: str
+    resources: Tuple[str, ...]
+
+    def to_string(self) -> str:
+        """Serialize as "1. Title [Duration]: Description Resources: A, B" (parsed back by from_string)"""
+        return f"{self.step}. {self.title} [{self.duration}]: {self.description} Resources: {', '.join(self.resources) or 'N/A'}"
+
+    @classmethod
+    def from_string(cls, step_string: str) -> "RoadmapStep":
+        """
+        Parse a serialized step, e.g. one saved before roadmaps were structured
+
+        Strings that don't follow the format become a step 0 whose
+        description is the whole string.
+        """
+        match = _ROADMAP_STEP_PATTERN.match(step_string)
+        if match is None:
+            return cls(0, '', 'N/A', step_string, ())
+        step, title, duration, description, resources = match.groups()
+        resources = tuple(resource.strip() for resource in (resources or '').split(',') if resource.strip())
+        return cls(int(step), title.strip(), (duration or 'N/A').strip(), description.strip(), () if resources == ('N/A',) else resources)
+
+
+_ROADMAP_STEP_PATTERN = re.compile(
+    r"""(\d+)\.\s*                  # 1. Step number
+    ([^\[:]+)\s*                    # 2. Title (until [ or :)
+    (?:\[([^\]]+)\])?\s*            # 3. [Duration] (optional)
+    :\s*                            # Separator :
+    (.*?)\s*                        # 4. Description (non-greedy)
+    (?:Resources:\s*(.*))?          # 5. Resources: ... (optional)
+    $""", re.VERBOSE | re.DOTALL
+)
+
+def _roadmap_stage(step_title: str) -> Tuple[str, str, Tuple[str, ...]]:
+    """Placeholder (duration, description, resources) for a career stage title"""
+    title = step_title.lower()
+    if title.startswith('junior'):
+        return (
+            "1 Year",
+            "Master core skills from the learning plan. Focus on hands-on execution and seeking continuous mentorship.",
+            ("Internal Team Wiki", "Mentor Guidance"),
+        )
+    if 'mid-level' in title or 'specialist' in title:
+        return (
+            "1.5 Years",
+            "Develop end-to-end ownership of project components. Start participating in architectural and system design decisions.",
+            ("System Design Courses", "Advanced Technical Books"),
+        )
+    if 'senior' in title or 'architect' in title:
+        return (
+            "2 Years",
+            "Drive high-level technical decisions, mentor team members, and focus on long-term system health and scalability.",
+            ("Technical Conference Attendance", "Leadership Training"),
+        )
+    if 'lead' in title or 'manager' in title or 'director' in title:
+        return (
+            "Ongoing",
+            "Transition focus from individual contribution to strategy, team development, and aligning technical goals with business objectives.",
+            ("Management Literature", "Executive Coaching"),
+        )
+    return "TBD", "Continue to grow and seek out new challenges in this stage of your career.", ()
+
+
+def build_roadmap(role_match: Dict) -> List[RoadmapStep]:
+    """
+    Build the career progression roadmap for a role
+
+    Args:
+        role_match: Dictionary containing role match information (career_path is used)
+
+    Returns:
+        One RoadmapStep per career_path entry, numbered from 1
+    """
+    return [
+        RoadmapStep(step_number, step_title, *_roadmap_stage(step_title))
+        for step_number, step_title in enumerate(role_match.get('career_path', []), 1)
+    ]
+
+
 def generate_career_roadmap(role_match: Dict) -> List[str]:
     """
-    Generate a career progression roadmap (FIXED to return List[str])
-    
+    Career progression roadmap as serialized strings
+
+    Kept for callers that want plain text; render from build_roadmap or
+    roadmap_for_role instead of parsing these back.
+
     Args:
         role_match: Dictionary containing role match information.
-        
+
     Returns:
-        A list of structured strings for the frontend timeline parser.
+        A list of RoadmapStep.to_string() strings
     """
-    career_path_list = role_match.get('career_path', [])
-    structured_roadmap = []
-    
-    for i, step_title in enumerate(career_path_list):
-        step_number = i + 1
-        
-        # Placeholder data for structure
-        if step_title.lower().startswith('junior'):
-            duration = "1 Year"
-            description = "Master core skills from the learning plan. Focus on hands-on execution and seeking continuous mentorship."
-            resources = "Internal Team Wiki, Mentor Guidance"
-        elif 'mid-level' in step_title.lower() or 'specialist' in step_title.lower():
-            duration = "1.5 Years"
-            description = "Develop end-to-end ownership of project components. Start participating in architectural and system design decisions."
-            resources = "System Design Courses, Advanced Technical Books"
-        elif 'senior' in step_title.lower() or 'architect' in step_title.lower():
-            duration = "2 Years"
-            description = "Drive high-level technical decisions, mentor team members, and focus on long-term system health and scalability."
-            resources = "Technical Conference Attendance, Leadership Training"
-        elif 'lead' in step_title.lower() or 'manager' in step_title.lower() or 'director' in step_title.lower():
-            duration = "Ongoing"
-            description = "Transition focus from individual contribution to strategy, team development, and aligning technical goals with business objectives."
-            resources = "Management Literature, Executive Coaching"
-        else:
-            duration = "TBD"
-            description = "Continue to grow and seek out new challenges in this stage of your career."
-            resources = "N/A"
-            
-        formatted_step = f"{step_number}. {step_title} [{duration}]: {description}. Resources: {resources}"
-        structured_roadmap.append(formatted_step)
-        
-    return structured_roadmap
+    return [step.to_string() for step in roadmap_for_role(role_match)]
+
+
+# Every catalog role's roadmap, built once when the catalog loads
+ROLE_ROADMAPS: Dict[str, Tuple[RoadmapStep, ...]] = {
+    role_name: tuple(build_roadmap(ROLE_INDEX.role_data(role_id)))
+    for role_id, role_name in enumerate(ROLE_INDEX.role_names)
+}
+
+
+def roadmap_for_role(role_match: Dict) -> Sequence[RoadmapStep]:
+    """Precomputed roadmap for an unmodified catalog role, built on the fly otherwise"""
+    role_id = CATALOG.role_ids.get(role_match.get('role_name'))
+    if role_id is not None and role_match.get('career_path') == ROLE_INDEX.role_data(role_id)['career_path']:
+        return ROLE_ROADMAPS[role_match['role_name']]
+    return build_roadmap(role_match)
 
 
 def get_job_application_links(role_name: str, known_skills: List[str]) -> List[Dict]:
@@ -0,0 +1,255 @@
+"""
+Catalog compiler: turns the job roles source data into an immutable snapshot
+
+Usage:
+    python -m backend.catalog catalog.snapshot
+
+Point CAREER_COMPASS_CATALOG at the written file to load it at startup
+instead of compiling JOB_ROLES_DB.
+"""
+
+import os
+import pickle
+import sys
+from array import array
+from typing import Dict, List, Mapping, Optional, Tuple
+
+
+SNAPSHOT_MAGIC = b'CCSNAP'
+SNAPSHOT_FORMAT = 1
+
+# Every table a snapshot holds, in serialization order. Variable-length
+# per-role and per-skill lists are stored CSR-style: one flat array plus an
+# offsets array, so a snapshot is a handful of large buffers to load.
+_FIELDS = (
+    'skills', 'labels', 'role_names', 'descriptions', 'career_paths', 'demand_scores', 'resources',
+    'role_offsets', 'role_skill_ids', 'role_label_ids',
+    'resource_offsets', 'resource_label_ids', 'resource_skill_ids', 'resource_ids',
+    'posting_offsets', 'posting_roles', 'posting_positions',
+)
+
+
+class CatalogSnapshot:
+    """
+    Interned, precomputed view of the roles catalog.
+
+    Skills are interned as integer IDs over their lowercase form, display
+    strings as label IDs over their original casing. Per-role requirement
+    lists are arrays of those IDs, learning resources are deduplicated into
+    one table, and the inverted skill -> (role, position) postings are
+    stored as parallel arrays so loading a snapshot needs no recomputation.
+    """
+
+    __slots__ = _FIELDS + ('skill_ids', 'role_ids', '_role_data')
+
+    def __init__(self, **tables):
+        for name in _FIELDS:
+            object.__setattr__(self, name, tables[name])
+        object.__setattr__(self, 'skill_ids', {skill: skill_id for skill_id, skill in enumerate(self.skills)})
+        object.__setattr__(self, 'role_ids', {role: role_id for role_id, role in enumerate(self.role_names)})
+        object.__setattr__(self, '_role_data', [None] * len(self.role_names))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CatalogSnapshot is immutable")
+
+    def __len__(self) -> int:
+        return len(self.role_names)
+
+    def required_count(self, role_id: int) -> int:
+        """Number of required skills (with duplicates) for a role"""
+        return self.role_offsets[role_id + 1] - self.role_offsets[role_id]
+
+    def role_skills(self, role_id: int) -> array:
+        """Required skill IDs of a role in requirement order"""
+        return self.role_skill_ids[self.role_offsets[role_id]:self.role_offsets[role_id + 1]]
+
+    def postings(self, skill_id: int) -> Tuple[array, array]:
+        """Parallel (role_ids, positions) arrays of every requirement on a skill"""
+        start, stop = self.posting_offsets[skill_id], self.posting_offsets[skill_id + 1]
+        return self.posting_roles[start:stop], self.posting_positions[start:stop]
+
+    def _role_resources(self, role_id: int):
+        start, stop = self.resource_offsets[role_id], self.resource_offsets[role_id + 1]
+        return zip(
+            self.resource_label_ids[start:stop],
+            self.resource_skill_ids[start:stop],
+            self.resource_ids[start:stop],
+        )
+
+    def role_data(self, role_id: int) -> Dict:
+        """
+        Materialize one role in the JOB_ROLES_DB shape (built once, then reused)
+
+        Args:
+            role_id: Index of the role in the snapshot
+
+        Returns:
+            Dictionary with required_skills, demand_score, description,
+            learning_resources and career_path
+        """
+        data = self._role_data[role_id]
+        if data is None:
+            labels = self.labels
+            start, stop = self.role_offsets[role_id], self.role_offsets[role_id + 1]
+            data = {
+                'required_skills': [labels[label_id] for label_id in self.role_label_ids[start:stop]],
+                'demand_score': self.demand_scores[role_id],
+                'description': self.descriptions[role_id],
+                'learning_resources': {
+                    labels[label_id]: dict(self.resources[resource_id])
+                    for label_id, _, resource_id in self._role_resources(role_id)
+                },
+                'career_path': list(self.career_paths[role_id]),
+            }
+            self._role_data[role_id] = data
+        return data
+
+    def resource_for(self, role_id: int, skill: str) -> Optional[Dict]:
+        """
+        Case-insensitive learning resource lookup for one role
+
+        Args:
+            role_id: Index of the role in the snapshot
+            skill: Skill name in any casing
+
+        Returns:
+            Resource dictionary, or None when the role has none for the skill
+        """
+        skill_id = self.skill_ids.get(skill.lower())
+        if skill_id is None:
+            return None
+        for _, resource_skill_id, resource_id in self._role_resources(role_id):
+            if resource_skill_id == skill_id:
+                return dict(self.resources[resource_id])
+        return None
+
+
+def compile_catalog(roles_db: Mapping[str, Dict]) -> CatalogSnapshot:
+    """
+    Compile a JOB_ROLES_DB-shaped mapping into a snapshot
+
+    Args:
+        roles_db: Mapping of role name to role data
+
+    Returns:
+        CatalogSnapshot holding every derived table
+    """
+    skill_ids: Dict[str, int] = {}
+    label_ids: Dict[str, int] = {}
+    resource_ids: Dict[Tuple, int] = {}
+
+    def intern_skill(name: str) -> int:
+        return skill_ids.setdefault(name.lower(), len(skill_ids))
+
+    def intern_label(name: str) -> int:
+        return label_ids.setdefault(name, len(label_ids))
+
+    role_names, descriptions, career_paths, demand_scores = [], [], [], []
+    role_offsets, role_skill_ids, role_label_ids = array('I', [0]), array('I'), array('I')
+    resource_offsets, resource_label_ids, resource_skill_ids, resource_table_ids = (
+        array('I', [0]), array('I'), array('I'), array('I')
+    )
+    requirements: List[Tuple[int, int, int]] = []
+
+    for role_id, (role_name, role_data) in enumerate(roles_db.items()):
+        role_names.append(role_name)
+        descriptions.append(role_data['description'])
+        career_paths.append(tuple(role_data['career_path']))
+        demand_scores.append(role_data['demand_score'])
+
+        for position, skill in enumerate(role_data['required_skills']):
+            skill_id = intern_skill(skill)
+            role_skill_ids.append(skill_id)
+            role_label_ids.append(intern_label(skill))
+            requirements.append((skill_id, role_id, position))
+        role_offsets.append(len(role_skill_ids))
+
+        for skill, resource in role_data['learning_resources'].items():
+            resource_label_ids.append(intern_label(skill))
+            resource_skill_ids.append(intern_skill(skill))
+            resource_table_ids.append(resource_ids.setdefault(tuple(resource.items()), len(resource_ids)))
+        resource_offsets.append(len(resource_label_ids))
+
+    # Group requirements by skill to lay the postings out contiguously
+    requirements.sort()
+    posting_offsets = array('I', [0] * (len(skill_ids) + 1))
+    for skill_id, _, _ in requirements:
+        posting_offsets[skill_id + 1] += 1
+    for skill_id in range(len(skill_ids)):
+        posting_offsets[skill_id + 1] += posting_offsets[skill_id]
+
+    return CatalogSnapshot(
+        skills=tuple(skill_ids),
+        labels=tuple(label_ids),
+        role_names=tuple(role_names),
+        descriptions=tuple(descriptions),
+        career_paths=tuple(career_paths),
+        demand_scores=tuple(demand_scores),
+        resources=tuple(resource_ids),
+        role_offsets=role_offsets,
+        role_skill_ids=role_skill_ids,
+        role_label_ids=role_label_ids,
+        resource_offsets=resource_offsets,
+        resource_label_ids=resource_label_ids,
+        resource_skill_ids=resource_skill_ids,
+        resource_ids=resource_table_ids,
+        posting_offsets=posting_offsets,
+        posting_roles=array('I', (role_id for _, role_id, _ in requirements)),
+        posting_positions=array('I', (position for _, _, position in requirements)),
+    )
+
+
+def save_snapshot(snapshot: CatalogSnapshot, path: str) -> None:
+    """
+    Write a snapshot to a binary file
+
+    Args:
+        snapshot: Compiled catalog
+        path: Destination file
+    """
+    tables = tuple(getattr(snapshot, name) for name in _FIELDS)
+    with open(path, 'wb') as snapshot_file:
+        snapshot_file.write(SNAPSHOT_MAGIC)
+        pickle.dump((SNAPSHOT_FORMAT, tables), snapshot_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_snapshot(path: str) -> CatalogSnapshot:
+    """
+    Load a snapshot written by save_snapshot
+
+    Args:
+        path: Snapshot file (only load files you produced yourself)
+
+    Returns:
+        CatalogSnapshot
+    """
+    with open(path, 'rb') as snapshot_file:
+        if snapshot_file.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+            raise ValueError(f"Not a catalog snapshot: {path}")
+        version, tables = pickle.load(snapshot_file)
+    if version != SNAPSHOT_FORMAT:
+        raise ValueError(f"Unsupported catalog snapshot format {version} in {path}")
+    return CatalogSnapshot(**dict(zip(_FIELDS, tables)))
+
+
+def load_catalog() -> CatalogSnapshot:
+    """
+    Load the catalog used by the app
+
+    Returns:
+        The snapshot at CAREER_COMPASS_CATALOG if set, otherwise JOB_ROLES_DB compiled in memory
+    """
+    path = os.environ.get('CAREER_COMPASS_CATALOG')
+    if path:
+        return load_snapshot(path)
+
+    from backend.data.job_roles_data import JOB_ROLES_DB
+    return compile_catalog(JOB_ROLES_DB)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python -m backend.catalog OUTPUT_PATH", file=sys.stderr)
+        sys.exit(2)
+    from backend.data.job_roles_data import JOB_ROLES_DB
+    save_snapshot(compile_catalog(JOB_ROLES_DB), sys.argv[1])
@@ -0,0 +1,309 @@
+"""
+Cohort skill-gap analytics over stored analyses, computed with vectorized pandas
+
+Usage:
+    python -m backend.cohort_analytics --store analyses.db --top 5
+"""
+
+import argparse
+import sys
+import time
+from typing import Dict, Optional, Sequence
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:
+    np = pd = None
+
+from backend.career_analyzer import ROLE_INDEX, required_skill_hours
+
+
+# Fit-score histogram buckets (0, 10], (10, 20], ... (90, 100]; resumes that
+# share no skill with a role have no stored score and are counted as '0'
+FIT_BINS = list(range(0, 101, 10))
+FIT_LABELS = [f"{low}-{high}" for low, high in zip(FIT_BINS, FIT_BINS[1:])]
+_BUCKET_EDGES = np.array(FIT_BINS[1:], dtype=np.float32) if np is not None else None
+
+
+def _role_dtype() -> "pd.CategoricalDtype":
+    return pd.CategoricalDtype(list(ROLE_INDEX.role_names))
+
+
+def requirement_frame() -> "pd.DataFrame":
+    """
+    One row per (role, required skill) with its learning-plan hours
+
+    Returns:
+        DataFrame with role (categorical), skill (lowercased key),
+        skill_name, hours and demand_score columns
+    """
+    rows = {'role': [], 'skill': [], 'skill_name': [], 'hours': [], 'demand_score': []}
+    for role_id, role_name in enumerate(ROLE_INDEX.role_names):
+        for skill, hours in required_skill_hours(role_id):
+            rows['role'].append(role_name)
+            rows['skill'].append(skill.lower())
+            rows['skill_name'].append(skill)
+            rows['hours'].append(hours)
+            rows['demand_score'].append(ROLE_INDEX.demand_scores[role_id])
+    frame = pd.DataFrame(rows).astype({'role': _role_dtype(), 'hours': 'float64', 'demand_score': 'float64'})
+    # A requirement listed twice is still one skill to learn
+    return frame.drop_duplicates(['role', 'skill'], ignore_index=True)
+
+
+def score_frame(resume_ids: Sequence[int], role_codes: Sequence[int], match_scores: Sequence[float]) -> "pd.DataFrame":
+    """
+    Columnar role scores: resume_id (int64), role (categorical, catalog order) and match_score (float32)
+
+    Args:
+        resume_ids: Resume of each row
+        role_codes: Catalog role id of each row
+        match_scores: Match score (0-100) of each row; only rows above 0 count
+    """
+    return pd.DataFrame({
+        'resume_id': np.asarray(resume_ids, dtype=np.int64),
+        'role': pd.Categorical.from_codes(np.asarray(role_codes, dtype=np.int16), dtype=_role_dtype()),
+        'match_score': np.asarray(match_scores, dtype=np.float32),
+    })
+
+
+def skill_frame(resume_ids: Sequence[int], skill_codes: Sequence[int], skill_keys: Sequence[str]) -> "pd.DataFrame":
+    """
+    Columnar resume skills: resume_id (int64) and skill (categorical over skill_keys)
+
+    Args:
+        resume_ids: Resume of each row
+        skill_codes: Index into skill_keys of each row
+        skill_keys: Lowercased canonical skill names
+    """
+    return pd.DataFrame({
+        'resume_id': np.asarray(resume_ids, dtype=np.int64),
+        'skill': pd.Categorical.from_codes(np.asarray(skill_codes, dtype=np.int32), categories=list(skill_keys)),
+    })
+
+
+def _plain_index(series: "pd.Series") -> "pd.Series":
+    """Aggregates are tiny; plain string keys let deltas with different categories add up"""
+    if isinstance(series.index, pd.MultiIndex):
+        series.index = pd.MultiIndex.from_arrays(
+            [series.index.get_level_values(level).astype(str) for level in range(series.index.nlevels)],
+            names=series.index.names,
+        )
+    else:
+        series.index = series.index.astype(str)
+    return series
+
+
+def _accumulate(total: "pd.Series", delta: "pd.Series") -> "pd.Series":
+    if total.empty:
+        return delta
+    return total.add(delta, fill_value=0).astype(total.dtype)
+
+
+class CohortAnalytics:
+    """
+    Skill-gap aggregates over every analysis in an AnalysisStore.
+
+    A role's cohort is every resume sharing at least one required skill
+    with it (a match score above 0). Everything reported is derived from
+    additive counts and sums: cohort sizes, score sums, fit histograms and
+    how many cohort members have each required skill. refresh() therefore
+    only loads resumes stored since the previous refresh and adds their
+    counts; if an already-loaded resume was analyzed again, it rebuilds
+    from scratch. Timings of the last refresh are kept in timings.
+    """
+
+    def __init__(self, store=None):
+        """
+        Args:
+            store: backend.analysis_store.AnalysisStore, or None to feed frames through add_frames
+        """
+        if pd is None:
+            raise ImportError("pandas is required for cohort analytics. Install it with: pip install pandas")
+        self.store = store
+        self.requirements = requirement_frame()
+        self.timings: Dict[str, float] = {}
+        self._reset()
+
+    def _reset(self) -> None:
+        self._last_id = 0
+        # Store version the loaded rows were read at; later rewrites have a higher one
+        self._version = 0
+        self._resumes = 0
+        self._cohort = pd.Series(dtype='int64')
+        self._score_sum = pd.Series(dtype='float64')
+        self._histogram = pd.Series(dtype='int64')
+        self._have = pd.Series(dtype='int64')
+
+    @property
+    def resume_count(self) -> int:
+        return self._resumes
+
+    def refresh(self) -> Dict[str, float]:
+        """
+        Fold in analyses stored since the last refresh
+
+        Returns:
+            timings: new_resumes, rebuilt (0 or 1), load_ms and compute_ms
+        """
+        began = time.perf_counter()
+        rows = self.store.rows_since(self._last_id, self._version)
+        rebuilt = bool(rows['rewritten'])
+        if rebuilt:
+            self._reset()
+            rows = self.store.rows_since()
+
+        role_codes = {store_id: ROLE_INDEX.catalog.role_ids.get(name, -1) for store_id, name in rows['roles'].items()}
+        scores = np.array(rows['role_scores'], dtype=np.float64).reshape(-1, 3)
+        codes = np.array([role_codes[role_id] for role_id in scores[:, 1].astype(np.int64).tolist()], dtype=np.int16)
+        # Roles since dropped from the catalog have no requirements to report on
+        known = codes >= 0
+        scores_df = score_frame(scores[known, 0], codes[known], scores[known, 2])
+
+        skill_ids = sorted(rows['skills'])
+        skills = np.array(rows['resume_skills'], dtype=np.int64).reshape(-1, 2)
+        skills_df = skill_frame(skills[:, 0], np.searchsorted(skill_ids, skills[:, 1]), [rows['skills'][skill_id] for skill_id in skill_ids])
+        loaded = time.perf_counter()
+
+        self.add_frames(scores_df, skills_df, rows['resumes'])
+        self._last_id = rows['last_id']
+        self._version = rows['version']
+        self.timings = {
+            'new_resumes': rows['resumes'],
+            'rebuilt': int(rebuilt),
+            'load_ms': (loaded - began) * 1000,
+            'compute_ms': self.timings['compute_ms'],
+        }
+        return self.timings
+
+    def add_frames(self, scores: "pd.DataFrame", skills: "pd.DataFrame", resumes: int) -> None:
+        """
+        Add a batch of new analyses to the aggregates
+
+        Args:
+            scores: score_frame of the batch
+            skills: skill_frame of the batch
+            resumes: Resumes in the batch, including ones with no scores
+        """
+        began = time.perf_counter()
+        by_role = scores.groupby('role', observed=True)
+        cohort = _plain_index(by_role.size())
+        score_sum = _plain_index(by_role['match_score'].sum().astype('float64'))
+
+        # One (role, bucket) code per row, so the 2-D histogram is a single counting pass
+        role_codes = scores['role'].cat.codes.to_numpy().astype(np.int64)
+        buckets = np.searchsorted(_BUCKET_EDGES, scores['match_score'].to_numpy(), side='left')
+        counts = np.bincount(role_codes * len(FIT_LABELS) + buckets, minlength=len(ROLE_INDEX) * len(FIT_LABELS))
+        histogram = pd.Series(counts, index=pd.MultiIndex.from_product([ROLE_INDEX.role_names, FIT_LABELS], names=['role', 'fit']))
+        histogram = histogram[histogram > 0]
+
+        # Having a required skill implies a match score above 0, so every
+        # resume with a skill is in the cohort of each role requiring it
+        skill_counts = skills['skill'].value_counts()
+        skill_counts.index = skill_counts.index.astype(str)
+        required = self.requirements
+        have = pd.Series(
+            required['skill'].map(skill_counts).fillna(0).astype('int64').to_numpy(),
+            index=pd.MultiIndex.from_arrays([required['role'].astype(str), required['skill']], names=['role', 'skill']),
+        )
+        have = have[have > 0]
+
+        self._resumes += resumes
+        self._cohort = _accumulate(self._cohort, cohort)
+        self._score_sum = _accumulate(self._score_sum, score_sum)
+        self._histogram = _accumulate(self._histogram, histogram)
+        self._have = _accumulate(self._have, have)
+        self.timings = {'compute_ms': (time.perf_counter() - began) * 1000}
+
+    def _requirements_with_counts(self) -> "pd.DataFrame":
+        frame = self.requirements.copy()
+        roles = frame['role'].astype(str)
+        frame['cohort'] = roles.map(self._cohort).fillna(0).astype('int64')
+        have_index = pd.MultiIndex.from_arrays([roles, frame['skill']])
+        frame['have'] = self._have.reindex(have_index, fill_value=0).to_numpy()
+        frame['missing'] = frame['cohort'] - frame['have']
+        return frame
+
+    def missing_skills(self, role: Optional[str] = None, top: int = 10) -> "pd.DataFrame":
+        """
+        Most common missing skills per role
+
+        Args:
+            role: Only this role (default: every role)
+            top: Skills kept per role
+
+        Returns:
+            DataFrame with role, skill_name, cohort, missing, missing_share,
+            hours and weighted_hours (missing x hours x demand / 100)
+        """
+        frame = self._requirements_with_counts()
+        if role is not None:
+            frame = frame[frame['role'] == role]
+        frame['missing_share'] = (frame['missing'] / frame['cohort'].where(frame['cohort'] > 0)).fillna(0.0)
+        frame['weighted_hours'] = frame['missing'] * frame['hours'] * frame['demand_score'] / 100
+        frame = frame.sort_values(['role', 'missing', 'skill_name'], ascending=[True, False, True])
+        columns = ['role', 'skill_name', 'cohort', 'missing', 'missing_share', 'hours', 'weighted_hours']
+        return frame.groupby('role', observed=True).head(top)[columns].reset_index(drop=True)
+
+    def fit_distribution(self) -> "pd.DataFrame":
+        """
+        How many resumes fall in each match-score bucket, per role
+
+        Returns:
+            DataFrame indexed by role with a '0' column (no shared skill),
+            one column per FIT_LABELS bucket and mean_fit over every resume
+        """
+        roles = pd.Index(ROLE_INDEX.role_names, name='role')
+        histogram = self._histogram.unstack(fill_value=0) if len(self._histogram) else pd.DataFrame(index=roles)
+        histogram = histogram.reindex(index=roles, columns=FIT_LABELS, fill_value=0).astype('int64')
+        cohort = self._cohort.reindex(roles, fill_value=0)
+        histogram.insert(0, '0', self._resumes - cohort)
+        histogram['mean_fit'] = self._score_sum.reindex(roles, fill_value=0.0) / max(self._resumes, 1)
+        return histogram
+
+    def gap_hours(self) -> "pd.DataFrame":
+        """
+        Learning hours between each role's cohort and the full requirement list
+
+        Returns:
+            DataFrame indexed by role with cohort, demand_score,
+            mean_gap_hours (per cohort member) and demand_weighted_gap_hours
+            (mean_gap_hours x demand / 100), highest weighted gap first
+        """
+        frame = self._requirements_with_counts()
+        frame['missing_hours'] = frame['missing'] * frame['hours']
+        totals = frame.groupby('role', observed=True).agg(
+            cohort=('cohort', 'first'), demand_score=('demand_score', 'first'), missing_hours=('missing_hours', 'sum'),
+        )
+        totals['mean_gap_hours'] = (totals['missing_hours'] / totals['cohort'].where(totals['cohort'] > 0)).fillna(0.0)
+        totals['demand_weighted_gap_hours'] = totals['mean_gap_hours'] * totals['demand_score'] / 100
+        totals.index = totals.index.astype(str)
+        return totals.drop(columns='missing_hours').sort_values('demand_weighted_gap_hours', ascending=False)
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m backend.cohort_analytics', description="Cohort skill-gap report")
+    parser.add_argument('-s', '--store', required=True, help="SQLite analysis store (see CAREER_COMPASS_ANALYSIS_DB)")
+    parser.add_argument('-t', '--top', type=int, default=5, help="Missing skills listed per role")
+    args = parser.parse_args(argv)
+
+    from backend.analysis_store import AnalysisStore
+
+    store = AnalysisStore(args.store)
+    try:
+        analytics = CohortAnalytics(store)
+        timings = analytics.refresh()
+        with pd.option_context('display.width', 160, 'display.max_rows', None, 'display.precision', 1):
+            print(analytics.gap_hours(), end='\n\n')
+            print(analytics.fit_distribution(), end='\n\n')
+            print(analytics.missing_skills(top=args.top).to_string(index=False))
+    finally:
+        store.close()
+    print(
+        f"{analytics.resume_count} resumes: load {timings['load_ms']:.0f} ms, compute {timings['compute_ms']:.0f} ms",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+Alternate spellings, abbreviations and synonyms for skills in COMMON_SKILLS
+"""
+
+# Canonical skill -> surface forms that should count as that skill.
+# Matching is case-insensitive and whole-word, like the canonical names.
+# Leave out forms that are ordinary words or other skills' abbreviations
+# ("Express", "REST", "Node", "CV", "TS"), parts of other skills' names or
+# aliases ("BI" in "Power BI", "ML" in "ML Ops"), and related tools,
+# products or broader topics that aren't the skill itself ("Keras",
+# "Kanban", "OpenCV", "MariaDB", "GitHub", "Data Pipelines"), since they
+# would create false matches.
+SKILL_ALIASES = {
+    # Programming Languages
+    "Python": ["Python3", "Python 3", "CPython"],
+    "JavaScript": ["JS", "ECMAScript", "ES6", "Vanilla JS"],
+    "C++": ["CPP", "C plus plus"],
+    "C#": ["C Sharp", "CSharp"],
+    "Go": ["Golang"],
+
+    # Web Technologies
+    "HTML": ["HTML5"],
+    "CSS": ["CSS3"],
+    "React": ["ReactJS", "React.js", "React JS"],
+    "Angular": ["AngularJS", "Angular.js"],
+    "Vue.js": ["Vue", "VueJS", "Vue 3"],
+    "Node.js": ["NodeJS", "Node JS"],
+    "Express.js": ["ExpressJS"],
+    "Spring Boot": ["SpringBoot"],
+    "REST APIs": ["REST API", "RESTful", "RESTful APIs", "RESTful services"],
+
+    # Databases
+    "SQL": ["T-SQL", "PL/SQL", "Structured Query Language"],
+    "PostgreSQL": ["Postgres", "Postgre", "PSQL"],
+    "MongoDB": ["Mongo"],
+    "NoSQL": ["Non-relational databases"],
+    "DynamoDB": ["Amazon DynamoDB"],
+
+    # Data Science & ML
+    "Machine Learning": ["ML Models", "ML Engineering", "ML Algorithms"],
+    "Deep Learning": ["Neural Networks"],
+    "TensorFlow": ["TF2"],
+    "Scikit-learn": ["sklearn", "scikit learn", "scikitlearn", "sci-kit learn"],
+    "NumPy": ["Numerical Python"],
+    "Data Visualization": ["Data Viz", "DataViz", "Data Visualisation"],
+    "Statistics": ["Statistical Analysis", "Statistical Modeling"],
+    "NLP": ["Natural Language Processing"],
+    "Computer Vision": ["Image Recognition"],
+
+    # Cloud & DevOps
+    "AWS": ["Amazon Web Services"],
+    "Azure": ["Microsoft Azure", "MS Azure"],
+    "GCP": ["Google Cloud", "Google Cloud Platform"],
+    "Kubernetes": ["k8s", "K8", "EKS", "GKE", "AKS"],
+    "CI/CD": ["CICD", "CI CD", "Continuous Integration", "Continuous Delivery", "Continuous Deployment"],
+    "Linux": ["Ubuntu", "RHEL", "CentOS", "Debian"],
+    "MLOps": ["ML Ops", "Machine Learning Operations"],
+
+    # Analytics & BI
+    "Power BI": ["PowerBI", "Microsoft Power BI"],
+    "Excel": ["MS Excel", "Microsoft Excel"],
+    "Data Analysis": ["Data Analytics"],
+    "Business Intelligence": ["BI Reporting", "BI Dashboards"],
+    "Data Cleaning": ["Data Cleansing", "Data Wrangling", "Data Munging"],
+    "ETL": ["ELT", "Extract Transform Load"],
+
+    # Other
+    "Agile": ["Agile Methodologies", "Agile Methodology"],
+    "JIRA": ["Atlassian Jira"],
+    "Testing": ["Unit Testing", "QA", "Test Automation"],
+    "Project Management": ["PMP"],
+}
+
+# Everyday words a letter or two away from a skill word, which the fuzzy
+# pass must not read as misspellings ("protect" vs "Project Management",
+# "reach" vs "React"). Job titles are added to these where the fuzzy
+# matcher is built.
+NON_SKILL_WORDS = [
+    "analyst", "analysts", "automaton", "busyness", "cents", "clearing",
+    "commuter", "computed", "computes", "decker", "docked", "docket",
+    "dockets", "expel", "flack", "flash", "jerkins", "leaning", "linus",
+    "machined", "mango", "protect", "reach", "redact", "redid", "reds",
+    "reposting", "scald", "scalar", "scale", "scalp", "scram", "scrub",
+    "scum", "shift", "strum", "tasting", "texting",
+]
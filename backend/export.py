@@ -0,0 +1,278 @@
+"""
+Bulk export of analyses to Parquet, Arrow IPC or CSV with streaming writers
+
+Usage:
+    python -m backend.export analyses.parquet --store analyses.db
+    python -m backend.export results.csv --batch results.jsonl --row-group-size 50000
+
+Every output row is one (resume, role) pair: the resume's skills, the role's
+scores, the known and missing required skills, and the learning-plan hours
+for the missing ones. Rows are written in bounded row groups, so memory
+stays flat however many analyses are exported.
+"""
+
+import argparse
+import csv
+import datetime
+import json
+import os
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+from backend.career_analyzer import ROLE_INDEX, normalize_skills, required_skill_hours
+
+
+# Rows buffered per Parquet row group, Arrow record batch or CSV chunk
+ROW_GROUP_SIZE = 50_000
+
+# List columns in CSV become one cell joined with this
+CSV_LIST_SEPARATOR = '; '
+
+FORMATS = {'.parquet': 'parquet', '.arrow': 'arrow', '.feather': 'arrow', '.csv': 'csv'}
+
+# Column name -> kind; list columns hold skill names
+EXPORT_COLUMNS = {
+    'resume_hash': 'string',
+    'file_name': 'string',
+    'analyzed_at': 'timestamp',
+    'skill_count': 'int',
+    'skills': 'list',
+    'role': 'category',
+    'match_score': 'float',
+    'combined_score': 'float',
+    'known_skills': 'list',
+    'missing_skills': 'list',
+    'gap_hours': 'float',
+}
+
+
+def _arrow_schema(dictionary: bool) -> "pa.Schema":
+    """
+    Args:
+        dictionary: Dictionary-encode category columns so they load as
+            categoricals; IPC files can't change a dictionary between batches
+    """
+    types = {
+        'string': pa.string(),
+        'timestamp': pa.timestamp('us', tz='UTC'),
+        'int': pa.int32(),
+        'list': pa.list_(pa.string()),
+        'category': pa.dictionary(pa.int16(), pa.string()) if dictionary else pa.string(),
+        'float': pa.float64(),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in EXPORT_COLUMNS.items()])
+
+
+class _CsvWriter:
+    def __init__(self, path: str):
+        self._file = open(path, 'w', encoding='utf-8', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(EXPORT_COLUMNS)
+        self._lists = [kind == 'list' for kind in EXPORT_COLUMNS.values()]
+        self._timestamps = [kind == 'timestamp' for kind in EXPORT_COLUMNS.values()]
+
+    def write(self, columns: Dict[str, List]) -> None:
+        cells = list(columns.values())
+        for index, is_list in enumerate(self._lists):
+            if is_list:
+                cells[index] = [CSV_LIST_SEPARATOR.join(value) for value in cells[index]]
+            elif self._timestamps[index]:
+                cells[index] = [value.isoformat() if value is not None else None for value in cells[index]]
+        self._writer.writerows(zip(*cells))
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ParquetWriter:
+    def __init__(self, path: str):
+        self._schema = _arrow_schema(dictionary=True)
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write(self, columns: Dict[str, List]) -> None:
+        # One write per buffered chunk becomes exactly one row group
+        self._writer.write_table(pa.Table.from_pydict(columns, schema=self._schema), row_group_size=len(columns['role']))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+class _ArrowWriter:
+    def __init__(self, path: str):
+        self._schema = _arrow_schema(dictionary=False)
+        self._sink = pa.OSFile(path, 'wb')
+        self._writer = pa.ipc.new_file(self._sink, self._schema)
+
+    def write(self, columns: Dict[str, List]) -> None:
+        self._writer.write_batch(pa.RecordBatch.from_pydict(columns, schema=self._schema))
+
+    def close(self) -> None:
+        self._writer.close()
+        self._sink.close()
+
+
+_WRITERS = {'parquet': _ParquetWriter, 'arrow': _ArrowWriter, 'csv': _CsvWriter}
+
+
+def export_format(path: str, fmt: Optional[str] = None) -> str:
+    """
+    Resolve the output format from an explicit name or the file extension
+
+    Raises:
+        ValueError: If the format is unknown
+        ImportError: If Parquet or Arrow is asked for without pyarrow installed
+    """
+    fmt = (fmt or FORMATS.get(os.path.splitext(path)[1].lower(), '')).lower()
+    if fmt not in _WRITERS:
+        raise ValueError(f"Unknown export format for {path}. Choose from {', '.join(sorted(_WRITERS))}")
+    if fmt != 'csv' and pa is None:
+        raise ImportError("pyarrow is required for Parquet and Arrow export. Install it with: pip install pyarrow")
+    return fmt
+
+
+def write_export(rows: Iterable[Dict], path: str, fmt: Optional[str] = None, row_group_size: int = ROW_GROUP_SIZE) -> int:
+    """
+    Stream rows into a Parquet, Arrow IPC or CSV file
+
+    Args:
+        rows: Dictionaries keyed by EXPORT_COLUMNS, e.g. from store_rows or batch_rows
+        path: Output file, replaced if it exists
+        fmt: 'parquet', 'arrow' or 'csv' (default: from the extension)
+        row_group_size: Rows buffered before each write
+
+    Returns:
+        Number of rows written
+    """
+    writer = _WRITERS[export_format(path, fmt)](path)
+    written = 0
+    columns: Dict[str, List] = {name: [] for name in EXPORT_COLUMNS}
+    try:
+        for row in rows:
+            for name, values in columns.items():
+                values.append(row.get(name))
+            if len(columns['role']) >= row_group_size:
+                writer.write(columns)
+                written += len(columns['role'])
+                columns = {name: [] for name in EXPORT_COLUMNS}
+        if columns['role'] or not written:
+            writer.write(columns)
+            written += len(columns['role'])
+    finally:
+        writer.close()
+    return written
+
+
+_requirements: Optional[Dict[str, List[Tuple[str, str, float]]]] = None
+
+
+def _role_requirements() -> Dict[str, List[Tuple[str, str, float]]]:
+    """Role name -> (skill, lowercased key, learning-plan hours) per required skill"""
+    global _requirements
+    if _requirements is None:
+        requirements = {}
+        for role_id, role_name in enumerate(ROLE_INDEX.role_names):
+            requirements[role_name] = [(skill, skill.lower(), hours) for skill, hours in required_skill_hours(role_id)]
+        _requirements = requirements
+    return _requirements
+
+
+def _gap_hours(role_name: str, missing_skills: List[str]) -> Optional[float]:
+    requirements = _role_requirements().get(role_name)
+    if requirements is None:
+        return None
+    hours = {key: skill_hours for _, key, skill_hours in requirements}
+    return float(sum(hours.get(skill.lower(), 30) for skill in missing_skills))
+
+
+def _timestamp(seconds: Optional[float]) -> Optional[datetime.datetime]:
+    if seconds is None:
+        return None
+    return datetime.datetime.fromtimestamp(seconds, tz=datetime.timezone.utc)
+
+
+def store_rows(store) -> Iterator[Dict]:
+    """
+    One export row per stored (resume, role) pair with a match score above 0
+
+    Args:
+        store: backend.analysis_store.AnalysisStore
+    """
+    requirements = _role_requirements()
+    for analysis in store.iter_analyses():
+        keys = normalize_skills(analysis['skills'])
+        analyzed_at = _timestamp(analysis['analyzed_at'])
+        for role_name, (match_score, combined_score) in analysis['role_scores'].items():
+            known, missing, gap = [], [], 0.0
+            for skill, key, hours in requirements.get(role_name, ()):
+                if key in keys:
+                    known.append(skill)
+                else:
+                    missing.append(skill)
+                    gap += hours
+            yield {
+                'resume_hash': analysis['resume_hash'], 'file_name': analysis['file_name'], 'analyzed_at': analyzed_at,
+                'skill_count': analysis['skill_count'], 'skills': analysis['skills'], 'role': role_name,
+                'match_score': match_score, 'combined_score': combined_score,
+                'known_skills': known, 'missing_skills': missing, 'gap_hours': gap,
+            }
+
+
+def batch_rows(jsonl_path: str) -> Iterator[Dict]:
+    """
+    One export row per role match in a backend.batch JSONL output, read line by line
+
+    Records that failed to parse have no matches and produce no rows.
+    """
+    with open(jsonl_path, 'r', encoding='utf-8') as records:
+        for line in records:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            for match in record.get('matches', ()):
+                yield {
+                    'resume_hash': record.get('resume_hash'), 'file_name': record['path'], 'analyzed_at': None,
+                    'skill_count': record['skill_count'], 'skills': record['skills'], 'role': match['role_name'],
+                    'match_score': match['match_score'], 'combined_score': match['combined_score'],
+                    'known_skills': match['known_skills'], 'missing_skills': match['missing_skills'],
+                    'gap_hours': _gap_hours(match['role_name'], match['missing_skills']),
+                }
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m backend.export', description="Bulk export of analyses")
+    parser.add_argument('output', help="Output file: .parquet, .arrow/.feather or .csv")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('-s', '--store', help="SQLite analysis store (see CAREER_COMPASS_ANALYSIS_DB)")
+    source.add_argument('-b', '--batch', help="JSONL output of python -m backend.batch")
+    parser.add_argument('-f', '--format', choices=sorted(_WRITERS), help="Output format (default: from the extension)")
+    parser.add_argument('-g', '--row-group-size', type=int, default=ROW_GROUP_SIZE, help="Rows per row group or chunk")
+    args = parser.parse_args(argv)
+
+    try:
+        export_format(args.output, args.format)
+    except (ValueError, ImportError) as exc:
+        print(exc, file=sys.stderr)
+        return 2
+
+    if args.batch:
+        written = write_export(batch_rows(args.batch), args.output, args.format, args.row_group_size)
+    else:
+        from backend.analysis_store import AnalysisStore
+
+        store = AnalysisStore(args.store)
+        try:
+            written = write_export(store_rows(store), args.output, args.format, args.row_group_size)
+        finally:
+            store.close()
+    print(f"Wrote {written} rows to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+"""
+Typo-tolerant skill matching backed by a character-trigram candidate index
+"""
+
+import re
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Set, Tuple
+
+from backend.skill_matcher import build_alias_index
+
+
+# Characters that stay inside a token; everything else separates words, so
+# "Power-BI", "Power BI" and "power_bi" all become "power bi"
+_TOKEN_PATTERN = re.compile(r'[^\W_]+(?:[+#]+)?')
+
+TRIGRAM = 3
+
+# Per-resume time budget for the fuzzy pass, in seconds
+DEFAULT_TIME_BUDGET = 0.05
+
+# Windows checked between clock reads
+_CLOCK_EVERY = 64
+
+
+def normalize_skill_text(text: str) -> str:
+    """Lowercase and collapse punctuation and separators to single spaces"""
+    return ' '.join(_TOKEN_PATTERN.findall(text.lower()))
+
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f"${key}$"
+    return {padded[i:i + TRIGRAM] for i in range(len(padded) - TRIGRAM + 1)}
+
+
+def allowed_distance(length: int) -> int:
+    """Edits tolerated in one word of this length; words under five letters must match exactly"""
+    if length < 5:
+        return 0
+    if length < 12:
+        return 1
+    return 2
+
+
+def bounded_distance(a: str, b: str, limit: int) -> int:
+    """
+    Optimal string alignment distance, giving up early past a limit
+
+    Insertions, deletions, substitutions and adjacent transpositions each
+    cost one edit, so "pyhton" is one edit from "python".
+
+    Args:
+        a: First string
+        b: Second string
+        limit: Largest distance of interest
+
+    Returns:
+        The distance, or limit + 1 if it is larger than limit
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2: Optional[List[int]] = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if previous2 is not None and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1] if previous[-1] <= limit else limit + 1
+
+
+class FuzzyMatches(NamedTuple):
+    """Skills found by a fuzzy pass and whether it scanned the whole text"""
+
+    scores: Dict[str, float]
+    complete: bool
+
+
+class FuzzyMatcher:
+    """
+    Find near-miss skill mentions such as "Kubernete", "Jenkns" or "Power-BI".
+
+    Every run of up to max_words tokens in the text is a candidate window.
+    A window is only compared with the patterns that share enough of its
+    character trigrams (the q-gram count filter), and those few are
+    verified word by word with bounded edit distance: each word may only
+    be off by as many edits as its own length allows, and a word that is
+    itself a known non-skill ("docket", "analyst") is never read as a typo.
+    Confidence is one minus the edit distance over the longer length, so
+    exact hits score 1.0 and one edit in a five-letter word scores 0.8.
+    """
+
+    def __init__(
+        self,
+        skills: Iterable[str],
+        aliases: Optional[Mapping[str, Iterable[str]]] = None,
+        non_skills: Iterable[str] = (),
+        min_confidence: float = 0.8,
+    ):
+        """
+        Build the trigram index for a skill dictionary
+
+        Args:
+            skills: Canonical skill names
+            aliases: Optional canonical skill -> alternate surface forms
+            non_skills: Ordinary words and phrases such as job titles; a
+                window equal to one is skipped, and none of their words
+                count as a misspelled skill word
+            min_confidence: Lowest confidence reported
+        """
+        self.min_confidence = min_confidence
+        self.skills: List[str] = []
+        # (normalized pattern, skill ID, allowed edits, trigram count,
+        # (word, allowed edits) per word); aliases share their canonical skill's ID
+        self._patterns: List[Tuple[str, int, int, int, Tuple[Tuple[str, int], ...]]] = []
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        self._non_skills: Set[str] = set()
+        self._non_skill_words: Set[str] = set()
+        for phrase in non_skills:
+            key = normalize_skill_text(phrase)
+            self._non_skills.add(key)
+            self._non_skill_words.update(key.split(' '))
+
+        skill_ids: Dict[str, int] = {}
+        for skill in skills:
+            key = normalize_skill_text(skill)
+            if key and key not in skill_ids:
+                skill_ids[key] = len(self.skills)
+                self.skills.append(skill)
+                self._add_pattern(key, skill_ids[key])
+        for surface, canonical in build_alias_index(aliases or {}).items():
+            key = normalize_skill_text(surface)
+            skill_id = skill_ids.get(normalize_skill_text(canonical))
+            if key and skill_id is not None and key not in skill_ids:
+                skill_ids[key] = skill_id
+                self._add_pattern(key, skill_id)
+
+        self.max_words = max((pattern[0].count(' ') + 1 for pattern in self._patterns), default=0)
+
+    def _add_pattern(self, key: str, skill_id: int) -> None:
+        pattern_id = len(self._patterns)
+        grams = _trigrams(key)
+        words = tuple((word, allowed_distance(len(word))) for word in key.split(' '))
+        self._patterns.append((key, skill_id, sum(limit for _, limit in words), len(grams), words))
+        for gram in grams:
+            self._postings[gram].append(pattern_id)
+
+    def _windows(self, tokens: List[str]) -> Iterable[str]:
+        seen = set()
+        for start in range(len(tokens)):
+            for stop in range(start + 1, min(start + self.max_words, len(tokens)) + 1):
+                window = ' '.join(tokens[start:stop])
+                if window not in seen:
+                    seen.add(window)
+                    yield window
+
+    def _best_match(self, window: str) -> Optional[Tuple[int, float]]:
+        grams = _trigrams(window)
+        gram_count = len(grams)
+        postings = self._postings
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for pattern_id in postings.get(gram, ()):
+                shared[pattern_id] += 1
+
+        best = None
+        patterns = self._patterns
+        window_words = None
+        for pattern_id, count in shared.items():
+            key, skill_id, limit, key_grams, key_words = patterns[pattern_id]
+            # Each edit (a transposition included) destroys at most TRIGRAM + 1
+            # trigrams of the longer string
+            if count < (gram_count if gram_count > key_grams else key_grams) - limit * (TRIGRAM + 1):
+                continue
+            if window_words is None:
+                window_words = window.split(' ')
+            if len(window_words) != len(key_words):
+                continue
+            distance = self._word_distance(window_words, key_words)
+            if distance is None:
+                continue
+            confidence = 1.0 - distance / max(len(window), len(key))
+            if best is None or confidence > best[1]:
+                best = (skill_id, confidence)
+        return best
+
+    def _word_distance(self, window_words: List[str], key_words: Tuple[Tuple[str, int], ...]) -> Optional[int]:
+        """Total edits between aligned words, or None if any word is off by more than it allows"""
+        total = 0
+        for word, (key_word, limit) in zip(window_words, key_words):
+            if word == key_word:
+                continue
+            # Typos rarely hit the first letter; this keeps "locker" from being "docker"
+            if not limit or word[0] != key_word[0] or word in self._non_skill_words:
+                return None
+            distance = bounded_distance(word, key_word, limit)
+            if distance > limit:
+                return None
+            total += distance
+        return total
+
+    def match(self, text: str, time_budget: Optional[float] = DEFAULT_TIME_BUDGET) -> FuzzyMatches:
+        """
+        Score every skill with a fuzzy mention in the text
+
+        Args:
+            text: Raw text in any casing
+            time_budget: Seconds to spend before returning what was found so
+                far; None scans everything
+
+        Returns:
+            FuzzyMatches with the best confidence per canonical skill and
+            whether the whole text was scanned within the budget
+        """
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        tokens = _TOKEN_PATTERN.findall(text.lower())
+        scores: Dict[str, float] = {}
+
+        for checked, window in enumerate(self._windows(tokens)):
+            if deadline is not None and checked % _CLOCK_EVERY == 0 and time.perf_counter() > deadline:
+                return FuzzyMatches(scores, False)
+            if window in self._non_skills:
+                continue
+            best = self._best_match(window)
+            if best is None or best[1] < self.min_confidence:
+                continue
+            skill = self.skills[best[0]]
+            if best[1] > scores.get(skill, 0.0):
+                scores[skill] = best[1]
+        return FuzzyMatches(scores, True)
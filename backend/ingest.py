@@ -0,0 +1,187 @@
+"""
+Zero-copy ingestion of resume payloads from paths, buffers and file objects
+"""
+
+import codecs
+import io
+import mmap
+import os
+from typing import Callable, Iterator, Optional, Union
+
+
+# The PDF header may follow a little junk; readers accept it within the first KB
+PDF_MAGIC = b'%PDF-'
+PDF_HEADER_WINDOW = 1024
+
+# Bytes inspected when deciding whether a payload is plain text
+TEXT_SNIFF_BYTES = 8192
+
+# Bytes decoded per chunk when streaming text
+TEXT_CHUNK_BYTES = 1024 * 1024
+
+# Common uploads we can recognize but not parse, for a clearer error message
+_UNSUPPORTED_MAGIC = (
+    (b'PK\x03\x04', 'DOCX/ZIP'),
+    (b'\xd0\xcf\x11\xe0', 'DOC'),
+    (b'{\\rtf', 'RTF'),
+    (b'\x89PNG', 'PNG'),
+    (b'\xff\xd8\xff', 'JPEG'),
+    (b'GIF8', 'GIF'),
+)
+
+
+def sniff_file_type(buffer, name: Optional[str] = None) -> str:
+    """
+    Detect the format of a payload from its leading bytes
+
+    Args:
+        buffer: Any object supporting the buffer protocol
+        name: Original file name, only used in error messages
+
+    Returns:
+        'pdf' or 'txt'
+
+    Raises:
+        ValueError: If the payload is neither a PDF nor plain text
+    """
+    head = bytes(memoryview(buffer)[:max(PDF_HEADER_WINDOW, TEXT_SNIFF_BYTES)])
+    if PDF_MAGIC in head[:PDF_HEADER_WINDOW]:
+        return 'pdf'
+
+    label = name or 'upload'
+    for magic, kind in _UNSUPPORTED_MAGIC:
+        if head.startswith(magic):
+            raise ValueError(f"Unsupported file type: {kind} ({label}). Please upload PDF or TXT file.")
+    if b'\x00' in head:
+        raise ValueError(f"Unsupported file type: binary data ({label}). Please upload PDF or TXT file.")
+    return 'txt'
+
+
+class ResumeSource:
+    """
+    A resume payload exposed as one read-only buffer.
+
+    Paths and real files are memory-mapped, bytes and memoryviews are
+    wrapped as they are, and in-memory uploads lend their internal buffer,
+    so hashing, sniffing and extraction all read the same memory. Use it
+    as a context manager; the buffer is invalid once closed.
+    """
+
+    def __init__(self, buffer, name: Optional[str] = None, path: Optional[str] = None, on_close: Optional[Callable[[], None]] = None):
+        """
+        Args:
+            buffer: Object supporting the buffer protocol
+            name: Display name, used in error messages
+            path: File the buffer maps, if any
+            on_close: Releases whatever backs the buffer (an mmap or a borrowed view)
+        """
+        self.buffer = memoryview(buffer).cast('B')
+        self.name = name
+        self.path = path
+        self._on_close = on_close
+        try:
+            self.file_type = sniff_file_type(self.buffer, name)
+        except ValueError:
+            self.close()
+            raise
+
+    @property
+    def size(self) -> int:
+        return self.buffer.nbytes
+
+    @property
+    def pdf_source(self) -> Union[str, memoryview]:
+        """What to hand to PDF extraction: the path when there is one, so worker processes map the file themselves"""
+        return self.path if self.path is not None else self.buffer
+
+    def close(self) -> None:
+        self.buffer.release()
+        if self._on_close is not None:
+            self._on_close()
+            self._on_close = None
+
+    def __enter__(self) -> "ResumeSource":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _map_file(file_obj) -> Optional[mmap.mmap]:
+    """Memory-map an open file, or None if it isn't a mappable regular file"""
+    try:
+        fileno = file_obj.fileno()
+        if os.fstat(fileno).st_size == 0:
+            return None
+        return mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def open_resume(source, name: Optional[str] = None) -> ResumeSource:
+    """
+    Wrap a resume payload without copying it
+
+    Args:
+        source: File path, bytes, bytearray, memoryview, or a file-like
+            object such as a Streamlit upload
+        name: Display name; defaults to the path or the object's name
+
+    Returns:
+        ResumeSource to use as a context manager
+    """
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        with open(path, 'rb') as file_obj:
+            mapping = _map_file(file_obj)
+        if mapping is None:
+            return ResumeSource(b'', name or os.path.basename(path), path=path)
+        return ResumeSource(mapping, name or os.path.basename(path), path=path, on_close=mapping.close)
+
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        return ResumeSource(source, name)
+
+    name = name or getattr(source, 'name', None)
+    if isinstance(source, io.BytesIO):
+        # Borrow the upload's buffer; it's released again on close
+        view = source.getbuffer()
+        return ResumeSource(view, name, on_close=view.release)
+    mapping = _map_file(source)
+    if mapping is not None:
+        return ResumeSource(mapping, name, on_close=mapping.close)
+    if hasattr(source, 'getvalue'):
+        return ResumeSource(source.getvalue(), name)
+    return ResumeSource(source.read(), name)
+
+
+def decode_text(buffer) -> str:
+    """Decode UTF-8 straight from a buffer, without an intermediate bytes object"""
+    return str(buffer, 'utf-8')
+
+
+def iter_text_chunks(buffer, chunk_bytes: int = TEXT_CHUNK_BYTES) -> Iterator[str]:
+    """
+    Decode UTF-8 from a buffer incrementally
+
+    Multi-byte characters split across chunk edges are carried over by
+    the decoder, so the chunks concatenate to decode_text(buffer).
+
+    Args:
+        buffer: Object supporting the buffer protocol
+        chunk_bytes: Bytes decoded per chunk
+
+    Returns:
+        Iterator of decoded text chunks
+    """
+    view = memoryview(buffer).cast('B')
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        for offset in range(0, view.nbytes, chunk_bytes):
+            chunk = decoder.decode(view[offset:offset + chunk_bytes])
+            if chunk:
+                yield chunk
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            yield tail
+    finally:
+        view.release()
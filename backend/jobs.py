@@ -0,0 +1,236 @@
+"""
+Background analysis jobs on a shared, bounded worker pool
+"""
+
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from backend.analysis_store import AnalysisStore
+from backend.career_analyzer import analyze_career_fit
+from backend.pdf_sandbox import budget_stats
+from backend.progress import StageEvent
+from backend.resume_parser import parse_resume
+
+
+class QueueFullError(Exception):
+    """Raised when too many analyses are already waiting or running"""
+
+
+class JobCancelled(Exception):
+    """Raised inside a job once it has been cancelled"""
+
+
+class JobTimedOut(Exception):
+    """Raised inside a job once it has run past its deadline"""
+
+
+class AnalysisJob:
+    """
+    One parse + analyze run and its observable progress.
+
+    Status moves from queued to running and ends as done, failed,
+    cancelled or timed_out. Cancellation and timeouts are checked between
+    pipeline stages; a stage already inside PyPDF2 finishes first, but
+    its result is discarded. Until then the job still holds its worker
+    (see holds_worker).
+    """
+
+    def __init__(self, job_id: int, name: str, timeout: float, on_finish=None):
+        self.id = job_id
+        self.name = name
+        self.status = 'queued'
+        self.events: List[StageEvent] = []
+        self.result: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.submitted_at = time.monotonic()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.timeout = timeout
+        self._cancelled = threading.Event()
+        self._future = None
+        self._on_finish = on_finish
+        self._finish_lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('done', 'failed', 'cancelled', 'timed_out')
+
+    @property
+    def holds_worker(self) -> bool:
+        """Queued or still executing, even after being reported as timed out or cancelled"""
+        return self._future is not None and not self._future.done()
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the job was submitted (or until it finished)"""
+        return (self.finished_at or time.monotonic()) - self.submitted_at
+
+    def cancel(self) -> None:
+        """Cancel a queued job immediately, or a running one at its next stage"""
+        self._cancelled.set()
+        if self._future is not None and self._future.cancel():
+            self._finish('cancelled')
+
+    def poll(self) -> str:
+        """Refresh and return the status, enforcing the deadline even if the worker is stuck"""
+        if not self.finished and self.started_at is not None and self._past_deadline():
+            self._cancelled.set()
+            self._finish('timed_out', f"Analysis took longer than {self.timeout:.0f}s")
+        return self.status
+
+    def _past_deadline(self) -> bool:
+        return time.monotonic() - self.started_at > self.timeout
+
+    def _check(self) -> None:
+        if self._past_deadline():
+            raise JobTimedOut(f"Analysis took longer than {self.timeout:.0f}s")
+        if self._cancelled.is_set():
+            raise JobCancelled()
+
+    def _finish(self, status: str, error: Optional[str] = None) -> None:
+        # The worker and a poller may race to finish the same job; first one wins
+        with self._finish_lock:
+            if self.finished:
+                return
+            self.status = status
+            self.error = error
+            self.finished_at = time.monotonic()
+        if self._on_finish is not None:
+            self._on_finish(self)
+
+
+class AnalysisExecutor:
+    """
+    Shared pool that runs analyses off the Streamlit script thread.
+
+    At most max_workers jobs run at once and at most max_queue_depth are
+    queued or running; further submissions raise QueueFullError so callers
+    can show a friendly message instead of letting latency grow unbounded.
+    A job that timed out or was cancelled mid-stage counts as running
+    until its thread actually returns, since it still occupies a worker.
+    Uploads are untrusted, so PDFs are parsed in isolated mode by default.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_queue_depth: int = 32,
+        timeout: float = 60.0,
+        keep_finished: int = 256,
+        store: Optional[AnalysisStore] = None,
+        pdf_mode: str = 'isolated',
+    ):
+        """
+        Args:
+            max_workers: Jobs running concurrently
+            max_queue_depth: Jobs allowed to be queued or running at once
+            timeout: Per-job limit in seconds, counted from when the job starts
+            keep_finished: Finished jobs retained for polling before being forgotten
+            store: Where finished analyses are saved, or None to keep them in the session only
+            pdf_mode: PDF extraction mode passed to parse_resume; 'isolated'
+                runs each PDF in a killable worker under PDF_BUDGET
+        """
+        self.store = store
+        self.pdf_mode = pdf_mode
+        self.max_queue_depth = max_queue_depth
+        self.timeout = timeout
+        self.keep_finished = keep_finished
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='analysis')
+        self._jobs: "OrderedDict[int, AnalysisJob]" = OrderedDict()
+        self._ids = itertools.count(1)
+        # Re-entrant: polling under the lock can finish a job, which records its outcome
+        self._lock = threading.RLock()
+        self._counters = {'submitted': 0, 'rejected': 0, 'done': 0, 'failed': 0, 'cancelled': 0, 'timed_out': 0}
+
+    def submit(self, data: bytes, name: str, top_k: Optional[int] = None) -> AnalysisJob:
+        """
+        Queue an analysis of an uploaded file
+
+        Args:
+            data: Uploaded file bytes
+            name: Original file name, kept on the job for display
+            top_k: Number of role matches to keep; None keeps the full ranking
+
+        Returns:
+            AnalysisJob to poll for progress and results
+
+        Raises:
+            QueueFullError: If the queue is already at max_queue_depth
+        """
+        with self._lock:
+            if self.active_count() >= self.max_queue_depth:
+                self._counters['rejected'] += 1
+                raise QueueFullError("We're analyzing a lot of resumes right now. Please try again in a minute.")
+            job = AnalysisJob(next(self._ids), name, self.timeout, on_finish=self._record_outcome)
+            self._jobs[job.id] = job
+            self._counters['submitted'] += 1
+            self._prune()
+            job._future = self._pool.submit(self._run, job, data, top_k)
+        return job
+
+    def get(self, job_id: int) -> Optional[AnalysisJob]:
+        """Look up a job by ID (None once it has been forgotten)"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def active_count(self) -> int:
+        """Jobs queued or running, including finished ones whose thread hasn't returned yet"""
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job.poll() in ('queued', 'running') or job.holds_worker)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Counters by outcome, the current queue depth, jobs given up on that
+        still hold a worker (abandoned) and this process's PDF budget
+        counters (prefixed pdf_)
+        """
+        with self._lock:
+            counters = dict(
+                self._counters,
+                active=self.active_count(),
+                abandoned=sum(1 for job in self._jobs.values() if job.finished and job.holds_worker),
+            )
+        counters.update((f"pdf_{name}", count) for name, count in budget_stats().items())
+        return counters
+
+    def _record_outcome(self, job: AnalysisJob) -> None:
+        with self._lock:
+            self._counters[job.status] += 1
+
+    def _run(self, job: AnalysisJob, data: bytes, top_k: Optional[int]) -> None:
+        if job.finished:
+            return
+        job.status = 'running'
+        job.started_at = time.monotonic()
+
+        def on_event(event: StageEvent) -> None:
+            job.events.append(event)
+            job._check()
+
+        try:
+            job._check()
+            # The job owns its own bytes, so it never touches the session's file object
+            resume_data = parse_resume(data, pdf_mode=self.pdf_mode, on_event=on_event)
+            matches = analyze_career_fit(resume_data['skills'], top_k=top_k, on_event=on_event)
+            job._check()
+            if self.store is not None:
+                # Only queued here; the store's writer thread commits it in a batch
+                self.store.save_analysis(resume_data, job.name)
+            job.result = {'resume_data': resume_data, 'career_matches': matches}
+            job._finish('done')
+        except JobCancelled:
+            job._finish('cancelled')
+        except JobTimedOut as exc:
+            job._finish('timed_out', str(exc))
+        except Exception as exc:
+            job._finish('failed', str(exc))
+
+    def _prune(self) -> None:
+        # Jobs still holding a worker are kept so active_count keeps seeing them
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished and not job.holds_worker]
+        for job_id in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[job_id]
@@ -0,0 +1,264 @@
+"""
+Content-addressed caches for parsed resumes and extracted PDF pages
+"""
+
+import hashlib
+import json
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from backend.skill_evidence import SkillEvidence
+
+
+def content_hash(data) -> str:
+    """SHA-256 hex digest of raw uploaded bytes or any buffer over them"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def make_cache_key(data, file_type: str, dictionary_version: str, digest: Optional[str] = None) -> str:
+    """
+    Build the cache key for an uploaded file
+
+    Args:
+        data: Raw uploaded bytes, or any buffer (memoryview, mmap) over them
+        file_type: Normalized file extension the bytes are parsed as
+        dictionary_version: Version of the skill dictionary and text cleanup used for matching
+        digest: content_hash(data), if the caller already has it
+
+    Returns:
+        Key string combining the SHA-256 of the bytes and the versions
+    """
+    return f"{digest or content_hash(data)}:{file_type}:{dictionary_version}"
+
+
+def _result_size(result: Dict) -> int:
+    """Approximate memory held by a parse result"""
+    size = sys.getsizeof(result['text']) + sum(sys.getsizeof(skill) for skill in result['skills'])
+    evidence = result['evidence']
+    if evidence is not None:
+        size += sum(sys.getsizeof(column) for column in (evidence.skill_ids, evidence.starts, evidence.ends))
+    return size
+
+
+class ParseCache:
+    """
+    Two-tier cache of parse results keyed by content hash.
+
+    The memory tier is an LRU bounded both by entry count and by approximate
+    size in bytes. The optional disk tier is a SQLite file that survives
+    restarts; hits there are promoted back into memory. All methods are
+    thread-safe since Streamlit serves sessions from several threads.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024, db_path: Optional[str] = None):
+        """
+        Args:
+            max_entries: Maximum number of results kept in memory
+            max_bytes: Maximum approximate size of results kept in memory
+            db_path: SQLite file for the disk tier, or None to keep memory only
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0}
+
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS parse_cache (key TEXT PRIMARY KEY, payload TEXT NOT NULL)"
+            )
+            self._db.commit()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Look up a parse result
+
+        Args:
+            key: Key from make_cache_key
+
+        Returns:
+            A copy of the cached result, or None on a miss
+        """
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self._counters['hits'] += 1
+                return _copy_result(result)
+
+            if self._db is not None:
+                row = self._db.execute("SELECT payload FROM parse_cache WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    payload = json.loads(row[0])
+                    evidence = payload.get('evidence')
+                    result = {
+                        'text': payload['text'],
+                        'skills': frozenset(payload['skills']),
+                        'skill_count': len(payload['skills']),
+                        'evidence': None if evidence is None else SkillEvidence.from_payload(evidence),
+                    }
+                    self._store(key, result)
+                    self._counters['disk_hits'] += 1
+                    return _copy_result(result)
+
+            self._counters['misses'] += 1
+            return None
+
+    def put(self, key: str, result: Dict) -> None:
+        """
+        Store a parse result in both tiers
+
+        Args:
+            key: Key from make_cache_key
+            result: Dictionary returned by parse_resume
+        """
+        stored = {
+            'text': result['text'],
+            'skills': frozenset(result['skills']),
+            'skill_count': result['skill_count'],
+            'evidence': result.get('evidence'),
+        }
+        with self._lock:
+            self._store(key, stored)
+            if self._db is not None:
+                evidence = stored['evidence']
+                payload = json.dumps({
+                    'text': stored['text'],
+                    'skills': sorted(stored['skills']),
+                    'evidence': None if evidence is None else evidence.to_payload(),
+                })
+                self._db.execute("INSERT OR REPLACE INTO parse_cache (key, payload) VALUES (?, ?)", (key, payload))
+                self._db.commit()
+
+    def _store(self, key: str, result: Dict) -> None:
+        size = _result_size(result)
+        if key in self._entries:
+            self._bytes -= self._sizes.pop(key)
+            del self._entries[key]
+        if size > self.max_bytes:
+            # Too large for the memory tier; the disk tier still keeps it
+            return
+
+        self._entries[key] = result
+        self._sizes[key] = size
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            evicted_key, _ = self._entries.popitem(last=False)
+            self._bytes -= self._sizes.pop(evicted_key)
+            self._counters['evictions'] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Report counters for sizing the cache
+
+        Returns:
+            Dictionary with hits, disk_hits, misses, evictions, entries and bytes
+        """
+        with self._lock:
+            return dict(self._counters, entries=len(self._entries), bytes=self._bytes)
+
+    def clear(self) -> None:
+        """Drop every memory entry and reset the counters (the disk tier is kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+            for name in self._counters:
+                self._counters[name] = 0
+
+
+class PageTextCache:
+    """
+    LRU of extracted PDF page text keyed by (backend, page content hash).
+
+    A revised upload usually changes one page of several; its unchanged
+    pages hash the same as in the earlier upload and skip extraction.
+    Bounded by entry count and by characters held. Thread-safe.
+    """
+
+    def __init__(self, max_entries: int = 4096, max_chars: int = 32 * 1024 * 1024):
+        """
+        Args:
+            max_entries: Maximum number of pages kept
+            max_chars: Maximum characters of page text kept
+        """
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self._entries: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get(self, backend: str, page_key: str) -> Optional[str]:
+        """
+        Look up a page
+
+        Args:
+            backend: Name of the backend the text comes from
+            page_key: PdfDocument.page_key of the page
+
+        Returns:
+            The page text, or None on a miss
+        """
+        with self._lock:
+            text = self._entries.get((backend, page_key))
+            if text is None:
+                self._counters['misses'] += 1
+                return None
+            self._entries.move_to_end((backend, page_key))
+            self._counters['hits'] += 1
+            return text
+
+    def put(self, backend: str, page_key: str, text: str) -> None:
+        """Store the complete text of one page"""
+        if len(text) > self.max_chars:
+            return
+        key = (backend, page_key)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._chars -= len(previous)
+            self._entries[key] = text
+            self._chars += len(text)
+            while len(self._entries) > self.max_entries or self._chars > self.max_chars:
+                _, evicted = self._entries.popitem(last=False)
+                self._chars -= len(evicted)
+                self._counters['evictions'] += 1
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Report counters for sizing the cache
+
+        Returns:
+            Dictionary with hits, misses, hit_rate, evictions, entries and chars
+        """
+        with self._lock:
+            lookups = self._counters['hits'] + self._counters['misses']
+            hit_rate = self._counters['hits'] / lookups if lookups else 0.0
+            return dict(self._counters, hit_rate=hit_rate, entries=len(self._entries), chars=self._chars)
+
+    def clear(self) -> None:
+        """Drop every page and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._chars = 0
+            for name in self._counters:
+                self._counters[name] = 0
+
+
+def _copy_result(result: Dict) -> Dict:
+    """Hand out a private copy so callers can't mutate the cached entry (evidence is shared read-only)"""
+    return {
+        'text': result['text'],
+        'skills': set(result['skills']),
+        'skill_count': result['skill_count'],
+        'evidence': result['evidence'],
+        'parse_error': None,
+    }
@@ -0,0 +1,360 @@
+"""
+Interchangeable PDF text extraction backends and the order they are tried in
+"""
+
+import hashlib
+import io
+import mmap
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+try:
+    import PyPDF2
+except ImportError:
+    PyPDF2 = None
+try:
+    import pypdf
+except ImportError:
+    pypdf = None
+try:
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdftypes import resolve1
+except ImportError:
+    PDFPage = None
+
+
+# A PDF as raw bytes, any buffer (memoryview, mmap), or a file path
+PdfSource = Union[bytes, memoryview, str]
+
+# Backend names, or 'auto' to rank the installed backends with a timed probe
+BACKEND_ENV = 'CAREER_COMPASS_PDF_BACKEND'
+
+# Pages in the probe document; enough that per-page cost outweighs setup
+PROBE_PAGES = 8
+PROBE_REPEAT = 3
+# Every probe page must contain this, or the backend is considered broken
+_PROBE_WORD = 'Kubernetes'
+
+
+class PdfDocument:
+    """An open PDF: a page count and per-page text, valid inside open()"""
+
+    def __init__(self, page_count: int, page_text, page_key=None):
+        self.page_count = page_count
+        self._page_text = page_text
+        self._page_key = page_key
+
+    def page_text(self, index: int) -> str:
+        """Text of one page (0-based)"""
+        return self._page_text(index)
+
+    def page_key(self, index: int) -> Optional[str]:
+        """
+        Hash of everything one page's text is extracted from
+
+        Covers the page's content streams and its fonts' encodings, so two
+        revisions of a document share keys for the pages that didn't
+        change. Hashing only inflates streams, which is far cheaper than
+        extracting text.
+
+        Returns:
+            Hex digest, or None if this backend or page can't be keyed
+        """
+        if self._page_key is None:
+            return None
+        try:
+            return self._page_key(index)
+        except Exception:
+            return None
+
+
+def _hash_parts(parts: Iterable[bytes]) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        # Length-prefixed so part boundaries can't collide
+        digest.update(len(part).to_bytes(8, 'little'))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+@contextmanager
+def _open_stream(source: PdfSource) -> Iterator:
+    """Seekable binary stream over a path or buffer, without copying the document"""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as file_obj, mmap.mmap(file_obj.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            # mmap is a seekable C-level stream, so readers use the page cache directly
+            yield mapping
+        return
+    if isinstance(source, memoryview) and isinstance(source.obj, bytes) and source.nbytes == len(source.obj):
+        # BytesIO shares an unmodified bytes object instead of copying it
+        source = source.obj
+    yield io.BytesIO(source)
+
+
+class PdfBackend(ABC):
+    """
+    One PDF library behind a common interface.
+
+    Subclasses set name and implement available() and open(); one missing
+    either can't be instantiated.
+    """
+
+    name = ''
+
+    @abstractmethod
+    def available(self) -> bool:
+        """Whether the library is installed"""
+
+    @abstractmethod
+    def open(self, source: PdfSource):
+        """
+        Open a document without copying it
+
+        Args:
+            source: Raw PDF bytes, a buffer, or a file path (memory-mapped)
+
+        Returns:
+            Context manager yielding a PdfDocument, only valid inside the block
+        """
+
+
+class _ReaderBackend(PdfBackend):
+    """PyPDF2 and its successor pypdf share the PdfReader API"""
+
+    def __init__(self, name: str, module):
+        self.name = name
+        self._module = module
+
+    def available(self) -> bool:
+        return self._module is not None
+
+    @contextmanager
+    def open(self, source: PdfSource) -> Iterator[PdfDocument]:
+        with _open_stream(source) as stream:
+            reader = self._module.PdfReader(stream)
+            pages = reader.pages
+            yield PdfDocument(
+                len(pages),
+                lambda index: pages[index].extract_text() or '',
+                lambda index: _hash_parts(_reader_page_parts(pages[index])),
+            )
+
+
+def _reader_streams(obj) -> Iterator[bytes]:
+    """Decoded data of a stream, or of each stream in an array (PdfReader objects)"""
+    obj = obj.get_object()
+    if isinstance(obj, list):
+        for item in obj:
+            yield from _reader_streams(item)
+    elif hasattr(obj, 'get_data'):
+        yield obj.get_data()
+
+
+def _reader_page_parts(page) -> Iterator[bytes]:
+    """What a PdfReader page's text depends on: content streams, fonts and form XObjects"""
+    if '/Contents' in page:
+        yield from _reader_streams(page['/Contents'])
+    resources = page.get('/Resources')
+    if resources is None:
+        return
+    resources = resources.get_object()
+    fonts = resources.get('/Font')
+    for name, font in sorted((fonts.get_object() if fonts is not None else {}).items()):
+        font = font.get_object()
+        yield f"{name} {font.get('/BaseFont')} {font.get('/Subtype')} {font.get('/Encoding')}".encode('utf-8')
+        if '/ToUnicode' in font:
+            yield from _reader_streams(font['/ToUnicode'])
+    xobjects = resources.get('/XObject')
+    for name, xobject in sorted((xobjects.get_object() if xobjects is not None else {}).items()):
+        xobject = xobject.get_object()
+        if xobject.get('/Subtype') == '/Form':
+            yield name.encode('utf-8')
+            yield from _reader_streams(xobject)
+
+
+class _PdfminerBackend(PdfBackend):
+    """pdfminer.six: slower to start, but often better on complex layouts"""
+
+    name = 'pdfminer'
+
+    def available(self) -> bool:
+        return PDFPage is not None
+
+    @contextmanager
+    def open(self, source: PdfSource) -> Iterator[PdfDocument]:
+        with _open_stream(source) as stream:
+            # Page objects are parsed lazily; content streams are only read in process_page
+            pages = list(PDFPage.get_pages(stream))
+            manager = PDFResourceManager()
+            output = io.StringIO()
+            device = TextConverter(manager, output, laparams=LAParams())
+            interpreter = PDFPageInterpreter(manager, device)
+
+            def page_text(index: int) -> str:
+                output.seek(0)
+                output.truncate()
+                interpreter.process_page(pages[index])
+                # TextConverter ends every page with a form feed
+                return output.getvalue().rstrip('\f')
+
+            def page_key(index: int) -> str:
+                page = pages[index]
+                parts = [resolve1(content).get_data() for content in page.contents]
+                fonts = resolve1(resolve1(page.resources or {}).get('Font', {}))
+                for name, font in sorted(fonts.items()):
+                    font = resolve1(font)
+                    parts.append(f"{name} {font.get('BaseFont')} {font.get('Encoding')}".encode('utf-8'))
+                    if 'ToUnicode' in font:
+                        parts.append(resolve1(font['ToUnicode']).get_data())
+                return _hash_parts(parts)
+
+            try:
+                yield PdfDocument(len(pages), page_text, page_key)
+            finally:
+                device.close()
+
+
+# Every backend this module knows, PyPDF2 first as the baseline
+BACKENDS: Dict[str, PdfBackend] = {
+    backend.name: backend
+    for backend in (_ReaderBackend('pypdf2', PyPDF2), _ReaderBackend('pypdf', pypdf), _PdfminerBackend())
+}
+
+
+def available_backends() -> List[str]:
+    """Names of the installed backends, in registry order"""
+    return [name for name, backend in BACKENDS.items() if backend.available()]
+
+
+def require_pdf_backend() -> None:
+    """
+    Raises:
+        ImportError: If no PDF library is installed
+    """
+    if not available_backends():
+        raise ImportError("PyPDF2 is required for PDF parsing. Install it with: pip install PyPDF2")
+
+
+def _escape_pdf_text(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def build_text_pdf(pages: Sequence[Sequence[str]]) -> bytes:
+    """
+    Write a minimal PDF with one Helvetica text line per entry
+
+    Used for the backend probe and benchmarks, so they run without sample files.
+
+    Args:
+        pages: Lines of Latin-1 text for each page
+
+    Returns:
+        PDF bytes
+    """
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for lines in pages:
+        stream = "BT /F1 11 Tf 13 TL 56 760 Td " + " ".join(f"({_escape_pdf_text(line)}) Tj T*" for line in lines) + " ET"
+        objects.append(f"<< /Length {len(stream.encode('latin-1'))} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {len(objects)} 0 R "
+            "/Resources << /Font << /F1 3 0 R >> >> >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n{body}\nendobj\n".encode('latin-1'))
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode('latin-1'))
+    out.write(''.join(f"{offset:010d} 00000 n \n" for offset in offsets).encode('latin-1'))
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode('latin-1'))
+    return out.getvalue()
+
+
+def _probe_seconds(backend: PdfBackend, document: bytes) -> Optional[float]:
+    """Best time to extract the probe document, or None if the backend fails it"""
+    best = None
+    for _ in range(PROBE_REPEAT):
+        began = time.perf_counter()
+        try:
+            with backend.open(document) as pdf:
+                texts = [pdf.page_text(index) for index in range(pdf.page_count)]
+        except Exception:
+            return None
+        seconds = time.perf_counter() - began
+        if len(texts) != PROBE_PAGES or not all(_PROBE_WORD in text for text in texts):
+            return None
+        best = seconds if best is None else min(best, seconds)
+    return best
+
+
+def probe_backends(names: Optional[Sequence[str]] = None) -> Dict[str, Optional[float]]:
+    """
+    Time each backend on a generated document
+
+    Args:
+        names: Backends to probe (default: every installed one)
+
+    Returns:
+        Dictionary of backend name -> best seconds, or None if it failed
+    """
+    lines = [f"{_PROBE_WORD}, Python and SQL on page {page}; led a team of {page + 3} engineers." for page in range(40)]
+    document = build_text_pdf([lines] * PROBE_PAGES)
+    return {name: _probe_seconds(BACKENDS[name], document) for name in (names or available_backends())}
+
+
+def resolve_backend_order(setting: Optional[str] = None) -> List[str]:
+    """
+    Decide the order backends are tried in for each document
+
+    Args:
+        setting: 'auto' to rank installed backends by probe time, or a
+            comma-separated list of names to try first (default: the
+            CAREER_COMPASS_PDF_BACKEND environment variable, else 'auto')
+
+    Returns:
+        Installed backend names, preferred first; the rest follow as fallbacks
+
+    Raises:
+        ValueError: If the setting names an unknown backend
+    """
+    setting = (setting or os.environ.get(BACKEND_ENV) or 'auto').strip().lower()
+    installed = available_backends()
+    if setting == 'auto':
+        if len(installed) < 2:
+            return installed
+        timings = probe_backends(installed)
+        working = sorted((name for name in installed if timings[name] is not None), key=timings.get)
+        # Backends that failed the probe stay as last-resort fallbacks
+        return working + [name for name in installed if timings[name] is None]
+
+    preferred = [name.strip() for name in setting.split(',') if name.strip()]
+    unknown = [name for name in preferred if name not in BACKENDS]
+    if unknown:
+        raise ValueError(f"Unknown PDF backend(s) in {BACKEND_ENV}: {', '.join(unknown)}. Choose from {', '.join(BACKENDS)}")
+    preferred = [name for name in preferred if name in installed]
+    return preferred + [name for name in installed if name not in preferred]
+
+
+_selected: Optional[List[str]] = None
+_selected_lock = threading.Lock()
+
+
+def selected_backends() -> List[str]:
+    """Backend order for this process, resolved (and probed) once on first use"""
+    global _selected
+    with _selected_lock:
+        if _selected is None:
+            _selected = resolve_backend_order()
+        return list(_selected)
@@ -0,0 +1,216 @@
+"""
+Page-level PDF text extraction with optional process-pool fan-out
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Sequence, Tuple, Union
+
+from backend.parse_cache import PageTextCache
+from backend.pdf_backends import BACKENDS, PdfSource, require_pdf_backend, selected_backends
+
+
+# Documents with at least this many pages are split across the process pool
+PARALLEL_PAGE_THRESHOLD = 16
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+class PdfExtraction:
+    """Text of every page in document order, plus how it was produced"""
+
+    def __init__(
+        self,
+        pages: List[str],
+        page_timings: List[float],
+        mode: str,
+        error: Optional[str] = None,
+        backend: Optional[str] = None,
+        cached_pages: int = 0,
+    ):
+        self.pages = pages
+        self.page_timings = page_timings
+        self.mode = mode
+        # Set when extraction stopped early and pages holds a partial result
+        self.error = error
+        # Name of the backend that produced the pages
+        self.backend = backend
+        # Pages served from a PageTextCache instead of being extracted
+        self.cached_pages = cached_pages
+
+    @property
+    def text(self) -> str:
+        """Pages joined the way extract_text_from_pdf has always returned them"""
+        return ''.join(page + '\n' for page in self.pages)
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pages)
+
+
+def picklable_source(source: PdfSource) -> Union[bytes, str]:
+    """Form of a source that can be sent to another process, copying only if unavoidable"""
+    if isinstance(source, (str, bytes)):
+        return source
+    if isinstance(source, os.PathLike):
+        return os.fspath(source)
+    if isinstance(source, memoryview) and isinstance(source.obj, bytes) and source.nbytes == len(source.obj):
+        return source.obj
+    return bytes(source)
+
+
+def source_size(source: PdfSource) -> int:
+    """Size in bytes of a path or buffer"""
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.getsize(source)
+    return memoryview(source).nbytes
+
+
+def _extract_pages(source: Union[bytes, str], backend: str, indexes: List[int]) -> List[Tuple[str, float]]:
+    """Worker entry point: reopen the document and extract the given pages"""
+    results = []
+    with BACKENDS[backend].open(source) as pdf:
+        for index in indexes:
+            began = time.perf_counter()
+            text = pdf.page_text(index)
+            results.append((text, time.perf_counter() - began))
+    return results
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Shared pool, created on first use. Spawned workers avoid forking a threaded server."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    """Shut down a broken pool so the next _get_pool() starts a fresh one"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def extract_pdf_pages(
+    data: PdfSource,
+    mode: str = 'auto',
+    max_workers: Optional[int] = None,
+    backends: Optional[Sequence[str]] = None,
+    page_cache: Optional[PageTextCache] = None,
+) -> PdfExtraction:
+    """
+    Extract the text of each page of a PDF
+
+    Backends are tried in order. The next one takes over when a backend
+    raises, or when it finds no text at all in a document that another
+    library might read.
+
+    Args:
+        data: Raw PDF bytes, a buffer, or a file path
+        mode: 'serial', 'parallel', or 'auto' to choose from the number of
+            pages left to extract
+        max_workers: Cap on the number of page batches submitted in parallel mode
+        backends: Backend names to try (default: selected_backends())
+        page_cache: Optional cache of page text by content hash; only pages
+            missing from it are extracted
+
+    Returns:
+        PdfExtraction with per-page text, per-page extraction seconds (0
+        for cached pages) and the backend used
+    """
+    require_pdf_backend()
+    if mode not in ('auto', 'serial', 'parallel'):
+        raise ValueError(f"Unknown extraction mode: {mode}")
+
+    order = list(backends or selected_backends())
+    first_empty = None
+    errors = []
+    for name in order:
+        try:
+            extraction = _extract_with(name, data, mode, max_workers, page_cache)
+        except Exception as exc:
+            errors.append((name, exc))
+            continue
+        if any(extraction.pages):
+            return extraction
+        first_empty = first_empty or extraction
+
+    if first_empty is not None:
+        # No backend found text (e.g. a scanned document); report it as read
+        return first_empty
+    if len(errors) == 1:
+        raise errors[0][1]
+    raise Exception("; ".join(f"{name}: {exc}" for name, exc in errors))
+
+
+def _extract_with(
+    backend: str, data: PdfSource, mode: str, max_workers: Optional[int], page_cache: Optional[PageTextCache],
+) -> PdfExtraction:
+    """extract_pdf_pages with one backend"""
+    with BACKENDS[backend].open(data) as pdf:
+        page_count = pdf.page_count
+        pages: List[Optional[str]] = [None] * page_count
+        timings = [0.0] * page_count
+        keys: List[Optional[str]] = [None] * page_count
+        if page_cache is not None:
+            for index in range(page_count):
+                keys[index] = pdf.page_key(index)
+                if keys[index] is not None:
+                    pages[index] = page_cache.get(backend, keys[index])
+        missing = [index for index in range(page_count) if pages[index] is None]
+
+        if mode == 'auto':
+            parallel = len(missing) >= PARALLEL_PAGE_THRESHOLD and (os.cpu_count() or 1) > 1
+            mode = 'parallel' if parallel else 'serial'
+        if len(missing) < 2:
+            mode = 'serial'
+
+        if mode == 'serial':
+            for index in missing:
+                began = time.perf_counter()
+                pages[index] = pdf.page_text(index)
+                timings[index] = time.perf_counter() - began
+
+    if mode == 'parallel':
+        # One batch per worker so the bytes are shipped once per worker;
+        # paths are shipped instead of bytes and each worker maps the file itself
+        workers = min(max_workers or os.cpu_count() or 1, len(missing))
+        step = -(-len(missing) // workers)
+        batches = [missing[start:start + step] for start in range(0, len(missing), step)]
+
+        shipped = picklable_source(data)
+        pool = _get_pool()
+        try:
+            futures = [pool.submit(_extract_pages, shipped, backend, batch) for batch in batches]
+            for batch, future in zip(batches, futures):
+                for index, (text, seconds) in zip(batch, future.result()):
+                    pages[index] = text
+                    timings[index] = seconds
+        except BrokenProcessPool:
+            # A worker died; replace the pool for later documents and finish this one here
+            _discard_pool(pool)
+            mode = 'serial'
+            with BACKENDS[backend].open(data) as pdf:
+                for index in missing:
+                    if pages[index] is None:
+                        began = time.perf_counter()
+                        pages[index] = pdf.page_text(index)
+                        timings[index] = time.perf_counter() - began
+
+    if page_cache is not None:
+        for index in missing:
+            if keys[index] is not None:
+                page_cache.put(backend, keys[index], pages[index])
+    return PdfExtraction(pages, timings, mode, backend=backend, cached_pages=page_count - len(missing))
@@ -0,0 +1,315 @@
+"""
+Budgeted PDF extraction in an isolated, killable worker process
+"""
+
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+try:
+    import resource
+except ImportError:  # Not available on Windows; CPU and memory caps are skipped there
+    resource = None
+
+from backend.pdf_backends import BACKENDS, PdfSource, require_pdf_backend, selected_backends
+from backend.parse_cache import PageTextCache
+from backend.pdf_extractor import PdfExtraction, picklable_source, source_size
+
+
+class ParseRejected(Exception):
+    """Raised when a document is refused before any parsing starts"""
+
+
+class ParseBudget:
+    """
+    Limits applied to one PDF parse.
+
+    Admission limits (file size) reject the document outright. Every other
+    limit stops extraction and keeps whatever pages were read so far.
+    """
+
+    def __init__(
+        self,
+        max_file_bytes: int = 10 * 1024 * 1024,
+        max_pages: int = 50,
+        max_text_chars: int = 500_000,
+        wall_seconds: float = 20.0,
+        cpu_seconds: int = 15,
+        memory_bytes: int = 1024 * 1024 * 1024,
+    ):
+        """
+        Args:
+            max_file_bytes: Largest upload accepted
+            max_pages: Pages read before stopping
+            max_text_chars: Extracted characters kept before stopping
+            wall_seconds: Wall-clock limit; the worker is killed when it expires
+            cpu_seconds: CPU-time limit enforced by the OS in the worker
+            memory_bytes: Address-space limit enforced by the OS in the worker
+        """
+        self.max_file_bytes = max_file_bytes
+        self.max_pages = max_pages
+        self.max_text_chars = max_text_chars
+        self.wall_seconds = wall_seconds
+        self.cpu_seconds = cpu_seconds
+        self.memory_bytes = memory_bytes
+
+    @classmethod
+    def from_env(cls) -> "ParseBudget":
+        """Defaults overridden by CAREER_COMPASS_PDF_* environment variables"""
+        env = os.environ
+        defaults = cls()
+        return cls(
+            max_file_bytes=int(env.get('CAREER_COMPASS_PDF_MAX_BYTES', defaults.max_file_bytes)),
+            max_pages=int(env.get('CAREER_COMPASS_PDF_MAX_PAGES', defaults.max_pages)),
+            max_text_chars=int(env.get('CAREER_COMPASS_PDF_MAX_CHARS', defaults.max_text_chars)),
+            wall_seconds=float(env.get('CAREER_COMPASS_PDF_WALL_SECONDS', defaults.wall_seconds)),
+            cpu_seconds=int(env.get('CAREER_COMPASS_PDF_CPU_SECONDS', defaults.cpu_seconds)),
+            memory_bytes=int(env.get('CAREER_COMPASS_PDF_MEMORY_BYTES', defaults.memory_bytes)),
+        )
+
+
+_stats = {
+    'parses': 0, 'rejected': 0, 'timeouts': 0, 'cpu_exceeded': 0, 'memory_exceeded': 0,
+    'page_capped': 0, 'text_capped': 0, 'failed': 0, 'fallbacks': 0,
+}
+_stats_lock = threading.Lock()
+
+
+def _count(name: str) -> None:
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def budget_stats() -> Dict[str, int]:
+    """
+    Counters for tuning the limits against real traffic
+
+    Returns:
+        Dictionary of parse, rejection, timeout, cap and backend fallback counts
+    """
+    with _stats_lock:
+        return dict(_stats)
+
+
+def admit(data: PdfSource, budget: ParseBudget) -> None:
+    """
+    Admission control shared by every extraction mode
+
+    Raises:
+        ParseRejected: If the document is larger than the budget allows
+    """
+    _count('parses')
+    size = source_size(data)
+    if size > budget.max_file_bytes:
+        _count('rejected')
+        raise ParseRejected(
+            f"File is {size / 1024 / 1024:.1f} MB; the limit is {budget.max_file_bytes / 1024 / 1024:.1f} MB"
+        )
+
+
+def _mp_context():
+    # forkserver forks from a clean single-threaded process, so it is safe
+    # from Streamlit's threaded server and much cheaper than spawn
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
+def _sandboxed_extract(
+    conn, source, backends: List[str], use_cache: bool,
+    max_pages: int, max_text_chars: int, cpu_seconds: int, memory_bytes: int,
+) -> None:
+    """
+    Worker entry point: stream ('page', text, seconds) messages back until done or capped
+
+    Each backend attempt starts with a ('pages', count, backend) message,
+    which tells the parent to drop pages from the attempt before it. With
+    use_cache, the worker then sends ('keys', page_keys) and the parent
+    answers with {index: text length} for pages it has cached; those are
+    sent as ('cached', cut) instead of being extracted, where cut is None
+    or the length the text was capped at.
+    """
+    try:
+        if resource is not None:
+            resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+            resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+
+        for attempt, backend in enumerate(backends):
+            last = attempt == len(backends) - 1
+            try:
+                with BACKENDS[backend].open(source) as pdf:
+                    page_count = pdf.page_count
+                    conn.send(('pages', page_count, backend))
+                    read = min(page_count, max_pages)
+                    cached: Dict[int, int] = {}
+                    if use_cache:
+                        # Hashing runs here, under the limits, like any other parsing
+                        conn.send(('keys', [pdf.page_key(index) for index in range(read)]))
+                        cached = conn.recv()
+
+                    chars = 0
+                    for index in range(read):
+                        if index in cached:
+                            if chars + cached[index] > max_text_chars:
+                                conn.send(('cached', max_text_chars - chars))
+                                conn.send(('text_capped', None))
+                                return
+                            chars += cached[index]
+                            conn.send(('cached', None))
+                            continue
+                        began = time.perf_counter()
+                        text = pdf.page_text(index)
+                        if chars + len(text) > max_text_chars:
+                            conn.send(('page', text[:max_text_chars - chars], time.perf_counter() - began))
+                            conn.send(('text_capped', None))
+                            return
+                        chars += len(text)
+                        conn.send(('page', text, time.perf_counter() - began))
+            except MemoryError:
+                raise
+            except Exception:
+                if last:
+                    raise
+                continue
+            if chars or last:
+                break
+            # No text at all; another library may read it
+        conn.send(('done', None))
+    except MemoryError:
+        conn.send(('memory', None))
+    except Exception as exc:
+        conn.send(('error', str(exc)))
+    finally:
+        conn.close()
+
+
+def extract_pdf_pages_budgeted(
+    data: PdfSource,
+    budget: ParseBudget,
+    backends: Optional[Sequence[str]] = None,
+    page_cache: Optional[PageTextCache] = None,
+) -> PdfExtraction:
+    """
+    Extract PDF pages in an isolated worker under the given budget
+
+    Backends fall back in order as in extract_pdf_pages, inside the same
+    worker and under the same budget.
+
+    Args:
+        data: Raw PDF bytes, a buffer, or a file path (mapped by the worker)
+        budget: Limits to enforce
+        backends: Backend names to try (default: selected_backends())
+        page_cache: Optional cache of page text by content hash; the worker
+            hashes pages and only extracts those missing from it
+
+    Returns:
+        PdfExtraction; when a limit is hit, error explains why and pages
+        holds everything read before that
+
+    Raises:
+        ParseRejected: If the document fails admission control
+    """
+    require_pdf_backend()
+    admit(data, budget)
+
+    parent_conn, child_conn = multiprocessing.Pipe()
+    worker = _mp_context().Process(
+        target=_sandboxed_extract,
+        args=(
+            child_conn, picklable_source(data), list(backends or selected_backends()), page_cache is not None,
+            budget.max_pages, budget.max_text_chars, budget.cpu_seconds, budget.memory_bytes,
+        ),
+        daemon=True,
+    )
+    worker.start()
+    child_conn.close()
+
+    pages, timings = [], []
+    page_count = None
+    backend = None
+    # Keys sent by the worker, and cached text by page index, for the current attempt
+    page_keys: List[Optional[str]] = []
+    hits: Dict[int, str] = {}
+    served = 0
+    capped = False
+    error = None
+    deadline = time.monotonic() + budget.wall_seconds
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not parent_conn.poll(remaining):
+                _count('timeouts')
+                error = f"Stopped after {budget.wall_seconds:g}s; only part of the document was read"
+                break
+            try:
+                kind, *payload = parent_conn.recv()
+            except EOFError:
+                # The worker died without reporting: the OS enforced a limit
+                worker.join(1)
+                cpu_signals = {getattr(signal, 'SIGXCPU', None), getattr(signal, 'SIGKILL', None)}
+                if worker.exitcode is not None and -worker.exitcode in cpu_signals:
+                    _count('cpu_exceeded')
+                    error = "The document needed more processing time than allowed"
+                else:
+                    _count('failed')
+                    error = f"PDF worker exited unexpectedly (code {worker.exitcode})"
+                break
+
+            if kind == 'pages':
+                if backend is not None:
+                    _count('fallbacks')
+                page_count, backend = payload
+                pages, timings = [], []
+                page_keys, hits, served = [], {}, 0
+            elif kind == 'keys':
+                page_keys = payload[0]
+                for index, key in enumerate(page_keys):
+                    text = page_cache.get(backend, key) if key is not None else None
+                    if text is not None:
+                        hits[index] = text
+                parent_conn.send({index: len(text) for index, text in hits.items()})
+            elif kind == 'cached':
+                text = hits[len(pages)]
+                pages.append(text if payload[0] is None else text[:payload[0]])
+                timings.append(0.0)
+                served += 1
+            elif kind == 'page':
+                pages.append(payload[0])
+                timings.append(payload[1])
+            elif kind == 'done':
+                if page_count is not None and page_count > budget.max_pages:
+                    _count('page_capped')
+                    error = f"Only the first {budget.max_pages} of {page_count} pages were read"
+                break
+            elif kind == 'text_capped':
+                capped = True
+                _count('text_capped')
+                error = f"Text was cut off after {budget.max_text_chars:,} characters"
+                break
+            elif kind == 'memory':
+                _count('memory_exceeded')
+                error = "The document needed more memory than allowed"
+                break
+            else:
+                if not pages:
+                    # Nothing salvageable: surface it like any unreadable PDF
+                    _count('failed')
+                    raise Exception(payload[0])
+                _count('failed')
+                error = f"Extraction stopped early: {payload[0]}"
+                break
+    finally:
+        parent_conn.close()
+        if worker.is_alive():
+            worker.kill()
+        worker.join()
+
+    if page_cache is not None:
+        # A capped last page holds partial text, so it isn't cached
+        complete = len(pages) - 1 if capped else len(pages)
+        for index in range(min(complete, len(page_keys))):
+            if index not in hits and page_keys[index] is not None:
+                page_cache.put(backend, page_keys[index], pages[index])
+    return PdfExtraction(pages, timings, 'isolated', error, backend, cached_pages=served)
@@ -0,0 +1,56 @@
+"""
+Stage events emitted while a resume is parsed and analyzed
+"""
+
+import logging
+import time
+from typing import Callable, Dict, NamedTuple, Optional
+
+
+class StageEvent(NamedTuple):
+    """One finished pipeline stage"""
+    stage: str          # bytes_read, cache_hit, pages_extracted, text_decoded, skills_matched, roles_scored
+    duration: float     # Seconds spent in the stage
+    detail: Dict        # Stage-specific counts, e.g. {'pages': 3}
+
+
+EventCallback = Callable[[StageEvent], None]
+
+
+class StageTimer:
+    """
+    Measures consecutive stages and forwards each as a StageEvent.
+
+    Every call to emit() closes the stage that started at the previous
+    emit() (or at construction). With no callback it does nothing.
+    """
+
+    def __init__(self, on_event: Optional[EventCallback]):
+        self.on_event = on_event
+        self._mark = time.perf_counter()
+
+    def emit(self, stage: str, **detail) -> None:
+        now = time.perf_counter()
+        if self.on_event is not None:
+            self.on_event(StageEvent(stage, now - self._mark, detail))
+        self._mark = now
+
+
+def log_events(logger: Optional[logging.Logger] = None, level: int = logging.INFO) -> EventCallback:
+    """
+    Build a callback that writes stage events to a logger
+
+    Args:
+        logger: Destination logger (defaults to this module's logger)
+        level: Logging level for the records
+
+    Returns:
+        Callback suitable for parse_resume and analyze_career_fit
+    """
+    logger = logger or logging.getLogger(__name__)
+
+    def on_event(event: StageEvent) -> None:
+        details = ' '.join(f"{key}={value}" for key, value in event.detail.items())
+        logger.log(level, "%s %.1fms %s", event.stage, event.duration * 1000, details)
+
+    return on_event
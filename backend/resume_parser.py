@@ -2,35 +2,104 @@
 Resume parsing utilities to extract text and skills from PDF/text files
 """
 
-import re
-from typing import List, Set
-try:
-    from PyPDF2 import PdfReader
-except ImportError:
-    PdfReader = None
+import itertools
+import os
+from typing import Dict, Iterable, List, Optional, Set
 
-from backend.data.job_roles_data import COMMON_SKILLS
+from backend.data.job_roles_data import COMMON_SKILLS, JOB_ROLES_DB
+from backend.data.skill_aliases import NON_SKILL_WORDS, SKILL_ALIASES
+from backend.fuzzy_matcher import DEFAULT_TIME_BUDGET, FuzzyMatcher
+from backend.ingest import decode_text, iter_text_chunks, open_resume
+from backend.pdf_backends import PdfSource, require_pdf_backend, selected_backends
+from backend.pdf_extractor import extract_pdf_pages
+from backend.pdf_sandbox import ParseBudget, ParseRejected, admit, extract_pdf_pages_budgeted
+from backend.parse_cache import PageTextCache, ParseCache, content_hash, make_cache_key
+from backend.progress import EventCallback, StageTimer
+from backend.skill_evidence import SkillEvidence
+from backend.skill_matcher import SkillMatcher
+from backend.text_normalizer import TextNormalizer
 
 
-def extract_text_from_pdf(pdf_file) -> str:
+# Compiled once at import; every extraction is a single pass over the text,
+# with aliases ("k8s", "Postgres") reported as their canonical skill
+SKILL_MATCHER = SkillMatcher(COMMON_SKILLS, SKILL_ALIASES)
+
+# Ligatures, hyphenated line breaks and Unicode spaces in PDF text are undone
+# before matching; hyphens inside dictionary terms ("Scikit-learn") are kept
+TEXT_NORMALIZER = TextNormalizer(
+    list(COMMON_SKILLS) + [surface for surfaces in SKILL_ALIASES.values() for surface in surfaces]
+)
+
+# Order PDF libraries are tried in: CAREER_COMPASS_PDF_BACKEND, or the fastest
+# installed one by a startup probe, with the others as per-document fallbacks
+PDF_BACKENDS = selected_backends()
+
+# Keys cached parse results; changes with the dictionary, the normalization
+# rules or the PDF backends, since each library extracts slightly different text
+PARSER_VERSION = f"{SKILL_MATCHER.version}.{TEXT_NORMALIZER.version}.{'+'.join(PDF_BACKENDS)}"
+
+# Trigram index for the optional typo-tolerant pass; job titles such as
+# "Data Analyst" are near skill names but never a skill themselves
+FUZZY_MATCHER = FuzzyMatcher(COMMON_SKILLS, SKILL_ALIASES, list(JOB_ROLES_DB) + NON_SKILL_WORDS)
+
+# Repeat uploads of the same bytes skip extraction entirely. Set
+# CAREER_COMPASS_PARSE_CACHE to a file path to also keep results on disk.
+PARSE_CACHE = ParseCache(db_path=os.environ.get('CAREER_COMPASS_PARSE_CACHE'))
+
+# Text of PDF pages by content hash, so a revised upload only extracts the
+# pages that changed; see PAGE_CACHE.stats() for the page-level hit rate
+PAGE_CACHE = PageTextCache()
+
+# Limits for PDF extraction (see backend.pdf_sandbox for the variables); the
+# file size limit applies in every mode, the others only in 'isolated' mode
+PDF_BUDGET = ParseBudget.from_env()
+
+# Default PDF extraction mode for trusted callers such as scripts and the
+# CLI. 'auto' extracts in-process, spreading long documents over a process
+# pool; set CAREER_COMPASS_PDF_MODE=isolated to run every parse in a fresh
+# killable worker under PDF_BUDGET instead. Uploads go through
+# AnalysisExecutor, which uses 'isolated' regardless.
+PDF_MODE = os.environ.get('CAREER_COMPASS_PDF_MODE', 'auto')
+
+
+def extract_text_from_pdf(pdf_file, mode: Optional[str] = None, normalize: bool = True) -> str:
     """
     Extract text content from a PDF file
     
     Args:
-        pdf_file: Uploaded PDF file object from Streamlit
+        pdf_file: Uploaded PDF file object from Streamlit, a path, or a buffer
+        mode: 'serial', 'parallel', 'auto' to pick from the page count, or
+            'isolated' to run under PDF_BUDGET in a killable worker
+            (default: PDF_MODE)
+        normalize: Clean the text with TEXT_NORMALIZER, as parse_resume does
         
     Returns:
         Extracted text as string
     """
-    if PdfReader is None:
-        raise ImportError("PyPDF2 is required for PDF parsing. Install it with: pip install PyPDF2")
-    
+    require_pdf_backend()
+
+    with open_resume(pdf_file) as source:
+        extraction = _extract_pdf(source.pdf_source, mode)
+    if normalize:
+        return _join_pages(map(TEXT_NORMALIZER.normalize, extraction.pages))
+    return extraction.text
+
+
+def _join_pages(pages: Iterable[str]) -> str:
+    """Same layout as PdfExtraction.text"""
+    return ''.join(page + '\n' for page in pages)
+
+
+def _extract_pdf(data: PdfSource, mode: Optional[str]):
+    """Page-level extraction with the error message the UI has always shown"""
+    mode = mode or PDF_MODE
     try:
-        pdf_reader = PdfReader(pdf_file)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text
+        if mode == 'isolated':
+            return extract_pdf_pages_budgeted(data, PDF_BUDGET, PDF_BACKENDS, PAGE_CACHE)
+        admit(data, PDF_BUDGET)
+        return extract_pdf_pages(data, mode=mode, backends=PDF_BACKENDS, page_cache=PAGE_CACHE)
+    except ParseRejected:
+        raise
     except Exception as e:
         raise Exception(f"Error reading PDF: {str(e)}")
 
@@ -40,68 +109,177 @@ def extract_text_from_txt(txt_file) -> str:
     Extract text content from a text file
     
     Args:
-        txt_file: Uploaded text file object from Streamlit
+        txt_file: Uploaded text file object from Streamlit, a path, or a buffer
         
     Returns:
         Extracted text as string
     """
     try:
-        text = txt_file.read().decode('utf-8')
-        return text
+        with open_resume(txt_file) as source:
+            return decode_text(source.buffer)
     except Exception as e:
         raise Exception(f"Error reading text file: {str(e)}")
 
 
-def extract_skills_from_text(text: str) -> Set[str]:
+def extract_skills_from_text(text: str, fuzzy: bool = False) -> Set[str]:
     """
     Extract skills from resume text using keyword matching
     
     Args:
         text: Resume text content
+        fuzzy: Also accept near-misses such as "Kuberntes" or "Power-BI"
+            (see extract_skill_confidences)
         
     Returns:
         Set of identified skills
     """
-    text_lower = text.lower()
-    found_skills = set()
-    
-    for skill in COMMON_SKILLS:
-        # Create pattern to match skill as whole word (case-insensitive)
-        pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-        if re.search(pattern, text_lower):
-            found_skills.add(skill)
-    
-    return found_skills
+    if fuzzy:
+        return set(extract_skill_confidences(text))
+    return SKILL_MATCHER.find(text)
+
+
+def extract_skill_confidences(text: str, time_budget: Optional[float] = DEFAULT_TIME_BUDGET) -> Dict[str, float]:
+    """
+    Extract skills with a confidence score for each
+
+    Exact and alias matches score 1.0. A fuzzy pass then adds near-misses
+    scored by edit distance, stopping when the time budget runs out.
+
+    Args:
+        text: Resume text content
+        time_budget: Seconds allowed for the fuzzy pass; None for no limit
+
+    Returns:
+        Dictionary of canonical skill -> confidence between 0 and 1
+    """
+    scores = FUZZY_MATCHER.match(text, time_budget).scores
+    scores.update((skill, 1.0) for skill in SKILL_MATCHER.find(text))
+    return scores
+
+
+def extract_skill_evidence(text: str) -> SkillEvidence:
+    """
+    Extract skills with their mention offsets, counts and stated years
+
+    Uses the same single pass as extract_skills_from_text, so phrases such
+    as "5+ years of Python" or "Django since 2019" cost no extra scan.
+
+    Args:
+        text: Resume text content
+
+    Returns:
+        SkillEvidence; evidence.skills() equals extract_skills_from_text(text)
+    """
+    return SKILL_MATCHER.evidence(text)
 
 
-def parse_resume(uploaded_file) -> dict:
+def extract_skills_from_chunks(chunks: Iterable[str]) -> Set[str]:
+    """
+    Extract skills from text that arrives in consecutive chunks
+
+    Skills spanning a chunk edge are still found, and only one chunk is
+    held in memory at a time.
+
+    Args:
+        chunks: Consecutive pieces of the resume text
+
+    Returns:
+        Set of identified skills
+    """
+    return SKILL_MATCHER.find_in_chunks(chunks)
+
+
+def parse_resume(
+    uploaded_file,
+    pdf_mode: Optional[str] = None,
+    on_event: Optional[EventCallback] = None,
+    keep_text: bool = True,
+) -> dict:
     """
     Main function to parse resume and extract information
+
+    The format is sniffed from the leading bytes, not the file name.
+    Paths are memory-mapped, and the same buffer is hashed once and handed
+    to extraction without intermediate copies.
     
     Args:
-        uploaded_file: Streamlit uploaded file object
+        uploaded_file: Streamlit uploaded file object, any file-like object,
+            a file path, or bytes/bytearray/memoryview
+        pdf_mode: Page extraction mode passed to extract_text_from_pdf
+            (default: PDF_MODE)
+        on_event: Optional callback receiving a StageEvent as each stage finishes
+        keep_text: False skips building the full text, so large TXT inputs
+            are decoded and matched chunk by chunk in flat memory
         
     Returns:
         Dictionary containing:
-            - text: Full resume text
+            - text: Full resume text (None when keep_text is False)
             - skills: Set of identified skills
             - skill_count: Number of skills found
+            - evidence: SkillEvidence with mention offsets, counts and years
+              (only each skill's first offset when keep_text is False)
+            - parse_error: Why only part of the file was read, or None
+            - resume_hash: SHA-256 of the uploaded bytes
     """
-    file_type = uploaded_file.name.split('.')[-1].lower()
-    
-    # Extract text based on file type
-    if file_type == 'pdf':
-        text = extract_text_from_pdf(uploaded_file)
-    elif file_type in ['txt', 'text']:
-        text = extract_text_from_txt(uploaded_file)
-    else:
-        raise ValueError(f"Unsupported file type: {file_type}. Please upload PDF or TXT file.")
-    
-    # Extract skills
-    skills = extract_skills_from_text(text)
+    timer = StageTimer(on_event)
+    with open_resume(uploaded_file) as source:
+        file_type = source.file_type
+        timer.emit('bytes_read', bytes=source.size, file_type=file_type)
+
+        resume_hash = content_hash(source.buffer)
+        cache_key = make_cache_key(source.buffer, file_type, PARSER_VERSION, digest=resume_hash)
+        cached = PARSE_CACHE.get(cache_key)
+        if cached is not None:
+            cached['resume_hash'] = resume_hash
+            timer.emit('cache_hit', skills=cached['skill_count'])
+            return cached
+
+        # Extract text based on the sniffed format
+        text = None
+        parse_error = None
+        if file_type == 'pdf':
+            extraction = _extract_pdf(source.pdf_source, pdf_mode)
+            parse_error = extraction.error
+            timer.emit(
+                'pages_extracted',
+                pages=extraction.page_count, cached_pages=extraction.cached_pages, mode=extraction.mode,
+                backend=extraction.backend, partial=bool(parse_error),
+            )
+            # Page by page, so a large PDF is never normalized as one string
+            pages = map(TEXT_NORMALIZER.normalize, extraction.pages)
+            if keep_text:
+                text = _join_pages(pages)
+            else:
+                # Same text as _join_pages, without joining the pages
+                evidence = SKILL_MATCHER.evidence_in_chunks(
+                    itertools.chain.from_iterable((page, '\n') for page in pages)
+                )
+        elif keep_text:
+            text = extract_text_from_txt(source.buffer)
+            timer.emit('text_decoded', characters=len(text))
+        else:
+            try:
+                evidence = SKILL_MATCHER.evidence_in_chunks(iter_text_chunks(source.buffer))
+            except UnicodeDecodeError as e:
+                raise Exception(f"Error reading text file: {str(e)}")
+            timer.emit('text_streamed', bytes=source.size)
+
+    # Extract skills, with their offsets and stated years, in one pass
+    if text is not None:
+        evidence = extract_skill_evidence(text)
+    skills = evidence.skills()
+    timer.emit('skills_matched', skills=len(skills))
     
-    return {
+    result = {
         'text': text,
         'skills': skills,
-        'skill_count': len(skills)
-    }
\ No newline at end of file
+        'skill_count': len(skills),
+        'evidence': evidence,
+        'parse_error': parse_error,
+        'resume_hash': resume_hash,
+    }
+    # Partial parses may succeed next time, so only complete ones are cached;
+    # text-less results would poison the cache for callers that want text
+    if parse_error is None and text is not None:
+        PARSE_CACHE.put(cache_key, result)
+    return result
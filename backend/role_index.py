@@ -0,0 +1,66 @@
+"""
+Inverted skill -> role index over the job roles catalog
+"""
+
+from typing import Dict, Iterable, List, Mapping
+
+from backend.catalog import CatalogSnapshot, compile_catalog
+
+
+class RoleIndex:
+    """
+    Prebuilt postings so scoring only touches roles that share a skill with the user.
+
+    Every required skill is normalized to lowercase and mapped to
+    (role_id, position) postings, where position is the index of the skill in
+    the role's ``required_skills`` list. Duplicated requirements produce one
+    posting per occurrence, matching ``calculate_match_score``. The postings
+    and per-role counts live in the compiled CatalogSnapshot.
+    """
+
+    def __init__(self, catalog: CatalogSnapshot):
+        """
+        Wrap a compiled catalog
+
+        Args:
+            catalog: Snapshot from backend.catalog
+        """
+        self.catalog = catalog
+        self.role_names = catalog.role_names
+        self.demand_scores = catalog.demand_scores
+        self.required_counts: List[int] = [catalog.required_count(role_id) for role_id in range(len(catalog))]
+
+    @classmethod
+    def from_roles(cls, roles_db: Mapping[str, Dict]) -> "RoleIndex":
+        """Compile and index a JOB_ROLES_DB-shaped mapping"""
+        return cls(compile_catalog(roles_db))
+
+    def __len__(self) -> int:
+        return len(self.role_names)
+
+    def role_data(self, role_id: int) -> Dict:
+        """Role data in the JOB_ROLES_DB shape"""
+        return self.catalog.role_data(role_id)
+
+    def match_positions(self, user_skills: Iterable[str]) -> Dict[int, List[int]]:
+        """
+        Collect the matched requirement positions for every role the user touches
+
+        Args:
+            user_skills: Skills from the user's resume (any casing)
+
+        Returns:
+            Mapping of role_id to the sorted positions of required skills the user has
+        """
+        skill_ids = self.catalog.skill_ids
+
+        hits: Dict[int, List[int]] = {}
+        for skill in {skill.lower() for skill in user_skills}:
+            skill_id = skill_ids.get(skill)
+            if skill_id is None:
+                continue
+            for role_id, position in zip(*self.catalog.postings(skill_id)):
+                hits.setdefault(role_id, []).append(position)
+        for positions in hits.values():
+            positions.sort()
+        return hits
@@ -0,0 +1,329 @@
+"""
+Per-skill mention offsets, counts and experience years from one matching pass
+"""
+
+import datetime
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+# An experience phrase is credited to the nearest skill mention this close
+EVIDENCE_WINDOW = 60
+
+_YEAR_WORDS = ('year', 'years', 'yr', 'yrs')
+_JOINERS = ('', ' ', '+', '+ ')
+_YEAR_COUNTS = [float(n) for n in range(1, 41)] + [n + 0.5 for n in range(0, 40)]
+_SINCE_YEARS = range(1980, 2040)
+
+KIND_YEARS = 0
+KIND_SINCE = 1
+
+
+def experience_markers() -> List[Tuple[str, int, float]]:
+    """
+    Literal phrases compiled into the skill automaton next to the skills
+
+    Listing every "5+ years" / "since 2019" spelling explicitly lets the
+    automaton recognize them in the same pass, with no lookahead. The
+    scan drops a marker that starts right after a digit or a decimal
+    point, so "2.5 years" only counts as 2.5.
+
+    Returns:
+        List of (lowercase phrase, kind, value); value is years for
+        KIND_YEARS and the calendar year for KIND_SINCE
+    """
+    markers = []
+    for count in _YEAR_COUNTS:
+        number = f"{count:g}"
+        for joiner in _JOINERS:
+            for word in _YEAR_WORDS:
+                markers.append((f"{number}{joiner}{word}", KIND_YEARS, count))
+    for year in _SINCE_YEARS:
+        markers.append((f"since {year}", KIND_SINCE, float(year)))
+    return markers
+
+
+class SkillEvidence:
+    """
+    Where and how often each skill was mentioned, plus stated experience.
+
+    Mentions are stored column-wise in typed arrays (skill ID, start, end)
+    in text order, so a resume with thousands of mentions stays a few
+    kilobytes. Offsets index the lowercased text. Evidence folded from a
+    stream (see EvidenceAccumulator) keeps only each skill's first mention
+    plus its mention count, so its size is bounded by the dictionary.
+    """
+
+    __slots__ = ('_skills', 'skill_ids', 'starts', 'ends', '_years', '_counts')
+
+    def __init__(
+        self,
+        skills: Sequence[str],
+        skill_ids: array,
+        starts: array,
+        ends: array,
+        years: Dict[int, float],
+        counts: Optional[Dict[int, int]] = None,
+    ):
+        self._skills = skills
+        self.skill_ids = skill_ids
+        self.starts = starts
+        self.ends = ends
+        # Skill ID -> largest number of years credited to it
+        self._years = years
+        # Skill ID -> mentions, when the arrays only hold first mentions
+        self._counts = counts
+
+    @classmethod
+    def from_matches(
+        cls,
+        skills: Sequence[str],
+        markers: Sequence[Tuple[int, float]],
+        matches: Iterable[Tuple[int, int, int]],
+        line_breaks: Sequence[int] = (),
+        reference_year: Optional[int] = None,
+    ) -> "SkillEvidence":
+        """
+        Build evidence from raw automaton matches
+
+        Args:
+            skills: Canonical names indexed by skill ID
+            markers: (kind, value) for pattern IDs len(skills) and up
+            matches: (pattern_id, start, end) tuples from one scan
+            line_breaks: Sorted offsets of newlines; phrases are only credited within a line
+            reference_year: Year "since" phrases are counted up to (default: this year)
+
+        Returns:
+            SkillEvidence
+        """
+        reference_year = reference_year or datetime.date.today().year
+        skill_count = len(skills)
+        skill_ids, starts, ends = array('I'), array('I'), array('I')
+        phrases = []
+        for pattern_id, start, end in sorted(matches, key=lambda match: (match[1], match[2])):
+            if pattern_id < skill_count:
+                skill_ids.append(pattern_id)
+                starts.append(start)
+                ends.append(end)
+                continue
+            kind, value = markers[pattern_id - skill_count]
+            years = value if kind == KIND_YEARS else float(max(0, reference_year - int(value)))
+            phrases.append((start, end, years))
+
+        credited: Dict[int, float] = {}
+        for start, end, years in phrases:
+            nearest = _nearest_mention(starts, ends, line_breaks, start, end)
+            if nearest is not None:
+                skill_id = skill_ids[nearest]
+                credited[skill_id] = max(credited.get(skill_id, 0.0), years)
+        return cls(skills, skill_ids, starts, ends, credited)
+
+    def skills(self) -> set:
+        """Canonical names of every skill mentioned"""
+        return {self._skills[skill_id] for skill_id in set(self.skill_ids)}
+
+    def counts(self) -> Dict[str, int]:
+        """Mentions per skill"""
+        counts = self._counts if self._counts is not None else Counter(self.skill_ids)
+        return {self._skills[skill_id]: count for skill_id, count in counts.items()}
+
+    def years(self) -> Dict[str, float]:
+        """Stated years of experience per skill, for skills that have any"""
+        return {self._skills[skill_id]: years for skill_id, years in self._years.items()}
+
+    def offsets(self, skill: str) -> List[Tuple[int, int]]:
+        """(start, end) of every mention of one skill kept (only the first for streamed evidence)"""
+        return [
+            (self.starts[i], self.ends[i])
+            for i, skill_id in enumerate(self.skill_ids)
+            if self._skills[skill_id] == skill
+        ]
+
+    def summary(self) -> Dict[str, Dict]:
+        """
+        JSON-friendly view for reports and exports
+
+        Returns:
+            Dictionary of skill -> {'mentions', 'years', 'first_offset'}
+        """
+        years = self.years()
+        first: Dict[str, int] = {}
+        for skill_id, start in zip(self.skill_ids, self.starts):
+            first.setdefault(self._skills[skill_id], start)
+        return {
+            skill: {'mentions': count, 'years': years.get(skill), 'first_offset': first[skill]}
+            for skill, count in self.counts().items()
+        }
+
+    def to_payload(self) -> Dict:
+        """Plain lists for JSON storage, keyed by skill name so dictionary changes can't misread it"""
+        payload = {
+            'mentions': [[self._skills[skill_id], start, end] for skill_id, start, end in zip(self.skill_ids, self.starts, self.ends)],
+            'years': self.years(),
+        }
+        if self._counts is not None:
+            payload['counts'] = self.counts()
+        return payload
+
+    @classmethod
+    def from_payload(cls, payload: Dict) -> "SkillEvidence":
+        """Rebuild evidence saved with to_payload"""
+        names: List[str] = []
+        ids: Dict[str, int] = {}
+        skill_ids, starts, ends = array('I'), array('I'), array('I')
+        for skill, start, end in payload['mentions']:
+            if skill not in ids:
+                ids[skill] = len(names)
+                names.append(skill)
+            skill_ids.append(ids[skill])
+            starts.append(start)
+            ends.append(end)
+        years = {ids[skill]: value for skill, value in payload['years'].items() if skill in ids}
+        counts = payload.get('counts')
+        if counts is not None:
+            counts = {ids[skill]: value for skill, value in counts.items() if skill in ids}
+        return cls(names, skill_ids, starts, ends, years, counts)
+
+
+class EvidenceAccumulator:
+    """
+    Fold matches from an incremental scan into SkillEvidence in bounded memory.
+
+    Only mentions and line breaks near the scan position are held: once
+    the scan is far enough past them that no later experience phrase can
+    be credited to them, they are reduced to per-skill counts and first
+    offsets. Crediting follows the same nearest-mention rule as
+    SkillEvidence.from_matches, so years and counts come out the same.
+    """
+
+    def __init__(
+        self,
+        skills: Sequence[str],
+        markers: Sequence[Tuple[int, float]],
+        max_length: int,
+        reference_year: Optional[int] = None,
+    ):
+        """
+        Args:
+            skills: Canonical names indexed by skill ID
+            markers: (kind, value) for pattern IDs len(skills) and up
+            max_length: Longest pattern; a match can start this far before the scan position
+            reference_year: Year "since" phrases are counted up to (default: this year)
+        """
+        self._skills = skills
+        self._markers = markers
+        self._skill_count = len(skills)
+        self._max_length = max_length
+        self._reference_year = reference_year or datetime.date.today().year
+        self._counts: Dict[int, int] = {}
+        self._first: Dict[int, Tuple[int, int]] = {}
+        self._years: Dict[int, float] = {}
+        # Matches not yet known to be in start order, then the recent mentions in order
+        self._incoming: List[Tuple[int, int, int]] = []
+        self._skill_ids, self._starts, self._ends = array('I'), array('I'), array('I')
+        self._line_breaks = array('I')
+        # Experience phrases waiting for mentions after them: (start, end, years)
+        self._phrases: List[Tuple[int, int, float]] = []
+
+    def add(self, matches: Iterable[Tuple[int, int, int]], line_breaks: Sequence[int], position: int) -> None:
+        """
+        Take the next matches of a scan
+
+        Args:
+            matches: (pattern_id, start, end) tuples confirmed so far
+            line_breaks: Newline offsets found since the last call
+            position: Characters scanned so far; later matches end at or after it
+        """
+        self._incoming.extend(matches)
+        self._line_breaks.extend(line_breaks)
+        self._advance(position - self._max_length)
+
+    def finish(self) -> SkillEvidence:
+        """Credit the remaining phrases and build the evidence"""
+        frontier = max([end for _, _, end in self._incoming] + list(self._ends[-1:]) + [0]) + EVIDENCE_WINDOW + 1
+        self._advance(frontier)
+        for start, end, years in self._phrases:
+            self._credit(start, end, years)
+        self._phrases = []
+
+        order = sorted(self._first, key=lambda skill_id: self._first[skill_id])
+        return SkillEvidence(
+            self._skills,
+            array('I', order),
+            array('I', (self._first[skill_id][0] for skill_id in order)),
+            array('I', (self._first[skill_id][1] for skill_id in order)),
+            dict(self._years),
+            dict(self._counts),
+        )
+
+    def _advance(self, frontier: int) -> None:
+        """Settle every match starting before frontier, which no later match can precede"""
+        ready = [match for match in self._incoming if match[1] < frontier]
+        if ready:
+            self._incoming = [match for match in self._incoming if match[1] >= frontier]
+        for pattern_id, start, end in sorted(ready, key=lambda match: (match[1], match[2])):
+            if pattern_id < self._skill_count:
+                self._skill_ids.append(pattern_id)
+                self._starts.append(start)
+                self._ends.append(end)
+                self._counts[pattern_id] = self._counts.get(pattern_id, 0) + 1
+                self._first.setdefault(pattern_id, (start, end))
+                continue
+            kind, value = self._markers[pattern_id - self._skill_count]
+            years = value if kind == KIND_YEARS else float(max(0, self._reference_year - int(value)))
+            self._phrases.append((start, end, years))
+
+        # A phrase is settled once every mention that could be its nearest is known
+        waiting = []
+        for start, end, years in self._phrases:
+            if end + EVIDENCE_WINDOW < frontier:
+                self._credit(start, end, years)
+            else:
+                waiting.append((start, end, years))
+        self._phrases = waiting
+
+        # Mentions ending this far back are out of reach of any phrase still to come
+        horizon = min([frontier] + [start for start, _, _ in waiting]) - EVIDENCE_WINDOW
+        dropped = 0
+        while dropped < len(self._ends) and self._ends[dropped] < horizon:
+            dropped += 1
+        if dropped:
+            del self._skill_ids[:dropped], self._starts[:dropped], self._ends[:dropped]
+        breaks = bisect_left(self._line_breaks, horizon - self._max_length)
+        if breaks:
+            del self._line_breaks[:breaks]
+
+    def _credit(self, start: int, end: int, years: float) -> None:
+        nearest = _nearest_mention(self._starts, self._ends, self._line_breaks, start, end)
+        if nearest is not None:
+            skill_id = self._skill_ids[nearest]
+            self._years[skill_id] = max(self._years.get(skill_id, 0.0), years)
+
+
+def find_line_breaks(text: str, offset: int, line_breaks: array) -> None:
+    """Append the offsets of newlines in text, shifted by offset"""
+    position = text.find('\n')
+    while position != -1:
+        line_breaks.append(offset + position)
+        position = text.find('\n', position + 1)
+
+
+def _nearest_mention(starts: array, ends: array, line_breaks: Sequence[int], start: int, end: int) -> Optional[int]:
+    """Index of the mention closest to the span [start, end) on the same line, if within EVIDENCE_WINDOW"""
+    line = bisect_left(line_breaks, start)
+    position = bisect_left(starts, start)
+    best, best_gap = None, EVIDENCE_WINDOW + 1
+    # Mentions are sorted by start; the closest before and after the phrase suffice,
+    # but a mention ending after an earlier one can still be closer, so look back a little
+    for index in range(max(0, position - 3), min(len(starts), position + 2)):
+        if ends[index] <= start:
+            gap = start - ends[index]
+        elif starts[index] >= end:
+            gap = starts[index] - end
+        else:
+            gap = 0
+        if gap < best_gap and bisect_left(line_breaks, starts[index]) == line:
+            best, best_gap = index, gap
+    return best
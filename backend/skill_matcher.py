@@ -0,0 +1,391 @@
+"""
+Single-pass skill matcher built on an Aho-Corasick automaton
+"""
+
+import hashlib
+from array import array
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+from backend.skill_evidence import EvidenceAccumulator, SkillEvidence, experience_markers, find_line_breaks
+
+
+# Characters scanned between folds in evidence_in_chunks
+_EVIDENCE_SLICE = 64 * 1024
+
+
+def _is_word_char(ch: str) -> bool:
+    """Mirror the regex ``\\w`` class for a single character."""
+    return ch.isalnum() or ch == '_'
+
+
+def build_alias_index(aliases: Mapping[str, Iterable[str]]) -> Dict[str, str]:
+    """
+    Invert an alias table into a surface-form lookup
+
+    Args:
+        aliases: Canonical skill -> alternate surface forms
+
+    Returns:
+        Dictionary of lowercased surface form -> canonical skill
+
+    Raises:
+        ValueError: If one surface form is listed under two canonical skills
+    """
+    index: Dict[str, str] = {}
+    for canonical, surface_forms in aliases.items():
+        for surface in surface_forms:
+            key = surface.lower()
+            if not key or key == canonical.lower():
+                continue
+            if index.get(key, canonical) != canonical:
+                raise ValueError(f"Alias {surface!r} is listed under both {index[key]!r} and {canonical!r}")
+            index[key] = canonical
+    return index
+
+
+class SkillMatcher:
+    """
+    Find every dictionary skill in a text with one linear scan.
+
+    Skills are matched case-insensitively and as whole words: a match may
+    not be preceded or followed by a word character. This is the same rule
+    as wrapping each skill in ``\\b...\\b`` for skills that start and end
+    with letters or digits, and it also lets symbol-terminated skills such
+    as "C++" and "C#" match when followed by a space or punctuation. A line
+    break may stand in for the space inside a multi-word skill, since PDF
+    text wraps lines mid-phrase ("Machine\nLearning").
+
+    Aliases are compiled into the same automaton as extra patterns that
+    report their canonical skill, so they cost no extra passes. So are the
+    experience phrases ("5+ years", "since 2019") behind evidence(); plain
+    matching skips them through a skills-only output table.
+    """
+
+    def __init__(self, skills: Iterable[str], aliases: Optional[Mapping[str, Iterable[str]]] = None):
+        """
+        Compile the automaton for a skill dictionary
+
+        Args:
+            skills: Canonical skill names (original casing is preserved in results)
+            aliases: Optional canonical skill -> alternate surface forms
+                (abbreviations, spellings, synonyms) reported as that skill
+
+        Raises:
+            ValueError: If an alias names an unknown skill, or is itself
+                another skill's canonical name
+        """
+        self.skills: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Outputs per state including experience markers; _out keeps skills only
+        self._out_all: List[List[Tuple[int, int]]] = [[]]
+        # Lowercased canonical name or alias -> skill ID
+        self._skill_ids: Dict[str, int] = {}
+
+        for skill in skills:
+            pattern = skill.lower()
+            if not pattern:
+                continue
+            skill_id = len(self.skills)
+            self.skills.append(skill)
+            self._skill_ids.setdefault(pattern, skill_id)
+            self._add_pattern(pattern, skill_id)
+
+        alias_index = build_alias_index(aliases or {})
+        for surface, canonical in sorted(alias_index.items()):
+            skill_id = self._skill_ids.get(canonical.lower())
+            if skill_id is None:
+                raise ValueError(f"Alias {surface!r} points to unknown skill {canonical!r}")
+            if surface in self._skill_ids:
+                raise ValueError(f"Alias {surface!r} for {canonical!r} is already the skill {self.skills[self._skill_ids[surface]]!r}")
+            self._skill_ids[surface] = skill_id
+            self._add_pattern(surface, skill_id)
+
+        # Marker pattern IDs start after the last skill ID
+        markers = experience_markers()
+        self._markers: List[Tuple[int, float]] = []
+        for phrase, kind, value in markers:
+            self._add_pattern(phrase, len(self.skills) + len(self._markers))
+            self._markers.append((kind, value))
+
+        self._build_failure_links()
+        skill_count = len(self.skills)
+        self._out = [
+            [entry for entry in outputs if entry[0] < skill_count] if outputs else outputs
+            for outputs in self._out_all
+        ]
+        self.max_length = max([len(pattern) for pattern in self._skill_ids] + [len(phrase) for phrase, _, _ in markers])
+
+        # Changes whenever the dictionary, its aliases or the markers do; used to key cached parse results
+        aliases_key = '\n'.join(f"{surface}={canonical}" for surface, canonical in sorted(alias_index.items()))
+        markers_key = '\n'.join(phrase for phrase, _, _ in markers)
+        self.version = hashlib.sha256('\n'.join(self.skills + [aliases_key, markers_key]).encode('utf-8')).hexdigest()[:16]
+
+    def canonical(self, name: str) -> Optional[str]:
+        """
+        Resolve a skill name or alias to its canonical skill
+
+        Args:
+            name: Canonical name or alias, in any casing
+
+        Returns:
+            Canonical skill name, or None if it isn't in the dictionary
+        """
+        skill_id = self._skill_ids.get(name.lower())
+        return None if skill_id is None else self.skills[skill_id]
+
+    def _add_pattern(self, pattern: str, skill_id: int) -> None:
+        state = 0
+        for ch in pattern:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                if ch == ' ':
+                    self._goto[state]['\n'] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out_all.append([])
+            state = next_state
+        self._out_all[state].append((skill_id, len(pattern)))
+
+    def _build_failure_links(self) -> None:
+        # Breadth-first so every fail target is finalized before it is used
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, child in self._goto[state].items():
+                if ch == '\n':
+                    # Shares its child with the space edge, handled there
+                    continue
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                # Inherit matches that end at the same position (dictionary suffix links)
+                self._out_all[child] = self._out_all[child] + self._out_all[self._fail[child]]
+
+    def _scan(
+        self,
+        text: str,
+        begin: int,
+        state: int,
+        matches: List[Tuple[int, int, int]],
+        pending: Optional[List[Tuple[int, int, int]]],
+        with_markers: bool = False,
+    ) -> int:
+        """
+        Advance the automaton over text[begin:] and collect whole-word matches.
+
+        Offsets are indexes into text. Characters before begin are context
+        only, for the left-boundary check. When pending is given, matches
+        ending at the very end of text go there, because their right
+        boundary depends on text not seen yet. With with_markers, IDs past
+        the last skill are experience markers. Returns the final state.
+        """
+        goto = self._goto
+        fail = self._fail
+        out = self._out_all if with_markers else self._out
+        skill_count = len(self.skills)
+        text_len = len(text)
+
+        for i, ch in enumerate(text[begin:] if begin else text, begin):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+
+            end = i + 1
+            if end < text_len:
+                if _is_word_char(text[end]):
+                    continue
+                target = matches
+            else:
+                target = matches if pending is None else pending
+            for skill_id, length in out[state]:
+                start = end - length
+                if start and _is_word_char(text[start - 1]):
+                    continue
+                # A marker after a decimal point is the tail of a longer number ("5 years" in "2.5 years")
+                if start and skill_id >= skill_count and text[start - 1] == '.':
+                    continue
+                target.append((skill_id, start, end))
+        return state
+
+    def iter_matches(self, text_lower: str) -> Iterator[Tuple[int, int, int]]:
+        """
+        Yield every whole-word skill occurrence in already-lowercased text
+
+        Args:
+            text_lower: Text converted with ``str.lower()``
+
+        Returns:
+            Iterator of (skill_id, start, end) tuples, end exclusive
+        """
+        matches: List[Tuple[int, int, int]] = []
+        self._scan(text_lower, 0, 0, matches, None)
+        return iter(matches)
+
+    def scanner(self, with_markers: bool = False) -> "SkillScanner":
+        """Start an incremental scan; see SkillScanner"""
+        return SkillScanner(self, with_markers)
+
+    def evidence(self, text: str, reference_year: Optional[int] = None) -> SkillEvidence:
+        """
+        Find skills together with where, how often and for how long they're mentioned
+
+        Args:
+            text: Raw text in any casing
+            reference_year: Year "since 20XX" phrases are counted up to (default: this year)
+
+        Returns:
+            SkillEvidence built from the same single pass as find()
+        """
+        text_lower = text.lower()
+        matches: List[Tuple[int, int, int]] = []
+        self._scan(text_lower, 0, 0, matches, None, with_markers=True)
+        line_breaks = array('I')
+        find_line_breaks(text_lower, 0, line_breaks)
+        return SkillEvidence.from_matches(self.skills, self._markers, matches, line_breaks, reference_year)
+
+    def evidence_in_chunks(self, chunks: Iterable[str], reference_year: Optional[int] = None) -> SkillEvidence:
+        """
+        evidence() over consecutive text chunks, holding one chunk at a time
+
+        Args:
+            chunks: Consecutive pieces of one text, in any casing
+            reference_year: Year "since 20XX" phrases are counted up to (default: this year)
+
+        Returns:
+            SkillEvidence with the same counts and years as evidence(), but
+            only the first mention of each skill, so memory stays flat
+            however many mentions the text holds. Offsets index the whole
+            lowercased text.
+        """
+        scanner = self.scanner(with_markers=True)
+        accumulator = EvidenceAccumulator(self.skills, self._markers, self.max_length, reference_year)
+        for chunk in chunks:
+            # Matches are held per slice, so a dense chunk can't pile up hundreds of thousands
+            for offset in range(0, len(chunk), _EVIDENCE_SLICE):
+                matches = scanner.feed(chunk[offset:offset + _EVIDENCE_SLICE])
+                accumulator.add(matches, scanner.line_breaks, scanner.position)
+                del scanner.line_breaks[:]
+        accumulator.add(scanner.finish(), (), scanner.position)
+        return accumulator.finish()
+
+    def find_in_chunks(self, chunks: Iterable[str]) -> Set[str]:
+        """
+        Return the set of skills mentioned across consecutive text chunks
+
+        Gives the same result as find() on the concatenated text, while
+        only one chunk is ever lowercased and held at a time.
+
+        Args:
+            chunks: Consecutive pieces of one text, in any casing
+
+        Returns:
+            Set of canonical skill names
+        """
+        skills = self.skills
+        scanner = self.scanner()
+        found = set()
+        for chunk in chunks:
+            found.update(skills[skill_id] for skill_id, _, _ in scanner.feed(chunk))
+        found.update(skills[skill_id] for skill_id, _, _ in scanner.finish())
+        return found
+
+    def find(self, text: str) -> Set[str]:
+        """
+        Return the set of skills mentioned in the text
+
+        Args:
+            text: Raw text in any casing
+
+        Returns:
+            Set of canonical skill names
+        """
+        skills = self.skills
+        return {skills[skill_id] for skill_id, _, _ in self.iter_matches(text.lower())}
+
+
+class SkillScanner:
+    """
+    Incremental SkillMatcher scan over a text that arrives in chunks.
+
+    The automaton state, the last few characters (for the left word
+    boundary) and matches waiting on the next character (for the right
+    word boundary) carry over between chunks, so skills spanning a chunk
+    edge are found exactly as in a single scan. Memory use is bounded by
+    the chunk size, not the text size.
+    """
+
+    def __init__(self, matcher: SkillMatcher, with_markers: bool = False):
+        self._matcher = matcher
+        self._with_markers = with_markers
+        # Newline offsets, recorded alongside markers for SkillEvidence
+        self.line_breaks = array('I')
+        self._state = 0
+        # Characters before the current chunk kept as boundary context
+        self._tail = ''
+        self._keep = matcher.max_length + 1
+        # Absolute offset of the first character of _tail
+        self._tail_offset = 0
+        self._pending: List[Tuple[int, int, int]] = []
+
+    @property
+    def position(self) -> int:
+        """Length of the lowercased text scanned so far"""
+        return self._tail_offset + len(self._tail)
+
+    def feed(self, chunk: str) -> List[Tuple[int, int, int]]:
+        """
+        Scan the next chunk
+
+        Args:
+            chunk: Next piece of the text, in any casing
+
+        Returns:
+            Matches confirmed so far as (skill_id, start, end) tuples, with
+            offsets into the lowercased text as a whole
+        """
+        lowered = chunk.lower()
+        if not lowered:
+            return []
+
+        confirmed: List[Tuple[int, int, int]] = []
+        if self._pending:
+            if not _is_word_char(lowered[0]):
+                confirmed.extend(self._pending)
+            self._pending = []
+
+        text = self._tail + lowered
+        begin = len(self._tail)
+        if self._with_markers:
+            find_line_breaks(lowered, self._tail_offset + begin, self.line_breaks)
+        matches: List[Tuple[int, int, int]] = []
+        pending: List[Tuple[int, int, int]] = []
+        self._state = self._matcher._scan(text, begin, self._state, matches, pending, self._with_markers)
+
+        base = self._tail_offset
+        confirmed.extend((skill_id, base + start, base + end) for skill_id, start, end in matches)
+        self._pending = [(skill_id, base + start, base + end) for skill_id, start, end in pending]
+
+        cut = max(0, len(text) - self._keep)
+        self._tail = text[cut:]
+        self._tail_offset = base + cut
+        return confirmed
+
+    def finish(self) -> List[Tuple[int, int, int]]:
+        """
+        End the scan
+
+        Returns:
+            Matches that were waiting on the end of the text
+        """
+        confirmed, self._pending = self._pending, []
+        return confirmed
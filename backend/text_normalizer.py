@@ -0,0 +1,143 @@
+"""
+Cleanup of PDF-extracted text ahead of skill matching
+"""
+
+import hashlib
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+# Single characters PDF text layers use in place of plain ASCII. Ligatures
+# split "Proﬁciency" into non-words, and the invisible or
+# non-breaking spaces hide word boundaries from the whole-word matcher.
+_CHARACTER_MAP: Dict[str, str] = {
+    # Ligatures
+    '\ufb00': 'ff', '\ufb01': 'fi', '\ufb02': 'fl', '\ufb03': 'ffi',
+    '\ufb04': 'ffl', '\ufb05': 'st', '\ufb06': 'st',
+    # Zero-width characters and byte order marks vanish
+    '\u200b': '', '\u200c': '', '\u200d': '', '\u2060': '', '\ufeff': '',
+    # Tabs, non-breaking and ideographic spaces
+    '\t': ' ', '\u00a0': ' ', '\u202f': ' ', '\u205f': ' ', '\u3000': ' ',
+    # Unicode hyphens and curly quotes
+    '\u2010': '-', '\u2011': '-', '\u2212': '-',
+    '\u2018': "'", '\u2019': "'", '\u201c': '"', '\u201d': '"',
+}
+# En quad through hair space
+_CHARACTER_MAP.update((chr(code), ' ') for code in range(0x2000, 0x200b))
+# Full-width forms of printable ASCII ("Ｐｙｔｈｏｎ")
+_CHARACTER_MAP.update((chr(code), chr(code - 0xfee0)) for code in range(0xff01, 0xff5f))
+
+_TRANSLATION = str.maketrans(_CHARACTER_MAP)
+
+
+def _character_class(chars: Iterable[str]) -> str:
+    """Regex class for a set of characters, with consecutive code points as ranges"""
+    codes = sorted(ord(ch) for ch in chars)
+    ranges: List[List[int]] = []
+    for code in codes:
+        if ranges and code == ranges[-1][1] + 1:
+            ranges[-1][1] = code
+        else:
+            ranges.append([code, code])
+    return '[' + ''.join(
+        re.escape(chr(low)) if low == high else f"{re.escape(chr(low))}-{re.escape(chr(high))}"
+        for low, high in ranges
+    ) + ']+'
+
+
+# Runs of mapped characters. str.translate only has a fast path for ASCII
+# text; anything else (a single ligature is enough) costs a dictionary
+# lookup per character, so there the table is applied to the runs this
+# pattern finds instead.
+_MAPPED_PATTERN = re.compile(_character_class(_CHARACTER_MAP))
+
+# Soft hyphens mark where a word may be broken. They are left out of the
+# character map so one ending a line is still seen as a hyphenated break,
+# and deleted after that pass.
+_SOFT_HYPHEN = '\u00ad'
+
+# A hyphen or soft hyphen ending a line; whether it sits between two words
+# is checked per match. Other newlines are kept since experience phrases
+# are credited per line. Space runs are collapsed separately: an
+# alternation of the two would stop at every single space of ordinary text.
+_HYPHEN_BREAK = re.compile(r'[-\u00ad][ ]*\r?\n[ ]*')
+_SPACE_RUN = re.compile(r'  +')
+
+_LETTERS = re.compile(r'[^\W\d_]+')
+
+
+def _translate_run(match: "re.Match") -> str:
+    return match.group().translate(_TRANSLATION)
+
+
+class TextNormalizer:
+    """
+    Undo the ligatures, line-end hyphenation and Unicode spacing of PDF text.
+
+    Mapped characters come from one precomputed translation table and
+    hyphenated line breaks from one compiled pattern, each a single linear
+    pass in C; Python-level work is per fix, not per character. A word
+    split as "Kuber-\\nnetes", or across a soft hyphen at a line end, is
+    rejoined, except when the two halves form a hyphenated dictionary term
+    such as "Scikit-learn" or "T-SQL", whose hyphen is kept. Hyphens
+    between digits ("2019-\\n2021") are left alone.
+    """
+
+    def __init__(self, terms: Iterable[str] = ()):
+        """
+        Args:
+            terms: Dictionary terms (skills and aliases); hyphens inside them
+                survive rejoining
+        """
+        # (word before the hyphen, word after) pairs, lowercased
+        self._hyphenated: Set[Tuple[str, str]] = set()
+        for term in terms:
+            for word in re.findall(r'\w+(?:-\w+)+', term.lower()):
+                parts = word.split('-')
+                self._hyphenated.update(zip(parts, parts[1:]))
+
+        # Changes whenever the output for some input would; used to key cached parse results
+        hyphenated_key = '\n'.join(f"{left}-{right}" for left, right in sorted(self._hyphenated))
+        self.version = hashlib.sha256(
+            (repr(sorted(_CHARACTER_MAP.items())) + _HYPHEN_BREAK.pattern + _SPACE_RUN.pattern + hyphenated_key).encode('utf-8')
+        ).hexdigest()[:16]
+
+    def _join(self, match: "re.Match") -> str:
+        text = match.string
+        hyphen = match.start()
+        left_start = hyphen
+        while left_start and text[left_start - 1].isalpha():
+            left_start -= 1
+        right = _LETTERS.match(text, match.end())
+        if left_start == hyphen or right is None:
+            return match.group()
+        if (text[left_start:hyphen].lower(), right.group().lower()) in self._hyphenated:
+            return '-'
+        return ''
+
+    def normalize(self, text: str, report: Optional[Dict[str, int]] = None) -> str:
+        """
+        Clean extracted text for matching
+
+        Args:
+            text: Text from a PDF text layer
+            report: Optional dictionary updated with 'mapped' (runs of
+                mapped characters), 'joined' (hyphenated line breaks,
+                including those left as they were) and 'spaces' (space runs)
+
+        Returns:
+            Normalized text
+        """
+        if text.isascii():
+            text, mapped = text.translate(_TRANSLATION), 0
+        else:
+            text, mapped = _MAPPED_PATTERN.subn(_translate_run, text)
+        text, joined = _HYPHEN_BREAK.subn(self._join, text)
+        if _SOFT_HYPHEN in text:
+            text = text.replace(_SOFT_HYPHEN, '')
+        text, spaces = _SPACE_RUN.subn(' ', text)
+        if report is not None:
+            report['mapped'] = report.get('mapped', 0) + mapped
+            report['joined'] = report.get('joined', 0) + joined
+            report['spaces'] = report.get('spaces', 0) + spaces
+        return text
@@ -0,0 +1,88 @@
+"""
+Measure write throughput of the analysis store and the latency of indexed
+candidate queries as it grows
+
+Run with: python -m benchmarks.bench_analysis_store [--resumes 1000000] [--db PATH]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from backend.analysis_store import AnalysisStore
+from backend.career_analyzer import ROLE_INDEX
+from backend.data.job_roles_data import COMMON_SKILLS
+
+
+QUERIES = [
+    ("DevOps Engineer", 70.0, ["Docker"], []),
+    ("Data Scientist", 50.0, ["Deep Learning", "SQL"], []),
+    ("Software Engineer", 80.0, [], ["Python"]),
+    ("ML Engineer", 30.0, [], []),
+]
+QUERY_REPEAT = 20
+
+
+def synthetic_skills(rng: random.Random):
+    """Most of one or two roles' skills plus a few unrelated ones, so scores spread over 0-100"""
+    skills = set()
+    for role_id in rng.sample(range(len(ROLE_INDEX.role_names)), rng.randint(1, 2)):
+        required = ROLE_INDEX.role_data(role_id)['required_skills']
+        skills.update(rng.sample(required, rng.randint(1, len(required))))
+    skills.update(rng.sample(COMMON_SKILLS, rng.randint(0, 5)))
+    return skills
+
+
+def time_queries(store: AnalysisStore):
+    for role_name, min_match, missing, required in QUERIES:
+        best = None
+        for _ in range(QUERY_REPEAT):
+            began = time.perf_counter()
+            found = store.find_candidates(role_name, min_match, missing, required, limit=50)
+            seconds = time.perf_counter() - began
+            best = seconds if best is None else min(best, seconds)
+        condition = ''.join(f" missing {skill}" for skill in missing) + ''.join(f" with {skill}" for skill in required)
+        print(f"  >= {min_match:.0f}% {role_name}{condition}: {len(found)} rows in {best * 1000:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--resumes', type=int, default=200_000, help="Synthetic analyses to write")
+    parser.add_argument('--db', help="SQLite file to write (default: a temporary file)")
+    args = parser.parse_args()
+
+    directory = None
+    path = args.db
+    if path is None:
+        directory = tempfile.TemporaryDirectory()
+        path = os.path.join(directory.name, 'analyses.db')
+    rng = random.Random(21)
+    store = AnalysisStore(path)
+    try:
+        checkpoints = sorted({min(args.resumes, size) for size in (args.resumes // 10, args.resumes)})
+        written = 0
+        for checkpoint in checkpoints:
+            batch = [synthetic_skills(rng) for _ in range(checkpoint - written)]
+            began = time.perf_counter()
+            for skills in batch:
+                store.save(f"{rng.getrandbits(256):064x}", skills, {skill: rng.randint(1, 4) for skill in skills})
+                written += 1
+            queued = time.perf_counter() - began
+            store.flush()
+            seconds = time.perf_counter() - began
+            print(
+                f"{store.count()} analyses stored: {len(batch)} written at {len(batch) / seconds:,.0f}/s "
+                f"(save() returned after {queued / len(batch) * 1e6:.1f} us each)"
+            )
+            time_queries(store)
+        print(f"Database size: {os.path.getsize(path) / 1024 / 1024:.1f} MB; writer stats: {store.stats()}")
+    finally:
+        store.close()
+        if directory is not None:
+            directory.cleanup()
+
+
+if __name__ == "__main__":
+    main()
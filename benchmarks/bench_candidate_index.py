@@ -0,0 +1,66 @@
+"""
+Measure reverse matching latency of the candidate index against scoring every
+resume with calculate_match_score, and check both rank the same top-N
+
+Run with: python -m benchmarks.bench_candidate_index [--resumes 500000]
+"""
+
+import argparse
+import heapq
+import random
+import time
+
+from backend.candidate_index import CandidateIndex
+from backend.career_analyzer import ROLE_INDEX, calculate_match_score
+from backend.resume_parser import extract_skills_from_text
+from benchmarks.bench_analysis_store import synthetic_skills
+
+
+TOP_N = 20
+BRUTE_FORCE_ROLES = 2
+JOB_DESCRIPTION = (
+    "We are hiring a platform engineer to run Kubernetes and Docker on AWS, automate "
+    "infrastructure with Terraform, write Python tooling and keep CI/CD pipelines green."
+)
+
+
+def brute_force(corpus, required_skills, top_n):
+    """Score every resume; ties keep corpus order like the index"""
+    scored = ((calculate_match_score(skills, required_skills), -position) for position, skills in enumerate(corpus))
+    return [(score, -neg_position) for score, neg_position in heapq.nlargest(top_n, scored) if score > 0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--resumes', type=int, default=500_000, help="Synthetic resumes to index")
+    args = parser.parse_args()
+
+    rng = random.Random(22)
+    corpus = [synthetic_skills(rng) for _ in range(args.resumes)]
+    began = time.perf_counter()
+    index = CandidateIndex()
+    for position, skills in enumerate(corpus):
+        index.add(str(position), skills)
+    print(f"Indexed {len(index):,} resumes in {time.perf_counter() - began:.1f}s")
+
+    print(f"{'requirements':>22} {'first ms':>9} {'warm ms':>8} {'brute ms':>9} {'same top-N':>11}")
+    queries = [(name, ROLE_INDEX.role_data(role_id)['required_skills']) for role_id, name in enumerate(ROLE_INDEX.role_names)]
+    queries.append(('job description', sorted(extract_skills_from_text(JOB_DESCRIPTION))))
+    for number, (name, required_skills) in enumerate(queries):
+        began = time.perf_counter()
+        found = index.top_candidates(required_skills, TOP_N)
+        first = time.perf_counter() - began
+        began = time.perf_counter()
+        index.top_candidates(required_skills, TOP_N)
+        warm = time.perf_counter() - began
+        brute_ms, same = '', ''
+        if number < BRUTE_FORCE_ROLES or name == 'job description':
+            began = time.perf_counter()
+            expected = brute_force(corpus, required_skills, TOP_N)
+            brute_ms = f"{(time.perf_counter() - began) * 1000:.0f}"
+            same = str(expected == [(match['match_score'], int(match['resume_key'])) for match in found])
+        print(f"{name:>22} {first * 1000:>9.1f} {warm * 1000:>8.1f} {brute_ms:>9} {same:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Measure catalog compile time, snapshot size and snapshot load time
+
+Run with: python -m benchmarks.bench_catalog
+"""
+
+import os
+import random
+import tempfile
+import time
+
+from backend.catalog import compile_catalog, load_snapshot, save_snapshot
+from benchmarks.bench_role_index import build_catalog
+
+
+CATALOG_SIZES = [100, 1_000, 10_000, 100_000]
+
+
+def main():
+    rng = random.Random(11)
+    print(f"{'roles':>8} {'compile ms':>11} {'size KB':>9} {'load ms':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in CATALOG_SIZES:
+            catalog = build_catalog(size, rng)
+            path = os.path.join(tmp, f"catalog_{size}.snapshot")
+
+            start = time.perf_counter()
+            snapshot = compile_catalog(catalog)
+            compile_ms = (time.perf_counter() - start) * 1000
+            save_snapshot(snapshot, path)
+
+            start = time.perf_counter()
+            loaded = load_snapshot(path)
+            load_ms = (time.perf_counter() - start) * 1000
+            assert len(loaded) == size
+
+            print(f"{size:>8} {compile_ms:>11.1f} {os.path.getsize(path) / 1024:>9.0f} {load_ms:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Measure cohort analytics compute time on 1M synthetic analyses, and how much an
+incremental refresh saves over recomputing everything
+
+Run with: python -m benchmarks.bench_cohort_analytics [--resumes 1000000] [--store analyses.db]
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from backend.career_analyzer import score_career_fit_batch
+from backend.cohort_analytics import CohortAnalytics, score_frame, skill_frame
+from benchmarks.bench_analysis_store import synthetic_skills
+
+
+INCREMENT = 10_000
+
+
+def synthetic_frames(resumes: int, rng: random.Random):
+    """score_frame and skill_frame of synthetic resumes, scored like the app does"""
+    skill_sets = [synthetic_skills(rng) for _ in range(resumes)]
+    match_scores, _, _ = score_career_fit_batch(skill_sets)
+    resume_ids, role_codes = np.nonzero(match_scores)
+    scores = score_frame(resume_ids, role_codes, match_scores[resume_ids, role_codes])
+
+    keys = sorted({skill.lower() for skills in skill_sets for skill in skills})
+    codes = {key: code for code, key in enumerate(keys)}
+    skill_ids = [(resume_id, codes[skill.lower()]) for resume_id, skills in enumerate(skill_sets) for skill in skills]
+    skill_rows = np.array(skill_ids, dtype=np.int64)
+    return scores, skill_frame(skill_rows[:, 0], skill_rows[:, 1], keys)
+
+
+def report(analytics: CohortAnalytics, reads: int = 3) -> float:
+    """Best time to produce every report from the aggregates"""
+    best = None
+    for _ in range(reads):
+        began = time.perf_counter()
+        analytics.missing_skills()
+        analytics.fit_distribution()
+        analytics.gap_hours()
+        seconds = time.perf_counter() - began
+        best = seconds if best is None else min(best, seconds)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--resumes', type=int, default=1_000_000, help="Synthetic analyses")
+    parser.add_argument('--store', help="Also time a full refresh from this SQLite analysis store")
+    args = parser.parse_args()
+
+    began = time.perf_counter()
+    scores, skills = synthetic_frames(args.resumes, random.Random(23))
+    print(
+        f"{args.resumes:,} synthetic resumes: {len(scores):,} role-score rows, {len(skills):,} skill rows "
+        f"(generated in {time.perf_counter() - began:.1f}s)"
+    )
+    memory = (scores.memory_usage(deep=True).sum() + skills.memory_usage(deep=True).sum()) / 1024 / 1024
+    print(f"Columnar frames with categorical role/skill: {memory:.0f} MB")
+
+    analytics = CohortAnalytics()
+    analytics.add_frames(scores, skills, args.resumes)
+    print(f"Full compute:            {analytics.timings['compute_ms']:>8.1f} ms")
+    print(f"Reports from aggregates: {report(analytics) * 1000:>8.1f} ms")
+
+    delta_scores, delta_skills = synthetic_frames(INCREMENT, random.Random(230))
+    analytics.add_frames(delta_scores, delta_skills, INCREMENT)
+    print(f"Incremental +{INCREMENT:,}:      {analytics.timings['compute_ms']:>8.1f} ms")
+
+    if args.store:
+        from backend.analysis_store import AnalysisStore
+
+        store = AnalysisStore(args.store)
+        try:
+            timings = CohortAnalytics(store).refresh()
+        finally:
+            store.close()
+        print(
+            f"Store refresh of {timings['new_resumes']:,} resumes: load {timings['load_ms']:.0f} ms, "
+            f"compute {timings['compute_ms']:.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Measure export throughput and peak memory per format, showing that memory is
+bounded by the row group size rather than the number of rows exported
+
+Run with: python -m benchmarks.bench_export [--rows 1000000]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from backend.career_analyzer import ROLE_INDEX
+from backend.export import ROW_GROUP_SIZE, pa, write_export
+
+
+def synthetic_rows(count: int, rng: random.Random):
+    """Export rows generated on the fly, so the source itself holds nothing"""
+    roles = [(name, ROLE_INDEX.role_data(role_id)['required_skills']) for role_id, name in enumerate(ROLE_INDEX.role_names)]
+    for number in range(count):
+        role_name, required = rng.choice(roles)
+        known = rng.sample(required, rng.randint(1, len(required)))
+        yield {
+            'resume_hash': f"{number:064x}", 'file_name': f"resume_{number}.pdf", 'analyzed_at': None,
+            'skill_count': len(known) + 3, 'skills': known + ['Communication', 'Leadership', 'Git'], 'role': role_name,
+            'match_score': round(len(known) / len(required) * 100, 1), 'combined_score': 50.0,
+            'known_skills': known, 'missing_skills': [skill for skill in required if skill not in known],
+            'gap_hours': 30.0 * (len(required) - len(known)),
+        }
+
+
+def run(path: str, rows: int, row_group_size: int, trace: bool):
+    if trace:
+        tracemalloc.start()
+    if pa is not None:
+        pa.default_memory_pool().release_unused()
+    began = time.perf_counter()
+    write_export(synthetic_rows(rows, random.Random(24)), path, row_group_size=row_group_size)
+    seconds = time.perf_counter() - began
+    peak = 0
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000, help="Rows exported per format")
+    args = parser.parse_args()
+
+    extensions = ['.csv'] + (['.parquet', '.arrow'] if pa is not None else [])
+    print(f"{args.rows:,} rows per export")
+    print(f"{'format':>8} {'group':>8} {'rows/s':>9} {'MB':>7} {'peak MB':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for extension in extensions:
+            path = os.path.join(directory, 'export' + extension)
+            for row_group_size in (ROW_GROUP_SIZE // 5, ROW_GROUP_SIZE):
+                seconds, _ = run(path, args.rows, row_group_size, trace=False)
+                size = os.path.getsize(path)
+                # Peak Python heap plus what Arrow allocated, over the whole export
+                _, peak = run(path, args.rows, row_group_size, trace=True)
+                arrow_peak = pa.default_memory_pool().max_memory() if pa is not None else 0
+                print(
+                    f"{extension[1:]:>8} {row_group_size:>8,} {args.rows / seconds:>9,.0f} "
+                    f"{size / 1024 / 1024:>7.1f} {(peak + (arrow_peak or 0)) / 1024 / 1024:>8.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
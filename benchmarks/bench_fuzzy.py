@@ -0,0 +1,81 @@
+"""
+Compare the fuzzy skill pass with exact matching on resumes full of typos,
+and check it adds nothing to ordinary resume sentences
+
+Run with: python -m benchmarks.bench_fuzzy
+"""
+
+import random
+
+from backend.data.job_roles_data import COMMON_SKILLS
+from backend.fuzzy_matcher import DEFAULT_TIME_BUDGET
+from backend.resume_parser import FUZZY_MATCHER, SKILL_MATCHER
+from benchmarks.bench_skill_matcher import best_of, build_resume
+
+
+RESUME_LENGTHS = [1, 4, 16]
+TYPO_RATE = 0.5
+
+# Plain resume text the fuzzy pass must not find any skill in
+ORDINARY_SENTENCES = [
+    "Worked as a Data Analyst",
+    "Led a team of data analysts",
+    "Filed the court docket",
+    "Helped protect the company network",
+    "Handled the rest of the migration",
+    "Cleared the backlog while leaning on the team",
+    "Worked to reach scale on every shift",
+]
+
+
+def add_typo(skill: str, rng: random.Random) -> str:
+    """Swap two adjacent letters or drop one, away from the first letter"""
+    # Words under five letters must match exactly, so a typo there is out of reach
+    if len(skill) < 5:
+        return skill
+    i = rng.randint(1, len(skill) - 2)
+    if rng.random() < 0.5:
+        return skill[:i] + skill[i + 1] + skill[i] + skill[i + 2:]
+    return skill[:i] + skill[i + 1:]
+
+
+def build_typo_resume(copies: int, rng: random.Random):
+    # Distinct text per copy, so window deduplication can't flatter the timings
+    skills = list(COMMON_SKILLS)
+    words = [word for _ in range(copies) for word in build_resume(skills, rng).split(' ')]
+    words = [f"{word}{rng.randint(0, 99)}" if word.isalpha() and word.islower() and rng.random() < 0.5 else word for word in words]
+    mentioned = set()
+    for i, word in enumerate(words):
+        if word in COMMON_SKILLS and rng.random() < TYPO_RATE:
+            words[i] = add_typo(word, rng)
+            if words[i] != word:
+                mentioned.add(word)
+    return ' '.join(words), mentioned
+
+
+def main():
+    rng = random.Random(16)
+    print(f"{'x800 words':>10} {'exact ms':>9} {'fuzzy ms':>9} {'ratio':>7} {'typo recall':>12} {'budgeted':>9}")
+    for copies in RESUME_LENGTHS:
+        text, typoed = build_typo_resume(copies, rng)
+        exact_ms = best_of(lambda: SKILL_MATCHER.find(text), 5) * 1000
+        fuzzy_ms = best_of(lambda: FUZZY_MATCHER.match(text, None), 3) * 1000
+
+        found = set(FUZZY_MATCHER.match(text, None).scores)
+        recall = len(typoed & found) / len(typoed) if typoed else 1.0
+        budgeted = FUZZY_MATCHER.match(text, DEFAULT_TIME_BUDGET)
+        status = 'complete' if budgeted.complete else 'cut off'
+        print(f"{copies:>10} {exact_ms:>9.2f} {fuzzy_ms:>9.2f} {fuzzy_ms / exact_ms:>6.1f}x {recall:>11.0%} {status:>9}")
+
+    clean = 0
+    for text in ORDINARY_SENTENCES:
+        found = FUZZY_MATCHER.match(text, None).scores
+        if found:
+            print(f"False positive in {text!r}: {found}")
+        else:
+            clean += 1
+    print(f"\n{clean}/{len(ORDINARY_SENTENCES)} ordinary sentences without fuzzy matches")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Measure peak Python memory per resume for the old upload path, zero-copy
+ingestion, and chunked streaming (keep_text=False), on sparse resume text
+and on skill-dense text where nearly every word is a mention
+
+Run with: python -m benchmarks.bench_ingest
+"""
+
+import io
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from backend import resume_parser
+from backend.parse_cache import make_cache_key
+from backend.resume_parser import SKILL_MATCHER, parse_resume
+from benchmarks.bench_skill_matcher import build_resume
+
+
+TEXT_SIZES_MB = [1, 4, 16]
+
+# One line of nothing but skills and experience phrases
+DENSE_LINE = b"Python Docker SQL Kubernetes 5 years AWS React Git Linux since 2019 Terraform Java\n"
+
+
+def legacy_parse(path: str) -> dict:
+    """The original flow: read the whole upload, copy it into BytesIO, then decode"""
+    with open(path, 'rb') as upload:
+        data = upload.read()
+    make_cache_key(data, 'txt', SKILL_MATCHER.version)
+    text = io.BytesIO(data).read().decode('utf-8')
+    skills = SKILL_MATCHER.find(text)
+    return {'text': text, 'skills': skills, 'skill_count': len(skills)}
+
+
+def measure(func, *args):
+    """Run func once under tracemalloc; returns (seconds, peak MB)"""
+    resume_parser.PARSE_CACHE.clear()
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def write_text(path: str, line: bytes, size_mb: int) -> None:
+    with open(path, 'wb') as out:
+        out.write(line * (size_mb * 1024 * 1024 // len(line)))
+
+
+def dense_streaming(tmp: str) -> None:
+    """Streaming must stay flat however many mentions the text holds"""
+    print("\nSkill-dense text, keep_text=False")
+    print(f"{'size MB':>8} {'stream MB':>10} {'stream s':>9}")
+    for size_mb in TEXT_SIZES_MB:
+        path = os.path.join(tmp, f"dense_{size_mb}.txt")
+        write_text(path, DENSE_LINE, size_mb)
+        stream_s, stream_mb = measure(parse_resume, path, None, None, False)
+        print(f"{size_mb:>8} {stream_mb:>10.1f} {stream_s:>9.2f}")
+
+
+def main():
+    rng = random.Random(13)
+    print(
+        f"{'size MB':>8} {'legacy MB':>10} {'path MB':>8} {'bytes MB':>9} {'stream MB':>10} "
+        f"{'legacy s':>9} {'path s':>7} {'stream s':>9}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        chunk = build_resume(list(SKILL_MATCHER.skills), rng).encode('utf-8') + b'\n'
+        for size_mb in TEXT_SIZES_MB:
+            path = os.path.join(tmp, f"resume_{size_mb}.txt")
+            write_text(path, chunk, size_mb)
+            with open(path, 'rb') as source:
+                payload = source.read()
+
+            legacy_s, legacy_mb = measure(legacy_parse, path)
+            path_s, path_mb = measure(parse_resume, path)
+            # The payload is allocated before tracing starts, as an upload would be
+            _, bytes_mb = measure(parse_resume, payload)
+            stream_s, stream_mb = measure(parse_resume, path, None, None, False)
+            print(
+                f"{size_mb:>8} {legacy_mb:>10.1f} {path_mb:>8.1f} {bytes_mb:>9.1f} {stream_mb:>10.1f} "
+                f"{legacy_s:>9.2f} {path_s:>7.2f} {stream_s:>9.2f}"
+            )
+        dense_streaming(tmp)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Check PDF text normalization on known cases, measure how many skills it
+recovers on a sample corpus, and what the translation-table pass costs next
+to a chain of str.replace calls
+
+Run with: python -m benchmarks.bench_normalizer
+"""
+
+import random
+import re
+
+from backend.data.job_roles_data import COMMON_SKILLS
+from backend.resume_parser import SKILL_MATCHER, TEXT_NORMALIZER
+from backend.text_normalizer import _CHARACTER_MAP, _HYPHEN_BREAK, _SOFT_HYPHEN, _SPACE_RUN
+from benchmarks.bench_skill_matcher import best_of, build_resume
+
+
+CORPUS_SIZE = 200
+LINE_WIDTH = 70
+TIMING_COPIES = [1, 16, 64]
+
+_LIGATURES = {'ffi': 'ﬃ', 'ffl': 'ﬄ', 'ff': 'ﬀ', 'fi': 'ﬁ', 'fl': 'ﬂ'}
+_LIGATURE_PATTERN = re.compile('|'.join(_LIGATURES))
+
+# (extracted text, expected normalized text)
+CHECKS = [
+    ("Kuber-\nnetes", "Kubernetes"),
+    ("Kuber\u00ad\nnetes", "Kubernetes"),
+    ("Kuber\u00ad \r\n  netes", "Kubernetes"),
+    ("Py\u00adthon", "Python"),
+    ("Scikit-\nlearn", "Scikit-learn"),
+    ("2019-\n2021", "2019-\n2021"),
+    ("Pro\ufb01ciency in \uff30\uff59\uff54\uff48\uff4f\uff4e", "Proficiency in Python"),
+]
+
+
+def wrap_with_hyphens(text: str, rng: random.Random) -> str:
+    """Break lines at LINE_WIDTH, splitting long words with a hyphen or soft hyphen the way typeset PDFs do"""
+    lines, line = [], ''
+    for word in text.split(' '):
+        if len(line) + len(word) + 1 <= LINE_WIDTH:
+            line = f"{line} {word}" if line else word
+            continue
+        room = LINE_WIDTH - len(line) - 2
+        if len(word) > 6 and room > 2 and word.isalpha() and rng.random() < 0.7:
+            cut = min(room, len(word) - 3)
+            hyphen = '-' if rng.random() < 0.5 else _SOFT_HYPHEN
+            lines.append(f"{line} {word[:cut]}{hyphen}")
+            line = word[cut:]
+        else:
+            lines.append(line)
+            line = word
+    lines.append(line)
+    return '\n'.join(lines)
+
+
+def pdfify(text: str, rng: random.Random) -> str:
+    """Degrade clean text the way PDF text layers do"""
+    text = wrap_with_hyphens(text, rng)
+    text = _LIGATURE_PATTERN.sub(lambda match: _LIGATURES[match.group(0)], text)
+    chars = []
+    for ch in text:
+        roll = rng.random()
+        if ch == ' ' and roll < 0.03:
+            chars.append(' ')
+        elif ch.isalpha() and roll < 0.01:
+            chars.append(ch + '­')
+        elif ch.isalpha() and roll < 0.015:
+            chars.append(chr(ord(ch) + 0xfee0) if ch.isascii() else ch)
+        else:
+            chars.append(ch)
+    return ''.join(chars)
+
+
+def replace_chain(text: str) -> str:
+    """The straightforward alternative: one str.replace per mapped character, then the same cleanup"""
+    for old, new in _CHARACTER_MAP.items():
+        text = text.replace(old, new)
+    text = _HYPHEN_BREAK.sub(TEXT_NORMALIZER._join, text).replace(_SOFT_HYPHEN, '')
+    return _SPACE_RUN.sub(' ', text)
+
+
+def failed_checks():
+    """CHECKS cases the normalizer gets wrong, as (input, expected, actual)"""
+    failures = []
+    for text, expected in CHECKS:
+        actual = TEXT_NORMALIZER.normalize(text)
+        if actual != expected:
+            failures.append((text, expected, actual))
+    return failures
+
+
+def recovery(rng: random.Random):
+    skills = list(COMMON_SKILLS)
+    truth_total = raw_total = normalized_total = spurious = 0
+    for _ in range(CORPUS_SIZE):
+        clean = build_resume(skills, rng)
+        degraded = pdfify(clean, rng)
+        truth = SKILL_MATCHER.find(clean)
+        raw = SKILL_MATCHER.find(degraded) & truth
+        normalized = SKILL_MATCHER.find(TEXT_NORMALIZER.normalize(degraded))
+        truth_total += len(truth)
+        raw_total += len(raw)
+        normalized_total += len(normalized & truth)
+        spurious += len(normalized - truth)
+    return truth_total, raw_total, normalized_total, spurious
+
+
+def main():
+    failures = failed_checks()
+    for text, expected, actual in failures:
+        print(f"Normalized {text!r} to {actual!r}, expected {expected!r}")
+    print(f"{len(CHECKS) - len(failures)}/{len(CHECKS)} normalizer checks pass\n")
+
+    rng = random.Random(18)
+    truth, raw, normalized, spurious = recovery(rng)
+    print(f"Sample corpus: {CORPUS_SIZE} degraded resumes, {truth} skill mentions (distinct per resume)")
+    print(f"  found without normalization: {raw:>6} ({raw / truth:.1%})")
+    print(f"  found after normalization:   {normalized:>6} ({normalized / truth:.1%})")
+    print(f"  recovered by normalization:  {normalized - raw:>6}")
+    print(f"  spurious skills introduced:  {spurious:>6}")
+    print()
+
+    print(f"{'x800 words':>10} {'KB':>7} {'table ms':>9} {'replace ms':>11} {'speedup':>8}")
+    sample = pdfify(build_resume(list(COMMON_SKILLS), rng), rng)
+    for copies in TIMING_COPIES:
+        text = '\n'.join([sample] * copies)
+        table_ms = best_of(lambda: TEXT_NORMALIZER.normalize(text), 5) * 1000
+        chain_ms = best_of(lambda: replace_chain(text), 5) * 1000
+        print(f"{copies:>10} {len(text) / 1024:>7.0f} {table_ms:>9.2f} {chain_ms:>11.2f} {chain_ms / table_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
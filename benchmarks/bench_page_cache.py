@@ -0,0 +1,67 @@
+"""
+Measure extraction time and page-level hit rate of the page text cache when
+candidates re-upload revisions that change one page at a time
+
+Run with: python -m benchmarks.bench_page_cache
+"""
+
+import random
+import time
+
+from backend.data.job_roles_data import COMMON_SKILLS
+from backend.parse_cache import PageTextCache
+from backend.pdf_backends import build_text_pdf
+from backend.pdf_extractor import extract_pdf_pages
+from backend.pdf_sandbox import ParseBudget, extract_pdf_pages_budgeted
+from benchmarks.bench_skill_matcher import build_resume
+
+
+CANDIDATES = 10
+REVISIONS = 3
+PAGES = 6
+LINES_PER_PAGE = 45
+LINE_WORDS = 10
+
+
+def build_page(rng: random.Random):
+    words = build_resume(list(COMMON_SKILLS), rng).split(' ')
+    return [' '.join(words[i:i + LINE_WORDS]) for i in range(0, LINES_PER_PAGE * LINE_WORDS, LINE_WORDS)]
+
+
+def revision_stream(rng: random.Random):
+    """Every candidate's v1..vN in upload order; each revision rewrites one page"""
+    uploads = []
+    for _ in range(CANDIDATES):
+        pages = [build_page(rng) for _ in range(PAGES)]
+        for _ in range(REVISIONS):
+            uploads.append(build_text_pdf(pages))
+            pages = list(pages)
+            pages[rng.randrange(PAGES)] = build_page(rng)
+    return uploads
+
+
+def run(extract, uploads, cache):
+    began = time.perf_counter()
+    for data in uploads:
+        extract(data, cache)
+    return time.perf_counter() - began
+
+
+def main():
+    uploads = revision_stream(random.Random(20))
+    budget = ParseBudget()
+    paths = {
+        'serial': lambda data, cache: extract_pdf_pages(data, 'serial', page_cache=cache),
+        'isolated': lambda data, cache: extract_pdf_pages_budgeted(data, budget, page_cache=cache),
+    }
+    print(f"{len(uploads)} uploads: {CANDIDATES} candidates x {REVISIONS} revisions of {PAGES} pages, one page changed per revision")
+    print(f"{'path':>9} {'uncached s':>11} {'cached s':>9} {'speedup':>8} {'page hit rate':>14}")
+    for name, extract in paths.items():
+        uncached = run(extract, uploads, None)
+        cache = PageTextCache()
+        cached = run(extract, uploads, cache)
+        print(f"{name:>9} {uncached:>11.2f} {cached:>9.2f} {uncached / cached:>7.1f}x {cache.stats()['hit_rate']:>13.1%}")
+
+
+if __name__ == "__main__":
+    main()
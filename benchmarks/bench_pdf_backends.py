@@ -0,0 +1,108 @@
+"""
+Compare throughput and skill recall of every installed PDF backend on one corpus
+
+Pass a directory of PDFs to use a local corpus; recall is then measured
+against the skills any backend found. Without one, a synthetic corpus is
+generated and recall is measured against the text each PDF was built from.
+
+Run with: python -m benchmarks.bench_pdf_backends [PDF_DIR]
+"""
+
+import argparse
+import glob
+import os
+import random
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from backend.data.job_roles_data import COMMON_SKILLS
+from backend.pdf_backends import BACKENDS, available_backends, build_text_pdf, probe_backends
+from backend.resume_parser import SKILL_MATCHER, TEXT_NORMALIZER
+from benchmarks.bench_skill_matcher import build_resume
+
+
+SYNTHETIC_DOCUMENTS = 30
+LINES_PER_PAGE = 45
+LINE_WORDS = 10
+
+
+def synthetic_corpus(rng: random.Random) -> List[Tuple[str, bytes, Optional[Set[str]]]]:
+    """Generated resumes of 2-8 pages, with the skills each was built from"""
+    corpus = []
+    for number in range(SYNTHETIC_DOCUMENTS):
+        words = ' '.join(build_resume(list(COMMON_SKILLS), rng) for _ in range(rng.randint(1, 4))).split(' ')
+        lines = [' '.join(words[i:i + LINE_WORDS]) for i in range(0, len(words), LINE_WORDS)]
+        pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)]
+        corpus.append((f"synthetic_{number}.pdf", build_text_pdf(pages), SKILL_MATCHER.find('\n'.join(lines))))
+    return corpus
+
+
+def local_corpus(directory: str) -> List[Tuple[str, bytes, Optional[Set[str]]]]:
+    corpus = []
+    for path in sorted(glob.glob(os.path.join(directory, '**', '*.pdf'), recursive=True)):
+        with open(path, 'rb') as pdf_file:
+            corpus.append((os.path.relpath(path, directory), pdf_file.read(), None))
+    return corpus
+
+
+def run_backend(name: str, corpus) -> Tuple[float, int, int, Dict[str, Set[str]]]:
+    """Extract every document; returns (seconds, pages, failures, skills per document)"""
+    backend = BACKENDS[name]
+    seconds = 0.0
+    pages = failures = 0
+    found: Dict[str, Set[str]] = {}
+    for doc_name, data, _ in corpus:
+        began = time.perf_counter()
+        try:
+            with backend.open(data) as pdf:
+                texts = [pdf.page_text(index) for index in range(pdf.page_count)]
+        except Exception:
+            failures += 1
+            continue
+        finally:
+            seconds += time.perf_counter() - began
+        pages += len(texts)
+        found[doc_name] = SKILL_MATCHER.find(TEXT_NORMALIZER.normalize('\n'.join(texts)))
+    return seconds, pages, failures, found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('corpus', nargs='?', help="Directory of PDFs (default: generate a synthetic corpus)")
+    args = parser.parse_args()
+
+    corpus = local_corpus(args.corpus) if args.corpus else synthetic_corpus(random.Random(19))
+    if not corpus:
+        raise SystemExit(f"No PDFs found under {args.corpus}")
+    names = available_backends()
+    total_mb = sum(len(data) for _, data, _ in corpus) / 1024 / 1024
+    print(f"Corpus: {len(corpus)} documents, {total_mb:.1f} MB; backends installed: {', '.join(names)}")
+    probe = probe_backends(names)
+    print("Startup probe: " + ", ".join(
+        f"{name} {seconds * 1000:.1f} ms" if seconds is not None else f"{name} failed" for name, seconds in probe.items()
+    ))
+    print()
+
+    results = {name: run_backend(name, corpus) for name in names}
+
+    # Without ground truth, a skill counts as present if any backend found it
+    expected: Dict[str, Set[str]] = {}
+    for doc_name, _, truth in corpus:
+        if truth is not None:
+            expected[doc_name] = truth
+        else:
+            expected[doc_name] = set().union(*(found.get(doc_name, set()) for _, _, _, found in results.values()))
+
+    print(f"{'backend':>10} {'docs/s':>8} {'pages/s':>8} {'MB/s':>7} {'failed':>7} {'recall':>7}")
+    for name, (seconds, pages, failures, found) in results.items():
+        hits = sum(len(found.get(doc_name, set()) & skills) for doc_name, skills in expected.items())
+        total = sum(len(skills) for skills in expected.values())
+        recall = hits / total if total else 1.0
+        print(
+            f"{name:>10} {len(corpus) / seconds:>8.1f} {pages / seconds:>8.1f} {total_mb / seconds:>7.2f} "
+            f"{failures:>7} {recall:>6.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark the inverted role index against catalogs of growing size
+
+Run with: python -m benchmarks.bench_role_index
+"""
+
+import random
+import time
+from typing import Dict
+
+from backend.data.job_roles_data import COMMON_SKILLS, JOB_ROLES_DB
+from backend.role_index import RoleIndex
+
+
+CATALOG_SIZES = [10, 1_000, 10_000, 50_000]
+
+
+def build_catalog(size: int, rng: random.Random) -> Dict[str, Dict]:
+    """Synthetic roles drawing from a large vocabulary, like an imported catalog"""
+    vocabulary = [f"Skill {i}" for i in range(20_000)]
+    template = next(iter(JOB_ROLES_DB.values()))
+    catalog = {}
+    for i in range(size):
+        catalog[f"Role {i}"] = dict(
+            template,
+            required_skills=rng.sample(vocabulary, 10),
+            demand_score=rng.randint(50, 99),
+        )
+    # A handful of roles share skills with a typical resume
+    for i in range(min(size, 5)):
+        catalog[f"Role {i}"]['required_skills'][:3] = rng.sample(COMMON_SKILLS, 3)
+    return catalog
+
+
+def main():
+    rng = random.Random(7)
+    user_skills = set(rng.sample(COMMON_SKILLS, 15))
+    print(f"{'roles':>8} {'build ms':>10} {'lookup us':>10} {'roles hit':>10}")
+    for size in CATALOG_SIZES:
+        catalog = build_catalog(size, rng)
+        start = time.perf_counter()
+        index = RoleIndex.from_roles(catalog)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        runs = 1_000
+        start = time.perf_counter()
+        for _ in range(runs):
+            hits = index.match_positions(user_skills)
+        lookup_us = (time.perf_counter() - start) / runs * 1_000_000
+
+        print(f"{size:>8} {build_ms:>10.1f} {lookup_us:>10.1f} {len(hits):>10}")
+
+
+if __name__ == "__main__":
+    main()
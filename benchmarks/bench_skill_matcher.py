@@ -0,0 +1,140 @@
+"""
+Benchmark the single-pass skill matcher against the per-skill regex loop,
+its scan time as alias tables grow, and the cost of experience evidence
+
+Run with: python -m benchmarks.bench_skill_matcher
+"""
+
+import random
+import re
+import time
+from typing import List, Set
+
+from backend.data.job_roles_data import COMMON_SKILLS
+from backend.data.skill_aliases import SKILL_ALIASES
+from backend.skill_matcher import SkillMatcher
+
+
+DICTIONARY_SIZES = [50, 5_000, 50_000]
+ALIAS_COUNTS = [0, 1_000, 5_000, 20_000]
+RESUME_WORDS = 800
+
+# Stated durations and the years evidence() must credit to Python
+EXPERIENCE_CASES = [
+    ("5 years of Python", 5.0),
+    ("Python (3+ yrs)", 3.0),
+    ("2.5 years of Python", 2.5),
+    ("10.5 years of Python", 10.5),
+    ("0.5 years of Python", 0.5),
+    ("Python, 39.5+ years", 39.5),
+]
+
+
+def build_dictionary(size: int, rng: random.Random) -> List[str]:
+    """Real skills first, padded with synthetic one- and two-word entries"""
+    skills = list(COMMON_SKILLS[:size])
+    seen = {skill.lower() for skill in skills}
+    while len(skills) < size:
+        word = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(4, 9)))
+        if rng.random() < 0.3:
+            word += ' ' + rng.choice(['framework', 'toolkit', 'platform', 'engine'])
+        if word not in seen:
+            seen.add(word)
+            skills.append(word.title())
+    return skills
+
+
+def build_resume(skills: List[str], rng: random.Random) -> str:
+    filler = ["experience", "with", "built", "led", "team", "and", "the", "scalable", "systems", "2019"]
+    words = []
+    for _ in range(RESUME_WORDS):
+        words.append(rng.choice(skills) if rng.random() < 0.05 else rng.choice(filler))
+    return ' '.join(words)
+
+
+def regex_loop(text: str, skills: List[str]) -> Set[str]:
+    """The original implementation: one regex search per dictionary entry"""
+    text_lower = text.lower()
+    found = set()
+    for skill in skills:
+        pattern = r'\b' + re.escape(skill.lower()) + r'\b'
+        if re.search(pattern, text_lower):
+            found.add(skill)
+    return found
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def build_aliases(count: int, rng: random.Random) -> dict:
+    """The shipped alias table, padded with synthetic surface forms spread over COMMON_SKILLS"""
+    aliases = {skill: list(forms) for skill, forms in SKILL_ALIASES.items()}
+    taken = {form.lower() for forms in aliases.values() for form in forms} | {skill.lower() for skill in COMMON_SKILLS}
+    added = 0
+    while added < count:
+        form = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(3, 10)))
+        if form not in taken:
+            taken.add(form)
+            aliases.setdefault(rng.choice(COMMON_SKILLS), []).append(form)
+            added += 1
+    return aliases
+
+
+def alias_scaling(rng: random.Random) -> None:
+    text = build_resume(list(COMMON_SKILLS), rng) * 10
+    print(f"\n{'aliases':>8} {'build ms':>10} {'scan ms':>9}")
+    for count in ALIAS_COUNTS:
+        aliases = build_aliases(count, rng) if count else None
+        start = time.perf_counter()
+        matcher = SkillMatcher(COMMON_SKILLS, aliases)
+        build_ms = (time.perf_counter() - start) * 1000
+        scan_ms = best_of(lambda: matcher.find(text), 7) * 1000
+        print(f"{count:>8} {build_ms:>10.1f} {scan_ms:>9.2f}")
+
+
+def experience_evidence(rng: random.Random) -> None:
+    matcher = SkillMatcher(COMMON_SKILLS, SKILL_ALIASES)
+    for text, years in EXPERIENCE_CASES:
+        credited = matcher.evidence(text).years()
+        assert credited == {'Python': years}, f"{text!r}: {credited}"
+
+    text = build_resume(list(COMMON_SKILLS), rng) * 10
+    find_ms = best_of(lambda: matcher.find(text), 7) * 1000
+    evidence_ms = best_of(lambda: matcher.evidence(text), 7) * 1000
+    print(f"\n{len(EXPERIENCE_CASES)} experience phrases credited correctly")
+    print(f"find {find_ms:.2f} ms, evidence {evidence_ms:.2f} ms on {len(text):,} characters")
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'entries':>8} {'build ms':>10} {'regex ms':>10} {'matcher ms':>11} {'speedup':>8}")
+    for size in DICTIONARY_SIZES:
+        skills = build_dictionary(size, rng)
+        text = build_resume(skills, rng)
+
+        start = time.perf_counter()
+        matcher = SkillMatcher(skills)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        repeat = 5 if size <= 5_000 else 2
+        regex_ms = best_of(lambda: regex_loop(text, skills), repeat) * 1000
+        matcher_ms = best_of(lambda: matcher.find(text), repeat) * 1000
+
+        # Word-bounded entries must agree exactly with the regex loop
+        plain = {s for s in skills if s[0].isalnum() and s[-1].isalnum()}
+        assert regex_loop(text, skills) & plain == matcher.find(text) & plain
+
+        print(f"{size:>8} {build_ms:>10.1f} {regex_ms:>10.2f} {matcher_ms:>11.2f} {regex_ms / matcher_ms:>7.1f}x")
+
+    alias_scaling(rng)
+    experience_evidence(rng)
+
+
+if __name__ == "__main__":
+    main()
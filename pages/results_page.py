@@ -10,7 +10,11 @@ from utils import (
     render_stat_deck,
     render_skill_chips,
 )
-from backend.career_analyzer import get_job_application_links
+from backend.career_analyzer import ROLE_INDEX, get_job_application_links
+
+
+# Number of roles the results page renders; the upload flow only ranks this many
+TOP_MATCHES = 3
 
 
 RESULTS_STYLES = """
@@ -139,6 +143,9 @@ def results_page():
         st.warning("No matches found. Please re-upload your resume.")
         return
 
+    if resume_data.get('parse_error'):
+        st.warning(f"Results are based on part of your resume. {resume_data['parse_error']}.", icon="✂️")
+
     profile_name = html.escape(resume_data.get('name', 'Your Profile'))
     skill_count = len(resume_data.get('skills', []))
     first_match = matches[0]
@@ -153,7 +160,7 @@ def results_page():
                 <p>We mapped {skill_count} unique skills and surfaced your strongest-fit roles.</p>
                 <div class="profile-metadata">
                     <span>{skill_count} skills parsed</span>
-                    <span>{len(matches)} matching roles</span>
+                    <span>{len(ROLE_INDEX)} roles scanned</span>
                 </div>
             </div>
             <div class="hero-card">
@@ -172,7 +179,7 @@ def results_page():
             {"label": "Overall Fit", "value": f"{first_match.get('combined_score', 0)}%", "icon": "🎯"},
             {"label": "Market Demand", "value": f"{first_match.get('demand_score', 0)}/100", "icon": "📈"},
             {"label": "Skills Parsed", "value": str(skill_count), "icon": "🧬"},
-            {"label": "Roles Matched", "value": str(len(matches)), "icon": "🛰️"},
+            {"label": "Roles Scanned", "value": str(len(ROLE_INDEX)), "icon": "🛰️"},
         ]
     )
 
@@ -183,7 +190,7 @@ def results_page():
         align="left",
     )
 
-    tab_names = [match['role_name'] for match in matches[:3]]
+    tab_names = [match['role_name'] for match in matches[:TOP_MATCHES]]
     tabs = st.tabs(tab_names)
 
     for idx, tab in enumerate(tabs):
@@ -5,14 +5,14 @@ import streamlit as st
 import pandas as pd
 from utils import (
     glass_container,
-    parse_roadmap_step,
     generate_report,
     build_chip,
     render_section_header,
     render_stat_deck,
     render_skill_chips,
+    roadmap_for,
 )
-from backend.career_analyzer import get_learning_plan, generate_career_roadmap
+from backend.career_analyzer import get_learning_plan
 
 
 ROADMAP_STYLES = """
@@ -148,7 +148,7 @@ def roadmap_page():
     if st.session_state.roadmap_steps is None:
         with st.spinner("🤖 AI is crafting your personalized career steps..."):
             try:
-                roadmap_steps = generate_career_roadmap(role)
+                roadmap_steps = roadmap_for(role)
                 st.session_state.roadmap_steps = roadmap_steps
             except Exception as exc:
                 st.error(f"Could not generate roadmap: {exc}")
@@ -220,11 +220,10 @@ def roadmap_page():
             st.markdown('<p style="color:#94a3b8">High-leverage steps curated for the next sprint.</p>', unsafe_allow_html=True)
 
             cards_html = []
-            for step_string in roadmap_steps[:3]:
-                parsed = parse_roadmap_step(step_string)
-                title = html.escape(parsed.get('title', 'Next Step'))
-                desc = html.escape(parsed.get('description', ''))
-                duration = html.escape(parsed.get('duration', 'N/A'))
+            for step in roadmap_steps[:3]:
+                title = html.escape(step.title or 'Next Step')
+                desc = html.escape(step.description)
+                duration = html.escape(step.duration)
                 cards_html.append(
                     (
                         '<div class="goal-card">'
@@ -289,17 +288,15 @@ def roadmap_page():
             st.info("Roadmap steps are still loading. Please rerun the analysis if this persists.")
         else:
             st.markdown('<div class="timeline-shell">', unsafe_allow_html=True)
-            for step_string in roadmap_steps:
-                step = parse_roadmap_step(step_string)
-                title = html.escape(step.get('title', 'Next Step'))
-                description = html.escape(step.get('description', ''))
-                duration = html.escape(step.get('duration', 'N/A'))
-                badge = html.escape(step.get('step', '?'))
+            for step in roadmap_steps:
+                title = html.escape(step.title or 'Next Step')
+                description = html.escape(step.description)
+                duration = html.escape(step.duration)
+                badge = step.step
 
-                resources = step.get('resources', [])
                 resources_html = ''
-                if resources:
-                    items = ''.join(f'<li>{html.escape(resource)}</li>' for resource in resources)
+                if step.resources:
+                    items = ''.join(f'<li>{html.escape(resource)}</li>' for resource in step.resources)
                     resources_html = f'<ul class="resource-list">{items}</ul>'
 
                 st.markdown(
@@ -1,10 +1,60 @@
 # pages/upload_page.py
 
 import streamlit as st
-import time
-from utils import glass_container, build_chip, render_section_header
-from backend.resume_parser import parse_resume
-from backend.career_analyzer import analyze_career_fit
+from utils import glass_container, build_chip, render_section_header, get_analysis_executor
+from backend.jobs import QueueFullError
+from pages.results_page import TOP_MATCHES
+
+
+# Status line shown for each pipeline stage as it finishes
+STAGE_MESSAGES = {
+    'bytes_read': "📄 Read {bytes:,} bytes",
+    'cache_hit': "⚡ Recognized this resume — reusing {skills} extracted skills",
+    'pages_extracted': "📑 Extracted text from {pages} page(s)",
+    'text_decoded': "📑 Decoded {characters:,} characters of text",
+    'text_streamed': "📑 Scanned {bytes:,} bytes of text",
+    'skills_matched': "🧠 Matched {skills} skills",
+    'roles_scored': "📊 Scored {roles} roles against your profile",
+}
+
+
+def _write_stage(event):
+    """Render one StageEvent inside the active status container."""
+    message = STAGE_MESSAGES.get(event.stage, event.stage).format(**event.detail)
+    st.write(f"{message} · {event.duration * 1000:.0f} ms")
+
+
+@st.fragment(run_every=0.5)
+def _analysis_status():
+    """Poll the background job for this session and hand off to results when it finishes."""
+    job = get_analysis_executor().get(st.session_state.analysis_job_id)
+    if job is None:
+        st.session_state.analysis_job_id = None
+        st.rerun()
+
+    status = job.poll()
+    if status == 'done':
+        st.session_state.resume_data = job.result['resume_data']
+        st.session_state.career_matches = job.result['career_matches']
+        st.session_state.analysis_job_id = None
+        st.session_state.page = 'results'
+        st.rerun()
+    elif status in ('queued', 'running'):
+        label = "Waiting for a free analyzer..." if status == 'queued' else "AI is analyzing your profile..."
+        with st.status(label, expanded=True):
+            for event in job.events:
+                _write_stage(event)
+        if st.button("Cancel analysis", key=f"cancel_{job.id}", type="secondary"):
+            job.cancel()
+            st.session_state.analysis_job_id = None
+            st.rerun()
+    else:
+        if status == 'failed':
+            st.session_state.analysis_error = f"Analysis failed. Please check the file format or try again: {job.error}"
+        elif status == 'timed_out':
+            st.session_state.analysis_error = f"Analysis timed out. Try a smaller or simpler file. ({job.error})"
+        st.session_state.analysis_job_id = None
+        st.rerun()
 
 
 UPLOAD_STYLES = """
@@ -119,34 +169,29 @@ def upload_page():
             uploaded_file = st.file_uploader('', type=['pdf', 'txt'], label_visibility="collapsed")
             placeholder = st.empty()
 
+            if st.session_state.get('analysis_error'):
+                st.error(st.session_state.analysis_error)
+                st.session_state.analysis_error = None
+
             if uploaded_file is not None:
                 st.success(f"Loaded: {uploaded_file.name}")
-                if st.button("Analyze profile", use_container_width=True):
-                    status_container = placeholder.status("AI is analyzing your profile...", expanded=True)
+                busy = st.session_state.get('analysis_job_id') is not None
+                if st.button("Analyze profile", use_container_width=True, disabled=busy):
+                    # The job runs on the shared pool; this script run returns right away
                     try:
-                        with status_container:
-                            st.write("📄 Parsing resume and extracting key data points...")
-                            time.sleep(0.5)
-                            resume_data = parse_resume(uploaded_file)
-                            st.session_state.resume_data = resume_data
-
-                            st.write("🧠 Analyzing skills against global market data...")
-                            time.sleep(1)
-                            career_matches = analyze_career_fit(resume_data['skills'])
-                            st.session_state.career_matches = career_matches
-
-                            st.write("✅ Analysis complete! Preparing results...")
-                            time.sleep(0.4)
-
-                        status_container.update(label="Analysis complete", state="complete", expanded=False)
-                        st.session_state.page = 'results'
-                        st.rerun()
-                    except Exception as exc:
-                        placeholder.empty()
-                        st.error(f"Analysis failed. Please check the file format or try again: {exc}")
+                        job = get_analysis_executor().submit(
+                            uploaded_file.getvalue(), uploaded_file.name, top_k=TOP_MATCHES
+                        )
+                        st.session_state.analysis_job_id = job.id
+                    except QueueFullError as exc:
+                        st.warning(str(exc), icon="⏳")
             else:
                 st.info("No file selected yet", icon="ℹ️")
 
+            if st.session_state.get('analysis_job_id') is not None:
+                with placeholder.container():
+                    _analysis_status()
+
     st.markdown('<div class="trust-banner">🔒 Files stay in-memory. Once you leave, your data leaves with you.</div>', unsafe_allow_html=True)
 
     render_section_header(
@@ -3,7 +3,6 @@
 import streamlit as st
 import plotly.graph_objects as go
 import contextlib
-import re
 from html import escape
 
 
@@ -153,52 +152,66 @@ def render_skill_chips(
         f"<span class='skill-chip {variant}'>{escape(skill)}</span>" for skill in skills
     )
 
+# -----------------------------------------------------------------------------
+# SHARED RESOURCES (built once per process, reused by every session and rerun)
+# -----------------------------------------------------------------------------
+THEME_STYLESHEET = "career_compass_theme.css"
+
+
+@st.cache_resource(show_spinner=False)
+def load_stylesheet(path: str = THEME_STYLESHEET) -> str:
+    """Read a stylesheet from disk once per process."""
+    with open(path, "r") as f:
+        return f.read()
+
+
+@st.cache_resource(show_spinner=False)
+def get_analysis_executor():
+    """Bounded pool that runs resume analyses for every session off the script thread."""
+    from backend.analysis_store import open_store_from_env
+    from backend.jobs import AnalysisExecutor
+
+    return AnalysisExecutor(store=open_store_from_env())
+
+
+def roadmap_for(role: dict):
+    """RoadmapStep sequence for a matched role: precomputed for catalog roles, built on the fly otherwise."""
+    from backend.career_analyzer import roadmap_for_role
+
+    return roadmap_for_role(role)
+
+
+def warm_up():
+    """Build every shared resource so the first visitor doesn't pay the cold cost."""
+    # The skill matcher, role index and roadmaps are module globals built on first import
+    import backend.career_analyzer  # noqa: F401
+    import backend.resume_parser  # noqa: F401
+
+    load_stylesheet()
+
 # -----------------------------------------------------------------------------
 # PARSING & REPORTING HELPERS
 # -----------------------------------------------------------------------------
 def parse_roadmap_step(step_string):
     """
-    Parses a string from the AI into a structured dictionary.
-    Assumes a format like: "1. Title [Duration]: Description. Resources: Res1, Res2"
+    Parses a serialized roadmap step into a dictionary.
+    Only needed for strings saved before roadmaps were structured; render RoadmapStep fields directly.
     """
-    parsed = {
-        'step': '',
-        'title': '',
-        'duration': 'N/A',
-        'description': 'No description provided.',
-        'resources': []
-    }
-
-    # Regex to capture all parts
-    pattern = re.compile( 
-        r"""(\d+)\.\s* # 1. Step number
-        ([^\[:]+)\s* # 2. Title (until [ or :)
-        (?:\[([^\]]+)\])?\s* # 3. [Duration] (optional)
-        :\s* # Separator :
-        (.*?)\s* # 4. Description (non-greedy)
-        (?:Resources:\s*(.*))?                       # 5. Resources: ... (optional)
-        $""", re.VERBOSE | re.DOTALL
-    )
+    from backend.career_analyzer import RoadmapStep
 
-    match = pattern.match(step_string)
-    if match:
-        parsed['step'] = match.group(1).strip()
-        parsed['title'] = match.group(2).strip()
-        parsed['duration'] = match.group(3).strip() if match.group(3) else 'N/A'
-        parsed['description'] = match.group(4).strip()
-        if match.group(5):
-            # Split resources by comma and strip whitespace
-            parsed['resources'] = [res.strip() for res in match.group(5).split(',') if res.strip()]
-    else:
-        # Fallback for unstructured strings
-        parsed['description'] = step_string
-
-    return parsed
+    step = RoadmapStep.from_string(step_string)
+    return {
+        'step': str(step.step) if step.step else '',
+        'title': step.title,
+        'duration': step.duration,
+        'description': step.description,
+        'resources': list(step.resources),
+    }
 
 def generate_report(role: dict) -> str:
     """Generate a text report for download"""
     # Imports needed for backend call
-    from backend.career_analyzer import get_learning_plan, generate_career_roadmap
+    from backend.career_analyzer import get_learning_plan
 
     report = f"""
 CAREER COMPASS AI - CAREER ANALYSIS REPORT
@@ -239,7 +252,7 @@ LEARNING PLAN
     report += f"""
 CAREER PROGRESSION ROADMAP
 --------------------------
-{generate_career_roadmap(role)}
+{chr(10).join(step.to_string() for step in roadmap_for(role))}
 
 ---
 Generated by Career Compass AI